@@ -0,0 +1,78 @@
+"""
+Import-time profile for SparkVibe Finance application
+Runs `python -X importtime` on the app modules in a fresh interpreter and
+summarizes where cold-start time goes
+
+Usage: python benchmarks/import_time.py [module ...] [--top N]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_MODULES = [
+    "main_app",
+    "tabs.golden_cross",
+    "tabs.death_cross",
+    "tabs.volume_analysis",
+    "tabs.inflation",
+    "utils.data_fetcher",
+]
+
+# Heavy third-party packages that should only load on the code paths that use them
+WATCHED_PACKAGES = ["yfinance", "plotly.graph_objects", "plotly.express", "plotly.subplots", "curl_cffi", "requests"]
+
+
+def profile_import(module):
+    """Import a module in a fresh interpreter and return {module: (self_us, cumulative_us, depth)}"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        timings[name.strip()] = (int(self_us), int(cumulative_us), depth)
+    return timings
+
+
+def summarize(module, timings, top, baseline):
+    """Print total time, the slowest top-level imports and which watched packages the app loaded"""
+    total_us = timings.get(module, (0, 0, 0))[1]
+    print(f"\n=== import {module}: {total_us / 1000:.1f} ms ===")
+
+    # Direct dependencies of the module (depth 1 below it), slowest first
+    children = [(name, cumulative) for name, (_, cumulative, depth) in timings.items() if depth == 1]
+    children.sort(key=lambda item: item[1], reverse=True)
+    for name, cumulative in children[:top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    # Streamlit itself pulls in a few of these (e.g. a stub of plotly.graph_objects); only report the rest
+    loaded = [name for name in WATCHED_PACKAGES if name in timings and name not in baseline]
+    print(f"  heavy packages loaded eagerly: {', '.join(loaded) if loaded else 'none'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--top", type=int, default=10, help="number of direct imports to list")
+    args = parser.parse_args()
+
+    baseline = profile_import("streamlit")
+    for module in args.modules:
+        summarize(module, profile_import(module), args.top, baseline)
+
+
+if __name__ == "__main__":
+    main()
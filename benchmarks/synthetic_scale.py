@@ -0,0 +1,106 @@
+"""
+Scale benchmark for SparkVibe Finance application
+Generates a synthetic market of N symbols and times the snapshot, summary-table and
+chart-data code paths on it, to check they hold up at production scale
+
+Usage: python benchmarks/synthetic_scale.py [--symbols N] [--years Y] [--seed S]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.constants import STOCKS, SUMMARY_TABLE_PAGE_SIZE, VOLUME_CHART_BUCKETS  # noqa: E402
+from utils.synthetic import SyntheticMarket, synthetic_cpi_cube  # noqa: E402
+from utils.snapshot import build_snapshot, SnapshotTable, snapshot_version, StockSnapshot  # noqa: E402
+from utils.formatters import format_currency_column, format_cross_column  # noqa: E402
+from utils.charting import bucket_bars  # noqa: E402
+from utils.cpi_cube import CPICube  # noqa: E402
+from utils.resample import ResampleCache  # noqa: E402
+from utils.crossovers import scan_crossovers  # noqa: E402
+from utils.constants import CROSSOVER_PAIRS  # noqa: E402
+from utils.indicators import compute_indicators  # noqa: E402
+from utils.backtest import backtest_crossovers  # noqa: E402
+from utils.screener import ScreenIndex, CROSS_FIELD  # noqa: E402
+from utils.alerts import AlertEngine  # noqa: E402
+from utils.volume_anomalies import VolumeAnomalyScanner, rank_anomalies  # noqa: E402
+
+
+def timed_step(label, run):
+    """Run one step, print its wall time and return its result"""
+    started = time.perf_counter()
+    result = run()
+    print(f"  {(time.perf_counter() - started) * 1000:9.1f} ms  {label}")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=10_000, help="universe size (the first symbols are the watchlist)")
+    parser.add_argument("--years", type=float, default=2, help="years of daily history per symbol")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    symbols = list(STOCKS)[:args.symbols] + [f"SYN{i:05d}" for i in range(max(0, args.symbols - len(STOCKS)))]
+    print(f"=== {len(symbols)} symbols, {args.years:g} years ===")
+
+    market = timed_step("generate market", lambda: SyntheticMarket.generate(symbols, years=args.years, seed=args.seed))
+    all_stock_data = timed_step("stock data for every symbol", market.stock_data)
+    timed_step("snapshot version", lambda: snapshot_version(all_stock_data))
+    indicators = timed_step("technical indicators", lambda: compute_indicators(symbols, market.high, market.low, market.close))
+    frame = timed_step("build snapshot", lambda: build_snapshot(all_stock_data, symbols, indicators))
+    table = timed_step("index snapshot table", lambda: SnapshotTable(frame))
+    mask = table.mask(change_range=(-2.0, 2.0), cross_states=["Golden cross", "Death cross"])
+    rows, matching = timed_step("sorted, filtered page", lambda: table.query("Change %", False, mask, 1, SUMMARY_TABLE_PAGE_SIZE))
+    screen = timed_step("index screen fields", lambda: ScreenIndex(frame))
+    conditions = [("P/E", "<=", 25.0), ("RSI", "between", (30.0, 70.0)), ("Volume / Avg", ">=", 1.2),
+                  (CROSS_FIELD, "in", ["Golden cross", "No cross"])]
+    screened = timed_step(f"screen query, {len(conditions)} conditions", lambda: screen.select(conditions))
+    timed_step("format market cap column", lambda: format_currency_column(frame["Market Cap (B)"] * 1e9))
+    timed_step("format golden cross column", lambda: format_cross_column(frame["golden_cross"], frame["golden_cross_days_ago"]))
+
+    # Alert rules: a full first pass, then a refresh where only a few symbols changed
+    rules = (("golden_cross", None), ("death_cross", None), ("volume_spike", 2.0), ("earnings_soon", 7))
+    engine = AlertEngine("benchmark", os.path.join(tempfile.mkdtemp(), "state.json"), sinks=[])
+    timed_step("alert rules, first pass", lambda: engine.evaluate(all_stock_data, rules))
+    refreshed = StockSnapshot(all_stock_data)
+    for symbol in symbols[:50]:
+        refreshed[symbol] = {**all_stock_data[symbol], "volume": all_stock_data[symbol]["avg_volume"] * 3}
+    timed_step("per-symbol fingerprints of the refresh", lambda: refreshed.fingerprints)
+    timed_step("alert rules, 50 changed symbols", lambda: engine.evaluate(refreshed, rules))
+    print(f"  ({engine.stats(rules)['checks']} rule checks)")
+
+    pairs = list(CROSSOVER_PAIRS.values())
+    timed_step("crossover scan, SMA 50/200", lambda: scan_crossovers(market.close, pairs[1:2]))
+    timed_step(f"crossover scan, {len(pairs)} pairs", lambda: scan_crossovers(market.close, pairs))
+    timed_step("crossover backtest, SMA 50/200", lambda: backtest_crossovers(symbols, market.close, pairs[1]))
+
+    scanner = VolumeAnomalyScanner()
+    timed_step("volume z-scores, median/MAD", lambda: scanner.scores("benchmark", symbols, market.volume[:-1]))
+    z = timed_step("volume z-scores after a new session", lambda: scanner.scores("benchmark", symbols, market.volume))
+    anomalies = timed_step("rank unusual volume", lambda: rank_anomalies(symbols, market.volume, z))
+
+    hist = timed_step("history of one symbol", lambda: market.history(symbols[-1], "2y"))
+    timed_step("bucket volume bars", lambda: bucket_bars(hist.index, hist["Volume"].to_numpy(), VOLUME_CHART_BUCKETS))
+    resample_cache = ResampleCache(10)
+    timed_step("resample to weekly bars", lambda: resample_cache.get(symbols[-1], hist.iloc[:-1], "Weekly"))
+    timed_step("weekly bars after a new daily bar", lambda: resample_cache.get(symbols[-1], hist, "Weekly"))
+    timed_step("weekly bars, unchanged history", lambda: resample_cache.get(symbols[-1], hist, "Weekly"))
+
+    cube = timed_step("synthetic CPI cube (14 x 240 months)", lambda: synthetic_cpi_cube(
+        {f"Category {i}": 3.0 for i in range(14)}, volatility=0.5, months=240, seed=args.seed
+    ))
+    long_frame = timed_step("CPI cube to long frame", cube.to_long)
+    timed_step("CPI long frame to cube", lambda: CPICube.from_long(long_frame))
+
+    golden = int(frame["golden_cross"].sum())
+    death = int(frame["death_cross"].sum())
+    print(f"  {matching} rows match the filter, {len(screened)} the screen, {len(anomalies)} have unusual volume; {golden} golden and {death} death crosses in the last 30 sessions")
+
+
+if __name__ == "__main__":
+    main()
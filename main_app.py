@@ -4,14 +4,26 @@ Refactored version with modular structure
 """
 
 import streamlit as st
-import pandas as pd
 from datetime import datetime
+import math
 import time
 
 # Import utilities
-from utils.constants import STOCKS, CSS_STYLES
+from utils.constants import (
+    STOCKS, CSS_STYLES, SUMMARY_TABLE_SERVER_SIDE_ROWS, SUMMARY_TABLE_PAGE_SIZE, REPLAY_SPEEDS, REPLAY_REFRESH_INTERVAL,
+)
 from utils.data_fetcher import fetch_stock_data
-from utils.formatters import format_currency, format_volume
+from utils.formatters import format_cross_column
+from utils.snapshot import snapshot_version, StockSnapshot, SnapshotTable, SORTABLE_COLUMNS, CROSS_STATES
+from utils.render_cache import memoize_render, get_render_cache
+from utils.refresh import run_refresh
+from utils.data_source import (
+    set_data_source, get_data_source, load_all_stock_data, load_history,
+    get_replay_session, start_replay, stop_replay, LIVE, SYNTHETIC,
+)
+from utils.replay import list_recordings, record_replay
+from utils.timing import timed, record_span, start_rerun, finish_rerun, render_diagnostics_panel
+from utils.request_budget import start_rerun_accounting, render_request_accounting
 
 # Development mode flag - set to True to use mock data for faster iteration
 DEVELOPMENT_MODE = False
@@ -20,242 +32,116 @@ DEVELOPMENT_MODE = False
 from tabs.golden_cross import create_golden_cross_tab
 from tabs.death_cross import create_death_cross_tab
 from tabs.volume_analysis import create_volume_analysis_tab
-from tabs.inflation import create_inflation_tab
-
-import random
-import numpy as np
-
-
-def generate_mock_stock_data(symbol):
-    """Generate realistic mock stock data for development purposes"""
-    # Base prices for different stocks to make them realistic
-    base_prices = {
-        "^VIX": 20.5,
-        "SPY": 445.2,
-        "QQQ": 375.8,
-        "AAPL": 185.3,
-        "MSFT": 378.9,
-        "AMZN": 145.7,
-        "GOOGL": 138.4,
-        "META": 325.6,
-        "TSLA": 248.5,
-        "NVDA": 875.2,
-        "AMD": 142.8,
-        "NFLX": 485.3,
-        "CRM": 245.7,
-        "ADBE": 578.9,
-        "ORCL": 115.4,
-        "INTC": 43.2,
-        "IBM": 165.8,
-        "CSCO": 51.7,
-        "V": 245.9,
-        "MA": 425.3,
-        "JPM": 158.7,
-        "BAC": 32.4,
-        "WFC": 45.8,
-        "GS": 385.2,
-        "MS": 87.6,
-        "C": 58.9,
-        "BRK-B": 385.4,
-        "JNJ": 162.3,
-        "PFE": 28.7,
-        "UNH": 525.8,
-        "ABBV": 158.9,
-        "MRK": 115.6,
-        "LLY": 785.4,
-        "TMO": 545.7,
-        "ABT": 108.9,
-        "DHR": 245.3,
-        "BMY": 52.1,
-        "AMGN": 285.7,
-        "GILD": 78.4,
-        "REGN": 875.2,
-        "VRTX": 425.8,
-        "BIIB": 245.7,
-        "XOM": 115.8,
-        "CVX": 158.4,
-        "COP": 125.7,
-        "SLB": 48.9,
-        "EOG": 125.4,
-        "PXD": 245.8,
-        "KMI": 18.7,
-        "OKE": 95.4,
-        "WMB": 38.9,
-        "EPD": 15.2,
-        "GLD": 185.4,
-        "SLV": 22.8,
-        "BTC-USD": 42500.0,
-    }
-
-    base_price = base_prices.get(symbol, 100.0)
-
-    # Add some random variation to the base price
-    current_price = base_price * (1 + random.uniform(-0.05, 0.05))
-
-    # Generate percentage change
-    percentage_change = random.uniform(-5.0, 5.0)
-    daily_change = current_price * (percentage_change / 100)
-    previous_close = current_price - daily_change
-
-    # Generate volume data
-    base_volume = random.randint(10_000_000, 100_000_000)
-    volume = int(base_volume * random.uniform(0.5, 2.0))
-    avg_volume = base_volume
-
-    # Generate market cap
-    market_cap = random.randint(50_000_000_000, 3_000_000_000_000)
-
-    # Generate financial ratios
-    pe_ratio = random.uniform(10.0, 35.0) if random.random() > 0.1 else None
-    eps = random.uniform(1.0, 15.0) if random.random() > 0.1 else None
-    peg_ratio = random.uniform(0.5, 3.0) if random.random() > 0.15 else None
-    pb_ratio = random.uniform(1.0, 8.0) if random.random() > 0.1 else None
-
-    # Generate moving averages
-    ma_50d = current_price * random.uniform(0.95, 1.05)
-    ma_200d = current_price * random.uniform(0.90, 1.10)
-
-    # Generate golden cross and death cross
-    golden_cross = ma_50d > ma_200d and random.random() > 0.7
-    death_cross = ma_50d < ma_200d and random.random() > 0.8
-
-    golden_cross_days_ago = random.randint(1, 30) if golden_cross else None
-    death_cross_days_ago = random.randint(1, 30) if death_cross else None
-
-    # Generate earnings date
-    earnings_date = None
-    if symbol not in ["^VIX", "SPY", "QQQ", "GLD", "SLV", "BTC-USD"]:
-        # Generate a random future date within next 90 days
-        days_ahead = random.randint(1, 90)
-        earnings_date = pd.Timestamp.now() + pd.Timedelta(days=days_ahead)
-
-    return {
-        "symbol": symbol,
-        "current_price": current_price,
-        "pe_ratio": pe_ratio,
-        "eps": eps,
-        "peg_ratio": peg_ratio,
-        "pb_ratio": pb_ratio,
-        "short_percent_float": random.uniform(1.0, 15.0) if random.random() > 0.2 else "N/A",
-        "open_price": current_price * random.uniform(0.98, 1.02),
-        "high_price": current_price * random.uniform(1.00, 1.05),
-        "low_price": current_price * random.uniform(0.95, 1.00),
-        "volume": volume,
-        "avg_volume": avg_volume,
-        "daily_change": daily_change,
-        "percentage_change": percentage_change,
-        "market_cap": market_cap,
-        "previous_close": previous_close,
-        "ma_50d": ma_50d,
-        "ma_200d": ma_200d,
-        "golden_cross": golden_cross,
-        "golden_cross_days_ago": golden_cross_days_ago,
-        "death_cross": death_cross,
-        "death_cross_days_ago": death_cross_days_ago,
-        "earnings_date": earnings_date,
-        "timestamp": datetime.now(),
-    }
-
-
-def create_summary_table_tab(all_stock_data):
-    """Create the Summary Table tab content (Tab 1)"""
+from tabs.inflation import create_inflation_tab, load_cpi_data
+from tabs.intraday import create_intraday_tab
+from tabs.screener import screener_controls, universe_snapshot, universe_index
+from tabs.alerts import alert_controls
+
+
+# Session state key of the live quotes snapshot widget reruns redraw until the next refresh
+LIVE_SNAPSHOT_KEY = "live_snapshot"
+
+# Summary table column order (Earnings Date rightmost)
+SUMMARY_COLUMN_ORDER = [
+    "Symbol", "Company", "Price", "Change %", "Volume (M)", "Avg Volume (M)",
+    "Market Cap (B)", "P/E", "EPS", "PEG", "P/B", "50-Day MA", "200-Day MA",
+    "Golden Cross", "Death Cross", "RSI", "MACD Hist", "Bollinger %B", "ATR %",
+    "vs 52W High %", "vs 52W Low %", "% Float", "Earnings Date"
+]
+
+
+def summary_display_frame(rows):
+    """Turn snapshot rows into the summary table's display columns"""
+    df = rows.copy()
+
+    # Format Golden Cross and Death Cross with traffic light symbols based on days ago
+    df["Golden Cross"] = format_cross_column(df["golden_cross"], df["golden_cross_days_ago"])
+    df["Death Cross"] = format_cross_column(df["death_cross"], df["death_cross_days_ago"])
+
+    # Format earnings date
+    df["Earnings Date"] = df["Earnings Date"].dt.strftime("%Y-%m-%d").fillna("N/A")
+
+    return df[SUMMARY_COLUMN_ORDER]
+
+
+def _slider_bounds(bounds):
+    """Widen a (min, max) pair to whole numbers for a range slider"""
+    low, high = math.floor(bounds[0]), math.ceil(bounds[1])
+    return float(low), float(max(high, low + 1))
+
+
+def summary_table_controls(table, screen_mask=None):
+    """
+    Sort, filter and page controls for the server-side summary table; returns the page rows.
+    screen_mask: optional row mask of the sidebar screen, combined with the table filters.
+    """
+    col1, col2, col3 = st.columns([2, 1, 3])
+    with col1:
+        sort_by = st.selectbox("Sort by", options=["(watchlist order)"] + SORTABLE_COLUMNS, key="summary_sort_by")
+    with col2:
+        descending = st.checkbox("Descending", value=True, key="summary_sort_desc")
+    with col3:
+        cross_states = st.multiselect("Cross state", options=CROSS_STATES, default=CROSS_STATES, key="summary_cross_states")
+
+    # Slider bounds are whole numbers so they stay put between refreshes; the sliders and
+    # the page number reset when the bounds or the page count change
+    col1, col2 = st.columns(2)
+    pe_bounds = _slider_bounds(table.bounds("P/E"))
+    change_bounds = _slider_bounds(table.bounds("Change %"))
+    with col1:
+        pe_range = st.slider("P/E range", min_value=pe_bounds[0], max_value=pe_bounds[1], value=pe_bounds)
+    with col2:
+        change_range = st.slider("Change % range", min_value=change_bounds[0], max_value=change_bounds[1], value=change_bounds)
+
+    # A filter left at its full range does not drop rows with missing values
+    mask = table.mask(
+        pe_range=None if pe_range == pe_bounds else pe_range,
+        change_range=None if change_range == change_bounds else change_range,
+        cross_states=None if len(cross_states) == len(CROSS_STATES) else cross_states,
+    )
+    if screen_mask is not None:
+        mask &= screen_mask
+    page_count = max(1, -(-int(mask.sum()) // SUMMARY_TABLE_PAGE_SIZE))
+    page = st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1)
+
+    rows, matching = table.query(
+        sort_by=None if sort_by == "(watchlist order)" else sort_by,
+        ascending=not descending,
+        mask=mask,
+        page=page,
+        page_size=SUMMARY_TABLE_PAGE_SIZE,
+    )
+    st.caption(f"Showing {len(rows)} of {matching} matching stocks (page {page} of {page_count}, {len(table)} total)")
+    return rows
+
+
+def create_summary_table_tab(all_stock_data, screen=()):
+    """Create the Summary Table tab content (Tab 1); screen: conditions of the sidebar screener"""
     st.subheader("Stock Summary Table")
 
-    # Create a list to store table data with locked symbols first
-    locked_symbols = ["^VIX", "SPY", "QQQ"]
-    remaining_symbols = [symbol for symbol in STOCKS.keys() if symbol not in locked_symbols]
-    ordered_symbols = locked_symbols + remaining_symbols
-
-    table_data = []
-
-    for symbol in ordered_symbols:
-        if symbol in all_stock_data and all_stock_data[symbol] is not None:
-            data = all_stock_data[symbol]
-
-            # Format earnings date
-            earnings_date_display = "N/A"
-            if data.get("earnings_date") is not None:
-                earnings_date = data["earnings_date"]
-                earnings_date_display = earnings_date.strftime("%Y-%m-%d")
-
-            # Format Golden Cross with traffic light symbols based on days ago
-            if data.get("golden_cross", False) and data.get("golden_cross_days_ago") is not None:
-                days_ago = data['golden_cross_days_ago']
-                if days_ago <= 15:
-                    golden_cross_display = f"🟢 ({days_ago}d ago)"
-                elif days_ago <= 30:
-                    golden_cross_display = f"🟡 ({days_ago}d ago)"
-                else:
-                    golden_cross_display = f"🔴 ({days_ago}d ago)"
-            elif data.get("golden_cross", False):
-                golden_cross_display = "🟢"
-            else:
-                golden_cross_display = "🔴"
-
-            # Format Death Cross with traffic light symbols based on days ago
-            if data.get("death_cross", False) and data.get("death_cross_days_ago") is not None:
-                days_ago = data['death_cross_days_ago']
-                if days_ago <= 15:
-                    death_cross_display = f"🟢 ({days_ago}d ago)"
-                elif days_ago <= 30:
-                    death_cross_display = f"🟡 ({days_ago}d ago)"
-                else:
-                    death_cross_display = f"🔴 ({days_ago}d ago)"
-            elif data.get("death_cross", False):
-                death_cross_display = "🟢"
-            else:
-                death_cross_display = "🔴"
-
-            # Helper function to safely convert to float or None
-            def safe_float(value):
-                if value is None or value == "N/A" or pd.isna(value):
-                    return None
-                try:
-                    return float(value)
-                except (ValueError, TypeError):
-                    return None
-
-            table_data.append({
-                "Symbol": symbol,
-                "Company": STOCKS[symbol],
-                "Price": safe_float(data["current_price"]),
-                "Change %": safe_float(data["percentage_change"]),
-                "Volume": safe_float(data["volume"]),
-                "Avg Volume": safe_float(data["avg_volume"]),
-                "Market Cap (B)": safe_float(data["market_cap"]),
-                "P/E": safe_float(data["pe_ratio"]),
-                "EPS": safe_float(data["eps"]),
-                "PEG": safe_float(data["peg_ratio"]),
-                "P/B": safe_float(data["pb_ratio"]),
-                "50-Day MA": safe_float(data["ma_50d"]),
-                "200-Day MA": safe_float(data["ma_200d"]),
-                "Golden Cross": golden_cross_display,
-                "Death Cross": death_cross_display,
-                "% Float": safe_float(data["short_percent_float"]) * 100 if data["short_percent_float"] != "N/A" and safe_float(data["short_percent_float"]) is not None else None,
-                "Earnings Date": earnings_date_display,
-            })
-
-    if table_data:
-        # Create DataFrame
-        df = pd.DataFrame(table_data)
-
-        # Convert market cap to billions for proper sorting
-        df["Market Cap (B)"] = df["Market Cap (B)"].apply(lambda x: x/1e9 if pd.notna(x) and x is not None else None)
-
-        # Convert volume to millions for proper sorting
-        df["Volume (M)"] = df["Volume"].apply(lambda x: x/1e6 if pd.notna(x) and x is not None else None)
-        df["Avg Volume (M)"] = df["Avg Volume"].apply(lambda x: x/1e6 if pd.notna(x) and x is not None else None)
-
-        # Remove the original Volume and Avg Volume columns
-        df = df.drop(["Volume", "Avg Volume"], axis=1)
-
-        # Reorder columns to ensure Earnings Date is rightmost
-        column_order = [
-            "Symbol", "Company", "Price", "Change %", "Volume (M)", "Avg Volume (M)",
-            "Market Cap (B)", "P/E", "EPS", "PEG", "P/B", "50-Day MA", "200-Day MA",
-            "Golden Cross", "Death Cross", "% Float", "Earnings Date"
-        ]
-        df = df[column_order]
+    # Derived tables are memoized against the snapshot version, so widget-only reruns reuse them
+    # (the snapshot has the locked symbols first)
+    version = snapshot_version(all_stock_data)
+    snapshot = universe_snapshot(all_stock_data)
+    # The screen index shares the snapshot's row order, so its mask applies to the table rows
+    screen_mask = universe_index(all_stock_data).mask(screen) if screen else None
+
+    if not snapshot.empty:
+        # Large universes are sorted, filtered and paginated here; only the current page is sent
+        server_side = st.checkbox(
+            "Server-side table mode",
+            value=len(snapshot) > SUMMARY_TABLE_SERVER_SIDE_ROWS,
+            help="Sort, filter and paginate on the server and send only the current page",
+            key="summary_server_side",
+        )
+        if server_side:
+            table = memoize_render("summary", "table", version, lambda: SnapshotTable(snapshot))
+            df = summary_display_frame(summary_table_controls(table, screen_mask))
+        else:
+            df = memoize_render("summary", "display", version, lambda: summary_display_frame(snapshot))
+            if screen_mask is not None:
+                df = df[screen_mask]
+                st.caption(f"Showing {len(df)} of {len(snapshot)} stocks matching the sidebar screen")
 
         # Display the dataframe with custom column configuration
         st.dataframe(
@@ -278,6 +164,16 @@ def create_summary_table_tab(all_stock_data):
                 "200-Day MA": st.column_config.NumberColumn("200-Day MA 📈", width="small", format="$%.1f"),
                 "Golden Cross": st.column_config.TextColumn("Golden Cross ✨", width="small"),
                 "Death Cross": st.column_config.TextColumn("Death Cross ⚠️", width="small"),
+                "RSI": st.column_config.NumberColumn("RSI (14) 📉", width="small", format="%.0f",
+                                                     help="Relative strength index: above 70 overbought, below 30 oversold"),
+                "MACD Hist": st.column_config.NumberColumn("MACD Hist 📊", width="small", format="%.2f",
+                                                           help="MACD (12/26) minus its 9-day signal line"),
+                "Bollinger %B": st.column_config.NumberColumn("Bollinger %B 📏", width="small", format="%.2f",
+                                                              help="Price within the 20-day bands: 0 = lower band, 1 = upper band"),
+                "ATR %": st.column_config.NumberColumn("ATR % 📐", width="small", format="%.1f%%",
+                                                       help="14-day average true range as a share of the price"),
+                "vs 52W High %": st.column_config.NumberColumn("vs 52W High 🔝", width="small", format="%.1f%%"),
+                "vs 52W Low %": st.column_config.NumberColumn("vs 52W Low 🔻", width="small", format="%.1f%%"),
                 "% Float": st.column_config.NumberColumn("% Float 📊", width="small", format="%.2f%%"),
                 "Earnings Date": st.column_config.TextColumn("Earnings Date 📅", width="medium"),
             },
@@ -323,8 +219,60 @@ def create_summary_table_tab(all_stock_data):
         st.error("No stock data available to display")
 
 
+def replay_controls(all_stock_data):
+    """Sidebar controls to record the current market and replay a recording in this session"""
+    st.subheader("Market Replay")
+    replay = get_replay_session()
+
+    if replay is None:
+        recordings = list_recordings()
+        if recordings:
+            name = st.selectbox("Recording", recordings, key="replay_recording")
+            speed_label = st.radio("Speed", list(REPLAY_SPEEDS), key="replay_speed", horizontal=True)
+            if st.button("▶️ Start replay"):
+                start_replay(name, REPLAY_SPEEDS[speed_label])
+                st.rerun()
+        else:
+            st.caption("No recordings yet: record the current market to replay it later.")
+
+        if st.button("⏺️ Record current market"):
+            source = get_data_source()
+            with st.spinner("Recording daily bars..."):
+                histories = {symbol: load_history(symbol, "2y") for symbol, data in all_stock_data.items() if data is not None}
+                recorded = record_replay(f"{source}-{datetime.now():%Y%m%d-%H%M%S}", histories, all_stock_data, source)
+            if recorded:
+                st.success(f"Recorded {recorded} symbols")
+            else:
+                st.warning("Nothing to record: no price history available")
+        return
+
+    stats = replay.stats()
+    st.caption(f"⏯️ {replay.recording.name}: session {stats['date']:%Y-%m-%d} (bar {stats['position']} of {stats['total']})")
+    st.progress(stats["position"] / stats["total"])
+
+    speed_labels = list(REPLAY_SPEEDS)
+    speed_label = st.radio(
+        "Speed", speed_labels, key="replay_speed", horizontal=True,
+        index=list(REPLAY_SPEEDS.values()).index(replay.speed),
+    )
+    if REPLAY_SPEEDS[speed_label] != replay.speed:
+        replay.set_speed(REPLAY_SPEEDS[speed_label])
+
+    if stats["latency"] is not None:
+        st.caption(f"Last refresh latency {stats['latency']:.2f} s, {stats['bars_per_second']:.2f} bars/s replayed")
+    if replay.finished:
+        st.info("Replay finished")
+
+    if st.button("⏹️ Stop replay"):
+        stop_replay()
+        st.rerun()
+
+
 def main():
     """Main application function"""
+    start_rerun()
+    start_rerun_accounting()
+
     # Set page configuration
     st.set_page_config(
         page_title="SparkVibe Finance Dashboard",
@@ -350,10 +298,16 @@ def main():
         # Manual refresh button
         if st.button("🔄 Refresh Data", type="primary"):
             st.cache_data.clear()
+            st.session_state.pop(LIVE_SNAPSHOT_KEY, None)
             st.rerun()
 
-        # Display last update time
-        st.info(f"Last updated: {datetime.now().strftime('%H:%M:%S')}")
+        # Display last update time (of the live snapshot this session is showing)
+        settled = st.session_state.get(LIVE_SNAPSHOT_KEY)
+        updated_at = settled[1] if settled is not None and not DEVELOPMENT_MODE else datetime.now()
+        st.info(f"Last updated: {updated_at.strftime('%H:%M:%S')}")
+
+        # Optional timing diagnostics, rendered once the rest of the page is built
+        show_diagnostics = st.checkbox("Show diagnostics", value=False)
 
         # Add some spacing
         st.markdown("---")
@@ -371,86 +325,149 @@ def main():
     # Auto-refresh logic
     if auto_refresh:
         time.sleep(30)
+        st.session_state.pop(LIVE_SNAPSHOT_KEY, None)
         st.rerun()
 
-    # Fetch data for all stocks with progress bar
-    if DEVELOPMENT_MODE:
-        st.info("🚀 Development Mode: Using mock data for faster iteration...")
-        progress_bar = st.progress(0)
-        status_text = st.empty()
+    # Development mode serves a seeded synthetic market instead of Yahoo Finance
+    set_data_source(SYNTHETIC if DEVELOPMENT_MODE else LIVE)
 
-        all_stock_data = {}
-        total_stocks = len(STOCKS)
-
-        for i, (symbol, company_name) in enumerate(STOCKS.items()):
-            status_text.text(f"Generating mock data for {symbol} - {company_name}")
-            progress_bar.progress((i + 1) / total_stocks)
-
-            stock_data = generate_mock_stock_data(symbol)
-            all_stock_data[symbol] = stock_data
+    # A replay running in this session reveals the bars that are due before the refresh
+    replay = get_replay_session()
+    bars_added = replay.advance() if replay is not None else 0
 
-            # Small delay for visual effect
-            time.sleep(0.01)
-
-        # Clear progress indicators
-        progress_bar.empty()
-        status_text.empty()
-        st.success("✅ Mock data loaded successfully!")
+    # Fetch data for all stocks with progress bar
+    if replay is not None:
+        st.info(f"⏯️ Replaying {replay.recording.name}: session of {replay.current_date:%Y-%m-%d}")
+    elif DEVELOPMENT_MODE:
+        st.info("🚀 Development Mode: Using mock data for faster iteration...")
     else:
         st.info("Fetching real-time stock data...")
-        progress_bar = st.progress(0)
-        status_text = st.empty()
+    progress_bar = st.progress(0)
+    status_text = st.empty()
 
+    def fetch_equities():
         all_stock_data = {}
         total_stocks = len(STOCKS)
 
-        for i, (symbol, company_name) in enumerate(STOCKS.items()):
-            status_text.text(f"Fetching data for {symbol} - {company_name}")
-            progress_bar.progress((i + 1) / total_stocks)
-
-            stock_data = fetch_stock_data(symbol)
-            all_stock_data[symbol] = stock_data
-
-            # Small delay to prevent rate limiting
-            time.sleep(0.1)
+        if replay is not None:
+            # Recorded bars up to the replay position, for the whole universe at once
+            status_text.text(f"Replaying {replay.recording.name}")
+            all_stock_data = replay.stock_data()
+            progress_bar.progress(1.0)
+        elif DEVELOPMENT_MODE:
+            # The whole synthetic market is simulated in one vectorized pass
+            status_text.text(f"Simulating market data for {total_stocks} symbols")
+            all_stock_data = load_all_stock_data()
+            progress_bar.progress(1.0)
+        elif LIVE_SNAPSHOT_KEY in st.session_state:
+            # Widget reruns redraw the quotes fetched on the last refresh, so the snapshot version
+            # (and every render model memoized on it) only changes on Refresh Data or auto-refresh
+            status_text.text("Using the quotes of the last refresh")
+            all_stock_data = st.session_state[LIVE_SNAPSHOT_KEY][0]
+            progress_bar.progress(1.0)
+        else:
+            with timed("fetch_all"):
+                for i, (symbol, company_name) in enumerate(STOCKS.items()):
+                    status_text.text(f"Fetching data for {symbol} - {company_name}")
+                    progress_bar.progress((i + 1) / total_stocks)
+
+                    # The shared session retries transient failures with backoff and the request
+                    # budget paces upstream calls, so symbols are fetched back to back
+                    all_stock_data[symbol] = fetch_stock_data(symbol)
+            st.session_state[LIVE_SNAPSHOT_KEY] = (all_stock_data, datetime.now())
+        return all_stock_data
+
+    def fetch_cpi():
+        # Status messages are shown later, inside the Inflation tab
+        notices = []
+        inflation_df = load_cpi_data(DEVELOPMENT_MODE, notify=lambda kind, message: notices.append((kind, message)))
+        return inflation_df, notices
+
+    # Equities and CPI come from independent upstreams: fetch them at the same time
+    results = run_refresh({"equities": fetch_equities, "cpi": fetch_cpi})
+    inflation_df, cpi_notices = results["cpi"]
+    all_stock_data = StockSnapshot(results["equities"], cpi=inflation_df, cpi_notices=cpi_notices)
+
+    # Clear progress indicators
+    progress_bar.empty()
+    status_text.empty()
+    if DEVELOPMENT_MODE:
+        st.success("✅ Mock data loaded successfully!")
 
-        # Clear progress indicators
-        progress_bar.empty()
-        status_text.empty()
+    with st.sidebar:
+        st.markdown("---")
+        replay_controls(all_stock_data)
+        st.markdown("---")
+        alert_controls(all_stock_data)
+        st.markdown("---")
+        screen = screener_controls(all_stock_data)
 
-    # Create tabs (5 tabs including inflation)
-    tab1, tab2, tab3, tab4, tab5 = st.tabs([
+    # Create tabs (6 tabs including inflation and intraday)
+    tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
         "📊 Summary Table",
         "🌟 Golden Cross",
         "💀 Death Cross",
         "📈 Volume Analysis",
-        "📊 Inflation (CPI)"
+        "📊 Inflation (CPI)",
+        "⏱️ Intraday"
     ])
 
     # Tab 1: Summary Table
-    with tab1:
-        create_summary_table_tab(all_stock_data)
+    with tab1, timed("render_summary"):
+        create_summary_table_tab(all_stock_data, screen)
 
     # Tab 2: Golden Cross
-    with tab2:
+    with tab2, timed("render_golden_cross"):
         create_golden_cross_tab(all_stock_data)
 
     # Tab 3: Death Cross
-    with tab3:
+    with tab3, timed("render_death_cross"):
         create_death_cross_tab(all_stock_data)
 
     # Tab 4: Volume Analysis
-    with tab4:
+    with tab4, timed("render_volume_analysis"):
         create_volume_analysis_tab(all_stock_data)
 
     # Tab 5: Inflation (CPI)
-    with tab5:
-        create_inflation_tab(development_mode=DEVELOPMENT_MODE)
+    with tab5, timed("render_inflation"):
+        create_inflation_tab(
+            development_mode=DEVELOPMENT_MODE,
+            inflation_df=all_stock_data.cpi,
+            notices=all_stock_data.cpi_notices,
+        )
+
+    # Tab 6: Intraday
+    with tab6, timed("render_intraday"):
+        create_intraday_tab(all_stock_data)
 
     # Footer
     st.markdown("---")
     st.markdown("*Data provided by Yahoo Finance. This is not financial advice.*")
 
+    if show_diagnostics:
+        with st.sidebar:
+            st.markdown("---")
+            render_diagnostics_panel()
+            render_request_accounting()
+
+            render_stats = get_render_cache().stats()
+            st.caption(
+                f"Render cache: {render_stats['entries']} models, {render_stats['bytes'] / 1e6:.1f} MB, "
+                f"{render_stats['hits']} hits / {render_stats['misses']} misses"
+            )
+
+    # Refresh latency of a replay: from when its newest bar was due to the end of this rerun
+    if replay is not None and bars_added:
+        record_span("replay_latency", replay.record_refresh())
+
+    finish_rerun()
+
+    # Keep the replay streaming until its last bar; as fast as possible reruns right away
+    if replay is not None and not replay.finished:
+        if replay.speed is not None:
+            time.sleep(REPLAY_REFRESH_INTERVAL)
+        st.rerun()
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,63 @@
+"""
+Alerts panel for SparkVibe Finance application
+Sidebar alert rules and the latest alerts; the rules run on every refresh against the
+symbols whose data changed
+"""
+
+from datetime import datetime
+
+import streamlit as st
+from utils.constants import ALERT_VOLUME_MULTIPLE, ALERT_EARNINGS_DAYS, ALERT_PANEL_ITEMS, ALERT_LOG_PATH
+from utils.timing import timed
+from utils.data_source import get_data_source
+from utils.alerts import get_alert_engine
+
+ALERT_ICONS = {"golden_cross": "✨", "death_cross": "⚠️", "volume_spike": "📊", "earnings_soon": "📅"}
+
+
+def alert_rules():
+    """Rule settings widgets; returns the enabled rules as (rule name, parameter) pairs"""
+    rules = []
+    with st.expander("Alert rules"):
+        if st.checkbox("Golden cross", value=True, key="alert_golden_cross"):
+            rules.append(("golden_cross", None))
+        if st.checkbox("Death cross", value=True, key="alert_death_cross"):
+            rules.append(("death_cross", None))
+        volume_enabled = st.checkbox("Volume spike", value=True, key="alert_volume_enabled")
+        multiple = st.number_input("Volume at least (× average)", min_value=1.0, max_value=20.0,
+                                   value=ALERT_VOLUME_MULTIPLE, step=0.5, key="alert_volume_multiple")
+        if volume_enabled:
+            rules.append(("volume_spike", float(multiple)))
+        earnings_enabled = st.checkbox("Upcoming earnings", value=True, key="alert_earnings_enabled")
+        days = st.number_input("Earnings within (days)", min_value=0, max_value=60,
+                               value=ALERT_EARNINGS_DAYS, step=1, key="alert_earnings_days")
+        if earnings_enabled:
+            rules.append(("earnings_soon", int(days)))
+        st.caption(f"Alerts are also appended to {ALERT_LOG_PATH}")
+    return tuple(rules)
+
+
+def alert_controls(all_stock_data):
+    """Sidebar alerts: evaluate the rules on this refresh, toast new alerts and list the latest ones"""
+    st.subheader("Alerts")
+    rules = alert_rules()
+    engine = get_alert_engine(get_data_source())
+
+    with timed("alerts"):
+        new_alerts = engine.evaluate(all_stock_data, rules)
+    for alert in new_alerts[:3]:
+        st.toast(f"{alert['symbol']}: {alert['message']}", icon=ALERT_ICONS[alert["rule"]])
+    if len(new_alerts) > 3:
+        st.toast(f"{len(new_alerts) - 3} more alerts in the sidebar", icon="🔔")
+
+    stats = engine.stats(rules)
+    st.caption(f"Checked {stats['changed']} changed of {stats['symbols']} symbols: {stats['fired']} new alerts")
+    if engine.sink_errors:
+        st.warning("Could not deliver alerts: " + "; ".join(engine.sink_errors))
+
+    recent = list(engine.recent)[:ALERT_PANEL_ITEMS]
+    if not recent:
+        st.caption("No alerts yet")
+    for alert in recent:
+        fired = datetime.fromisoformat(alert["time"])
+        st.caption(f"{ALERT_ICONS[alert['rule']]} {fired:%H:%M} **{alert['symbol']}**: {alert['message']}")
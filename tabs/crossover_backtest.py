@@ -0,0 +1,82 @@
+"""
+Crossover backtest for SparkVibe Finance application
+Shared by the Golden Cross and Death Cross tabs: how past crossovers of a moving-average
+pair played out per stock (forward returns, hit rates and drawdowns)
+"""
+
+import numpy as np
+import streamlit as st
+from utils.constants import STOCKS, CROSSOVER_PAIRS, BACKTEST_PERIOD, BACKTEST_HORIZONS
+from utils.timing import timed
+from utils.snapshot import snapshot_version
+from utils.render_cache import memoize_render
+from utils.data_source import load_close_matrix
+from utils.backtest import backtest_crossovers
+
+
+def build_crossover_backtest(pair):
+    """Backtest a pair over the cached daily history of the universe; returns (results, sessions scanned)"""
+    symbols, close = load_close_matrix(list(STOCKS), BACKTEST_PERIOD)
+    return backtest_crossovers(symbols, close, pair), len(close)
+
+
+def _percent(value, signed=True):
+    return "N/A" if np.isnan(value) else (f"{value:+.1f}%" if signed else f"{value:.0f}%")
+
+
+def show_crossover_backtest(all_stock_data, direction):
+    """Historical performance of golden (direction 1) or death (direction -1) crosses"""
+    name = "golden" if direction > 0 else "death"
+    signal = "Golden cross" if direction > 0 else "Death cross"
+    st.markdown("### Historical Performance")
+    st.write(f"How past {name} crosses played out for each stock: returns after the signal, "
+             "how often it was right, and how far the price went against it.")
+
+    # Off by default: the live source loads the long daily history of every symbol
+    if not st.toggle("Backtest crossover signals", value=False, key=f"{name}_backtest_enabled"):
+        st.info(f"Turn on the backtest to see forward returns, hit rates and drawdowns after past {name} crosses.")
+        return
+
+    pair_names = list(CROSSOVER_PAIRS.keys())
+    pair_label = st.selectbox("Moving-average pair", options=pair_names, index=pair_names.index("SMA 50/200"),
+                              key=f"{name}_backtest_pair")
+
+    # Both signals of a pair are backtested at once and shared by the two cross tabs
+    with timed("crossover_backtest"):
+        results, sessions = memoize_render(
+            "crossover_backtest", "results", snapshot_version(all_stock_data),
+            lambda: build_crossover_backtest(CROSSOVER_PAIRS[pair_label]),
+            params=(pair_label,),
+        )
+    rows = results[results["Signal"] == signal]
+    pooled = rows[rows["Symbol"] == "All"].iloc[0]
+    per_symbol = rows[(rows["Symbol"] != "All") & (rows["Signals"] > 0)]
+
+    st.caption(f"{int(pooled['Signals'])} {name} crosses of {pair_label} in up to {sessions} sessions "
+               f"of daily history across {len(rows) - 1} stocks")
+    if pooled["Signals"] == 0:
+        st.info(f"No {name} crosses of {pair_label} in the available history")
+        return
+
+    # Pooled over every signal of every stock
+    columns = st.columns(len(BACKTEST_HORIZONS) + 1)
+    for column, horizon in zip(columns, BACKTEST_HORIZONS):
+        with column:
+            st.metric(f"{horizon}-Day Avg Return", _percent(pooled[f"{horizon}D Avg %"]),
+                      delta=f"{_percent(pooled[f'{horizon}D Hit %'], signed=False)} hit rate", delta_color="off")
+    with columns[-1]:
+        st.metric(f"Avg Drawdown ({max(BACKTEST_HORIZONS)}D)", _percent(pooled["Avg Drawdown %"]),
+                  delta=f"worst {_percent(pooled['Worst Drawdown %'])}", delta_color="off")
+
+    per_symbol = per_symbol.drop(columns=["Signal"]).sort_values("Signals", ascending=False, kind="stable")
+    per_symbol.insert(1, "Company", per_symbol["Symbol"].map(STOCKS))
+    column_config = {"Signals": st.column_config.NumberColumn("Signals", format="%d")}
+    for horizon in BACKTEST_HORIZONS:
+        column_config[f"{horizon}D Avg %"] = st.column_config.NumberColumn(f"{horizon}D Avg", format="%+.1f%%")
+        column_config[f"{horizon}D Hit %"] = st.column_config.NumberColumn(f"{horizon}D Hit", format="%.0f%%")
+    column_config["Avg Drawdown %"] = st.column_config.NumberColumn(
+        "Avg Drawdown", format="%.1f%%",
+        help=f"Worst move against the signal within {max(BACKTEST_HORIZONS)} sessions (long on golden, short on death)",
+    )
+    column_config["Worst Drawdown %"] = st.column_config.NumberColumn("Worst Drawdown", format="%.1f%%")
+    st.dataframe(per_symbol, use_container_width=True, hide_index=True, column_config=column_config)
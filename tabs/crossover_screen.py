@@ -0,0 +1,85 @@
+"""
+Crossover screen for SparkVibe Finance application
+Shared by the Golden Cross and Death Cross tabs: scans the whole universe for crossovers
+of several moving-average pairs at once (presets and custom pairs)
+"""
+
+import streamlit as st
+from utils.constants import STOCKS, CROSSOVER_PAIRS, CROSSOVER_LOOKBACK, CROSSOVER_MAX_WINDOW
+from utils.timing import timed
+from utils.snapshot import snapshot_version
+from utils.render_cache import memoize_render
+from utils.data_source import load_close_matrix
+from utils.crossovers import scan_crossovers, crossover_events, parse_pairs, pair_name
+
+
+def build_crossover_scan(pairs, lookback):
+    """Scan 2 years of daily closes of the universe for every pair; returns (symbols, close matrix, scan)"""
+    symbols, close = load_close_matrix(list(STOCKS), "2y")
+    return symbols, close, scan_crossovers(close, pairs, lookback)
+
+
+def show_crossover_screen(all_stock_data, direction):
+    """Configurable screen for golden (direction 1) or death (direction -1) crosses of several pairs"""
+    name = "golden" if direction > 0 else "death"
+    st.markdown("### Crossover Screen")
+    st.write(f"Scan every stock for {name} crosses of several moving-average pairs at once, including your own pairs.")
+
+    # Off by default: the live source loads 2 years of history for every symbol
+    if not st.toggle("Run crossover screen", value=False, key=f"{name}_screen_enabled"):
+        st.info("Turn on the screen to scan SMA 20/50, SMA 50/200, EMA 12/26 and custom pairs.")
+        return
+
+    col1, col2, col3 = st.columns([2, 2, 1])
+    with col1:
+        presets = st.multiselect("Pairs", options=list(CROSSOVER_PAIRS.keys()), default=list(CROSSOVER_PAIRS.keys()),
+                                 key=f"{name}_screen_pairs")
+    with col2:
+        custom = st.text_input("Custom pairs", placeholder="e.g. SMA 10/30, EMA 5/20", key=f"{name}_screen_custom")
+    with col3:
+        lookback = st.number_input("Within (sessions)", min_value=1, max_value=120, value=CROSSOVER_LOOKBACK, step=1,
+                                   key=f"{name}_screen_lookback")
+
+    custom_pairs, rejected = parse_pairs(custom)
+    if rejected:
+        st.warning(f"Ignored custom pairs: {', '.join(rejected)}. "
+                   f"Use e.g. SMA 10/30 or EMA 5/20 (fast window first, windows up to {CROSSOVER_MAX_WINDOW}).")
+
+    pairs = tuple(dict.fromkeys([CROSSOVER_PAIRS[preset] for preset in presets] + custom_pairs))
+    if not pairs:
+        st.info("Select at least one pair to scan.")
+        return
+
+    # One scan per snapshot, pair set and lookback, shared by both cross tabs
+    with timed("crossover_scan"):
+        symbols, close, scan = memoize_render(
+            "crossover_screen", "scan", snapshot_version(all_stock_data),
+            lambda: build_crossover_scan(pairs, int(lookback)),
+            params=(pairs, int(lookback)),
+        )
+    events = crossover_events(symbols, close, scan, direction)
+
+    st.caption(f"Scanned {len(symbols)} of {len(STOCKS)} stocks for {len(pairs)} pairs: " + ", ".join(
+        f"{pair_name(pair)} ({int((events['Pair'] == pair_name(pair)).sum())})" for pair in pairs
+    ))
+    if len(symbols) < len(STOCKS):
+        st.info("Some stocks were deferred: upstream request budget reached. They will be scanned on a later refresh.")
+
+    if events.empty:
+        st.info(f"No {name} crosses of the selected pairs in the past {int(lookback)} sessions")
+        return
+
+    events.insert(1, "Company", events["Symbol"].map(STOCKS))
+    st.dataframe(
+        events,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "Days Ago": st.column_config.NumberColumn("Days Ago", format="%.0f"),
+            "Price": st.column_config.NumberColumn("Price", format="$%.1f"),
+            "Fast MA": st.column_config.NumberColumn("Fast MA", format="$%.1f"),
+            "Slow MA": st.column_config.NumberColumn("Slow MA", format="$%.1f"),
+            "Spread %": st.column_config.NumberColumn("Spread %", format="%+.2f%%",
+                                                      help="Fast vs. slow moving average at the last session"),
+        },
+    )
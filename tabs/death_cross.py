@@ -4,8 +4,30 @@ Death Cross tab for SparkVibe Finance application
 
 import streamlit as st
 import pandas as pd
-import yfinance as yf
-from utils.constants import STOCKS
+import numpy as np
+from utils.constants import STOCKS, CROSS_TIMEFRAMES
+from utils.timing import timed
+from utils.snapshot import build_snapshot, snapshot_version
+from utils.render_cache import memoize_render
+from utils.request_budget import allow_request, PRIORITY_NORMAL
+from utils.data_source import load_bars
+from utils.resample import bars_for_sessions, moving_average_label
+from utils.screener import CROSS_FIELD
+from tabs.screener import screen_symbols
+from tabs.crossover_screen import show_crossover_screen
+from tabs.crossover_backtest import show_crossover_backtest
+
+
+def build_death_cross_table(all_stock_data, symbols):
+    """Build the death cross table from the columnar snapshot (whole-column operations, no per-cell loop)"""
+    snapshot = build_snapshot(all_stock_data, symbols)
+    return pd.DataFrame({
+        "Symbol": snapshot["Symbol"],
+        "Company": snapshot["Company"],
+        "Current Price": snapshot["Price"],
+        "Daily Change": snapshot["Change %"],
+        "Death Cross Days": snapshot["death_cross_days_ago"],
+    })
 
 
 def create_death_cross_tab(all_stock_data):
@@ -103,52 +125,20 @@ def create_death_cross_tab(all_stock_data):
     }
     </style>
     """, unsafe_allow_html=True)
-    # Filter stocks with death cross and remove any None values
-    death_cross_stocks = {symbol: data for symbol, data in all_stock_data.items()
-                         if data is not None and data.get("death_cross", False)}
+    # Stocks with a death cross, from the universe screen index
+    death_symbols = screen_symbols(all_stock_data, [(CROSS_FIELD, "in", ["Death cross"])])
 
-    if death_cross_stocks:
-        st.warning(f"Found {len(death_cross_stocks)} stocks with a death cross in the past 30 days")
+    if death_symbols:
+        st.warning(f"Found {len(death_symbols)} stocks with a death cross in the past 30 days")
 
         # Create a table with stock information - using markdown to avoid st.table's non-interactive nature
         st.markdown("### Death Cross Stocks")
 
-        # Create a DataFrame for display with clickable symbols
-        death_cross_data = []
-        for symbol, data in death_cross_stocks.items():
-            # Format daily change with color
-            daily_change = data['percentage_change']
-            change_color = "green" if daily_change >= 0 else "red"
-            change_symbol = "+" if daily_change >= 0 else ""
-            formatted_change = f'<span style="color: {change_color};">{change_symbol}{daily_change:.1f}%</span>'
-
-            # Format death cross with traffic light system
-            days_ago = data.get("death_cross_days_ago", 0)
-            if days_ago <= 15:
-                death_cross_display = f"🟢 {days_ago}d ago"
-            elif days_ago <= 30:
-                death_cross_display = f"🟡 {days_ago}d ago"
-            else:
-                death_cross_display = f"🔴 {days_ago}d ago"
-
-            death_cross_data.append({
-                "Symbol": f'<a href="#" onclick="parent.postMessage({{cmd: \'streamlit:setComponentValue\', componentValue: \'{symbol}\', componentKey: \'stock_click\'}}, \'*\'); return false;" style="text-decoration: none; color: #1E88E5; font-weight: bold;">{symbol}</a>',
-                "Company": STOCKS[symbol],
-                "Current Price": f"${data['current_price']:.1f}",
-                "Daily Change": formatted_change,
-                "Death Cross": death_cross_display
-            })
-
-        death_cross_df = pd.DataFrame(death_cross_data)
-
-        # Create a clean DataFrame for sorting (without HTML formatting)
-        sort_death_cross_df = pd.DataFrame({
-            "Symbol": [symbol for symbol in death_cross_stocks.keys()],
-            "Company": [STOCKS[symbol] for symbol in death_cross_stocks.keys()],
-            "Current Price": [data['current_price'] for data in death_cross_stocks.values()],
-            "Daily Change": [data['percentage_change'] for data in death_cross_stocks.values()],
-            "Death Cross Days": [data.get("death_cross_days_ago", 0) for data in death_cross_stocks.values()]
-        })
+        # Table is memoized against the snapshot version, so widget-only reruns reuse it
+        sort_death_cross_df = memoize_render(
+            "death_cross", "table", snapshot_version(all_stock_data),
+            lambda: build_death_cross_table(all_stock_data, death_symbols),
+        )
 
         # Display the dataframe with built-in sorting using NumberColumn for proper sorting
         st.dataframe(
@@ -168,38 +158,48 @@ def create_death_cross_tab(all_stock_data):
         # Display charts for all death cross stocks
         st.markdown("### Death Cross Charts")
 
+        # Weekly and monthly bars are resampled from the cached daily history (no extra upstream request);
+        # the averages span about 50 and 200 sessions in every timeframe
+        timeframe = st.radio("Chart timeframe", options=CROSS_TIMEFRAMES, horizontal=True, key="death_cross_timeframe")
+        fast_window, slow_window = bars_for_sessions(50, timeframe), bars_for_sessions(200, timeframe)
+        fast_label, slow_label = moving_average_label(50, timeframe), moving_average_label(200, timeframe)
+
         # Show charts for each stock with death cross
-        for symbol, stock_data in death_cross_stocks.items():
+        for symbol in death_symbols:
             st.subheader(f"📊 {symbol} - {STOCKS[symbol]}")
 
-            # Fetch historical data for the past 250 days
-            ticker = yf.Ticker(symbol)
-            hist = ticker.history(period="250d")
+            # Skip the chart for now if the upstream request budget is used up
+            if not allow_request(PRIORITY_NORMAL):
+                st.info(f"Chart for {symbol} deferred: upstream request budget reached. It will load on a later refresh.")
+                st.markdown("---")
+                continue
+
+            # Fetch 2 years of history (shared with the Volume Analysis charts) in the chart timeframe
+            with timed("cross_history", symbol):
+                hist = load_bars(symbol, "2y", timeframe)
 
-            if not hist.empty and len(hist) >= 200:
+            if not hist.empty and len(hist) >= slow_window:
                 # Calculate moving averages
-                hist['MA50'] = hist['Close'].rolling(window=50).mean()
-                hist['MA200'] = hist['Close'].rolling(window=200).mean()
+                fast_ma = hist['Close'].rolling(window=fast_window).mean()
+                slow_ma = hist['Close'].rolling(window=slow_window).mean()
 
                 # Create a DataFrame for the chart
                 chart_data = pd.DataFrame({
                     'Date': hist.index,
                     'Price': hist['Close'],
-                    '50-Day MA': hist['MA50'],
-                    '200-Day MA': hist['MA200']
+                    fast_label: fast_ma,
+                    slow_label: slow_ma
                 })
 
-                # Find the crossover point(s)
-                crossover_points = []
-                for i in range(1, len(hist)):
-                    if (hist['MA50'].iloc[i] < hist['MA200'].iloc[i] and
-                        hist['MA50'].iloc[i-1] >= hist['MA200'].iloc[i-1]):
-                        crossover_points.append(i)
+                # Find the crossover point(s) (comparisons with missing averages are False)
+                crossed = (fast_ma < slow_ma) & (fast_ma.shift() >= slow_ma.shift())
+                crossover_points = list(np.flatnonzero(crossed.to_numpy()))
 
                 # Create the chart
-                chart = st.line_chart(
-                    chart_data.set_index('Date')[['Price', '50-Day MA', '200-Day MA']]
-                )
+                with timed("chart_render", symbol):
+                    chart = st.line_chart(
+                        chart_data.set_index('Date')[['Price', fast_label, slow_label]]
+                    )
 
                 # Add annotation about the crossover
                 if crossover_points:
@@ -217,3 +217,9 @@ def create_death_cross_tab(all_stock_data):
         st.write("The charts above show stocks that have experienced a death cross in the past 30 days.")
     else:
         st.info("No stocks with a death cross in the past 30 days were found")
+
+    # Universe-wide screen over more moving-average pairs
+    show_crossover_screen(all_stock_data, direction=-1)
+
+    # How past signals played out, from the cached daily history
+    show_crossover_backtest(all_stock_data, direction=-1)
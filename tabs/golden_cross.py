@@ -4,8 +4,33 @@ Golden Cross tab for SparkVibe Finance application
 
 import streamlit as st
 import pandas as pd
-import yfinance as yf
-from utils.constants import STOCKS
+import numpy as np
+from utils.constants import STOCKS, CROSS_TIMEFRAMES
+from utils.timing import timed
+from utils.snapshot import build_snapshot, snapshot_version
+from utils.render_cache import memoize_render
+from utils.formatters import format_cross_column
+from utils.request_budget import allow_request, PRIORITY_NORMAL
+from utils.data_source import load_bars
+from utils.resample import bars_for_sessions, moving_average_label
+from utils.screener import CROSS_FIELD
+from tabs.screener import screen_symbols
+from tabs.crossover_screen import show_crossover_screen
+from tabs.crossover_backtest import show_crossover_backtest
+
+
+def build_golden_cross_table(all_stock_data, symbols):
+    """Build the golden cross table from the columnar snapshot, formatting whole columns at once"""
+    snapshot = build_snapshot(all_stock_data, symbols)
+    return pd.DataFrame({
+        "Symbol": snapshot["Symbol"],
+        "Company": snapshot["Company"],
+        "Current Price": snapshot["Price"],
+        "Daily Change": snapshot["Change %"],
+        # Format Golden Cross with traffic light system
+        "Golden Cross": format_cross_column(snapshot["golden_cross"], snapshot["golden_cross_days_ago"], parenthesized=False),
+        "Golden Cross Days": snapshot["golden_cross_days_ago"],
+    })
 
 
 def create_golden_cross_tab(all_stock_data):
@@ -30,38 +55,20 @@ def create_golden_cross_tab(all_stock_data):
     </style>
     """, unsafe_allow_html=True)
 
-    # Filter stocks with golden cross and remove any None values
-    golden_cross_stocks = {symbol: data for symbol, data in all_stock_data.items()
-                          if data is not None and data.get("golden_cross", False)}
+    # Stocks with a golden cross, from the universe screen index
+    golden_symbols = screen_symbols(all_stock_data, [(CROSS_FIELD, "in", ["Golden cross"])])
 
-    if golden_cross_stocks:
-        st.success(f"Found {len(golden_cross_stocks)} stocks with a golden cross in the past 30 days")
+    if golden_symbols:
+        st.success(f"Found {len(golden_symbols)} stocks with a golden cross in the past 30 days")
 
         # Create a table with stock information - using markdown to avoid st.table's non-interactive nature
         st.markdown("### Golden Cross Stocks")
 
-        # Create a DataFrame for display
-        golden_cross_data = []
-        for symbol, data in golden_cross_stocks.items():
-            # Format Golden Cross with traffic light system
-            days_ago = data.get("golden_cross_days_ago", 0)
-            if days_ago <= 15:
-                golden_cross_display = f"🟢 {days_ago}d ago"
-            elif days_ago <= 30:
-                golden_cross_display = f"🟡 {days_ago}d ago"
-            else:
-                golden_cross_display = f"🔴 {days_ago}d ago"
-
-            golden_cross_data.append({
-                "Symbol": symbol,
-                "Company": STOCKS[symbol],
-                "Current Price": data['current_price'],
-                "Daily Change": data['percentage_change'],
-                "Golden Cross": golden_cross_display,
-                "Golden Cross Days": days_ago
-            })
-
-        golden_cross_df = pd.DataFrame(golden_cross_data)
+        # Table is memoized against the snapshot version, so widget-only reruns reuse it
+        golden_cross_df = memoize_render(
+            "golden_cross", "table", snapshot_version(all_stock_data),
+            lambda: build_golden_cross_table(all_stock_data, golden_symbols),
+        )
 
         # Display the dataframe with built-in sorting and improved formatting
         st.dataframe(
@@ -82,38 +89,48 @@ def create_golden_cross_tab(all_stock_data):
         # Display charts for all golden cross stocks
         st.markdown("### Golden Cross Charts")
 
+        # Weekly and monthly bars are resampled from the cached daily history (no extra upstream request);
+        # the averages span about 50 and 200 sessions in every timeframe
+        timeframe = st.radio("Chart timeframe", options=CROSS_TIMEFRAMES, horizontal=True, key="golden_cross_timeframe")
+        fast_window, slow_window = bars_for_sessions(50, timeframe), bars_for_sessions(200, timeframe)
+        fast_label, slow_label = moving_average_label(50, timeframe), moving_average_label(200, timeframe)
+
         # Show charts for each stock with golden cross
-        for symbol, stock_data in golden_cross_stocks.items():
+        for symbol in golden_symbols:
             st.subheader(f"📊 {symbol} - {STOCKS[symbol]}")
 
-            # Fetch historical data for the past 250 days
-            ticker = yf.Ticker(symbol)
-            hist = ticker.history(period="250d")
+            # Skip the chart for now if the upstream request budget is used up
+            if not allow_request(PRIORITY_NORMAL):
+                st.info(f"Chart for {symbol} deferred: upstream request budget reached. It will load on a later refresh.")
+                st.markdown("---")
+                continue
+
+            # Fetch 2 years of history (shared with the Volume Analysis charts) in the chart timeframe
+            with timed("cross_history", symbol):
+                hist = load_bars(symbol, "2y", timeframe)
 
-            if not hist.empty and len(hist) >= 200:
+            if not hist.empty and len(hist) >= slow_window:
                 # Calculate moving averages
-                hist['MA50'] = hist['Close'].rolling(window=50).mean()
-                hist['MA200'] = hist['Close'].rolling(window=200).mean()
+                fast_ma = hist['Close'].rolling(window=fast_window).mean()
+                slow_ma = hist['Close'].rolling(window=slow_window).mean()
 
                 # Create a DataFrame for the chart
                 chart_data = pd.DataFrame({
                     'Date': hist.index,
                     'Price': hist['Close'],
-                    '50-Day MA': hist['MA50'],
-                    '200-Day MA': hist['MA200']
+                    fast_label: fast_ma,
+                    slow_label: slow_ma
                 })
 
-                # Find the crossover point(s)
-                crossover_points = []
-                for i in range(1, len(hist)):
-                    if (hist['MA50'].iloc[i] > hist['MA200'].iloc[i] and
-                        hist['MA50'].iloc[i-1] <= hist['MA200'].iloc[i-1]):
-                        crossover_points.append(i)
+                # Find the crossover point(s) (comparisons with missing averages are False)
+                crossed = (fast_ma > slow_ma) & (fast_ma.shift() <= slow_ma.shift())
+                crossover_points = list(np.flatnonzero(crossed.to_numpy()))
 
                 # Create the chart
-                chart = st.line_chart(
-                    chart_data.set_index('Date')[['Price', '50-Day MA', '200-Day MA']]
-                )
+                with timed("chart_render", symbol):
+                    chart = st.line_chart(
+                        chart_data.set_index('Date')[['Price', fast_label, slow_label]]
+                    )
 
                 # Add annotation about the crossover
                 if crossover_points:
@@ -131,3 +148,9 @@ def create_golden_cross_tab(all_stock_data):
         st.write("The charts above show stocks that have experienced a golden cross in the past 30 days.")
     else:
         st.warning("No stocks with a golden cross in the past 30 days were found")
+
+    # Universe-wide screen over more moving-average pairs
+    show_crossover_screen(all_stock_data, direction=1)
+
+    # How past signals played out, from the cached daily history
+    show_crossover_backtest(all_stock_data, direction=1)
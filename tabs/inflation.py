@@ -5,142 +5,73 @@ Shows Consumer Price Index (CPI) data and inflation trends
 
 import streamlit as st
 import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
 from datetime import datetime, timedelta
-import requests
-import json
-import random
-
-
-def fetch_real_cpi_data():
-    """Fetch real CPI data from Bureau of Labor Statistics (BLS) API"""
-
+from utils.timing import timed
+from utils.constants import CPI_HISTORY_YEARS, CPI_BACKFILL_START_YEAR
+from utils.cpi_archive import (
+    archive_is_current, refresh_archive, load_archive_frame,
+    backfill_archive, backfilled_chunks, year_chunks, archive_version,
+)
+from utils.charting import use_webgl, scatter_trace
+from utils.formatters import format_percent_column, traffic_light_column
+from utils.snapshot import frame_version
+from utils.cpi_cube import CPICube
+from utils.synthetic import synthetic_cpi_cube
+from utils.render_cache import memoize_render
+
+
+def show_notice(kind, message):
+    """Display a status message with the matching Streamlit element (info, success, warning)"""
+    getattr(st, kind)(message)
+
+
+def fetch_real_cpi_data(notify=show_notice):
+    """
+    Fetch real CPI data from Bureau of Labor Statistics (BLS) API
+    Served from the local CPI archive, which is only refreshed from BLS after each scheduled release.
+    Status messages go through notify(kind, message) so a background fetch can defer them
+    """
     try:
-        # BLS API base URL - public access
-        base_url = "https://api.bls.gov/publicAPI/v2/timeseries/data/"
-
-        # BLS series IDs for CPI data (these are the official BLS series IDs)
-        bls_series = {
-            "All Items": "CUUR0000SA0",
-            "Core CPI (ex Food & Energy)": "CUUR0000SA0L1E",
-            "Food": "CUUR0000SAF1",
-            "Energy": "CUUR0000SA0E",
-            "Housing": "CUUR0000SAH1",
-            "Transportation": "CUUR0000SAT1",
-            "Medical Care": "CUUR0000SAM",
-            "Recreation": "CUUR0000SAR",
-            "Education": "CUUR0000SAE1",
-            "Apparel": "CUUR0000SAA",
-            "Shelter": "CUUR0000SEHA",
-            "Used Vehicles": "CUUR0000SETA02",
-            "New Vehicles": "CUUR0000SETA01",
-            "Gasoline": "CUUR0000SETB01",
-        }
-
         # Calculate date range (24 months back)
-        current_year = datetime.now().year
-        start_year = current_year - 2
-
-        all_data = []
-        successful_fetches = 0
-
-        # Process series in batches (BLS API limit is 25 series per request)
-        series_list = list(bls_series.keys())
-        batch_size = 10
-
-        for i in range(0, len(series_list), batch_size):
-            batch_categories = series_list[i:i + batch_size]
-            batch_series_ids = [bls_series[cat] for cat in batch_categories]
-
-            try:
-                # Prepare the request payload
-                payload = {
-                    "seriesid": batch_series_ids,
-                    "startyear": str(start_year),
-                    "endyear": str(current_year),
-                    "calculations": True,  # This gives us 12-month percent changes
-                    "annualaverage": False
-                }
-
-                headers = {'Content-type': 'application/json'}
-                response = requests.post(
-                    base_url,
-                    data=json.dumps(payload),
-                    headers=headers,
-                    timeout=30
-                )
-
-                if response.status_code == 200:
-                    json_data = response.json()
-
-                    if json_data.get('status') == 'REQUEST_SUCCEEDED' and 'Results' in json_data:
-                        series_data = json_data['Results']['series']
-
-                        for series_info in series_data:
-                            series_id = series_info['seriesID']
-
-                            # Find the category name for this series ID
-                            category = None
-                            for cat, sid in bls_series.items():
-                                if sid == series_id:
-                                    category = cat
-                                    break
-
-                            if category and 'data' in series_info:
-                                category_data_count = 0
-
-                                for data_point in series_info['data']:
-                                    try:
-                                        year = int(data_point['year'])
-                                        period = data_point['period']
-
-                                        # Skip annual averages and quarterly data
-                                        if period.startswith('M') and len(period) == 3:
-                                            month = int(period[1:])
-
-                                            # Get 12-month percent change if available
-                                            if 'calculations' in data_point and 'pct_changes' in data_point['calculations']:
-                                                pct_changes = data_point['calculations']['pct_changes']
-                                                if '12' in pct_changes:  # 12-month change
-                                                    rate = float(pct_changes['12'])
-
-                                                    date_obj = datetime(year, month, 1)
-
-                                                    all_data.append({
-                                                        'Date': date_obj.strftime('%Y-%m'),
-                                                        'Category': category,
-                                                        'Rate': round(rate, 1),
-                                                        'Month': date_obj.strftime('%Y-%m'),
-                                                        'Month_Name': date_obj.strftime('%b %Y'),
-                                                        'Date_Object': date_obj
-                                                    })
-                                                    category_data_count += 1
-                                    except (ValueError, TypeError, KeyError):
-                                        continue
-
-                                if category_data_count > 0:
-                                    successful_fetches += 1
-
-            except Exception as e:
-                continue
+        start_year = datetime.now().year - CPI_HISTORY_YEARS
+
+        refresh_failed = False
+        if not archive_is_current():
+            refresh_failed = refresh_archive(start_year) == 0
+
+        df = load_archive_frame(start_year)
+        categories = df['Category'].nunique()
 
         # If we got data for at least a few categories, use real data
-        if successful_fetches >= 3 and len(all_data) > 0:
-            df = pd.DataFrame(all_data)
-            # Sort by date to get most recent data
-            df = df.sort_values('Date_Object')
-            st.success(f"✅ Successfully fetched real CPI data from BLS API for {successful_fetches} categories")
+        if categories >= 3:
+            if refresh_failed:
+                notify("warning", f"⚠️ Could not refresh CPI data from the BLS API. Showing archived data through {df['Month_Name'].iloc[-1]}.")
+            else:
+                notify("success", f"✅ CPI data from the Bureau of Labor Statistics for {categories} categories (next update after the next scheduled release)")
             return df
         else:
-            st.warning("⚠️ BLS API access limited or no data available. Using realistic mock data based on recent CPI trends.")
+            notify("warning", "⚠️ BLS API access limited or no data available. Using realistic mock data based on recent CPI trends.")
             return generate_realistic_cpi_data()
 
     except Exception as e:
-        st.warning(f"⚠️ Error connecting to BLS API: {str(e)}. Using realistic mock data based on recent CPI trends.")
+        notify("warning", f"⚠️ Error connecting to BLS API: {str(e)}. Using realistic mock data based on recent CPI trends.")
         return generate_realistic_cpi_data()
 
 
+def latest_available_cpi_month():
+    """First day of the latest month with published CPI data (released with a ~2 month delay)"""
+    current_date = datetime.now()
+    latest_available_month = current_date.month - 2
+    latest_available_year = current_date.year
+
+    # Handle year rollover for the latest available data
+    if latest_available_month <= 0:
+        latest_available_month += 12
+        latest_available_year -= 1
+
+    return datetime(latest_available_year, latest_available_month, 1)
+
+
 def generate_realistic_cpi_data():
     """Generate realistic CPI data based on actual recent trends"""
 
@@ -162,82 +93,30 @@ def generate_realistic_cpi_data():
         "Gasoline": {"current": -3.5, "trend": "volatile", "volatility": 4.0},
     }
 
-    # Generate proper monthly dates - CPI data is released with ~2 month delay
-    current_date = datetime.now()
-    latest_available_month = current_date.month - 2
-    latest_available_year = current_date.year
-
-    if latest_available_month <= 0:
-        latest_available_month += 12
-        latest_available_year -= 1
-
-    dates = []
-    date_objects = []
-
-    # Generate 24 months of data
-    for i in range(24):
-        year = latest_available_year
-        month = latest_available_month - i
-
-        while month <= 0:
-            month += 12
-            year -= 1
-
-        month_date = datetime(year, month, 1)
-        date_objects.append(month_date)
-        dates.append(month_date.strftime("%Y-%m"))
-
-    dates.reverse()
-    date_objects.reverse()
-
-    inflation_data = []
-
-    for category, info in cpi_categories.items():
-        current_rate = info["current"]
-        trend = info["trend"]
-        volatility = info["volatility"]
-
-        for i, (date_str, date_obj) in enumerate(zip(dates, date_objects)):
-            if i == len(dates) - 1:  # Most recent month
-                rate = current_rate
-            else:
-                # Create realistic historical progression
-                months_back = len(dates) - 1 - i
-
-                if trend == "declining":
-                    # Rate was higher in the past, declining to current
-                    base_adjustment = months_back * 0.1
-                elif trend == "increasing":
-                    # Rate was lower in the past, increasing to current
-                    base_adjustment = -months_back * 0.1
-                elif trend == "volatile":
-                    # More random variation
-                    base_adjustment = random.uniform(-1.0, 1.0)
-                else:  # stable
-                    base_adjustment = random.uniform(-0.3, 0.3)
-
-                # Add monthly volatility
-                monthly_variation = random.uniform(-volatility, volatility)
-                rate = current_rate + base_adjustment + monthly_variation
-
-                # Keep within reasonable bounds
-                if category == "Energy" or category == "Gasoline":
-                    rate = max(-20.0, min(25.0, rate))
-                elif category == "Used Vehicles":
-                    rate = max(-15.0, min(15.0, rate))
-                else:
-                    rate = max(-5.0, min(10.0, rate))
-
-            inflation_data.append({
-                "Date": date_str,
-                "Category": category,
-                "Rate": round(rate, 1),
-                "Month": date_str,
-                "Month_Name": date_obj.strftime("%b %Y"),
-                "Date_Object": date_obj
-            })
-
-    return pd.DataFrame(inflation_data)
+    # Rate change per month going back (declining: it was higher before) and extra random swing
+    trend_slopes = {"declining": 0.1, "increasing": -0.1, "volatile": 0.0, "stable": 0.0}
+    trend_swings = {"declining": 0.0, "increasing": 0.0, "volatile": 1.0, "stable": 0.3}
+
+    # Keep within reasonable bounds
+    def bounds(category):
+        if category in ("Energy", "Gasoline"):
+            return (-20.0, 25.0)
+        if category == "Used Vehicles":
+            return (-15.0, 15.0)
+        return (-5.0, 10.0)
+
+    # 24 months for every category in one vectorized draw
+    cube = synthetic_cpi_cube(
+        current={category: info["current"] for category, info in cpi_categories.items()},
+        volatility={category: info["volatility"] for category, info in cpi_categories.items()},
+        trend={category: trend_slopes[info["trend"]] for category, info in cpi_categories.items()},
+        jitter={category: trend_swings[info["trend"]] for category, info in cpi_categories.items()},
+        bounds={category: bounds(category) for category in cpi_categories},
+        end=latest_available_cpi_month(),
+    )
+    inflation_data = cube.to_long()
+    inflation_data["Rate"] = inflation_data["Rate"].round(1)
+    return inflation_data
 
 
 def generate_mock_inflation_data():
@@ -262,168 +141,285 @@ def generate_mock_inflation_data():
         "Gasoline": {"current": -3.5, "range": (-20.0, 25.0)},
     }
 
-    # Generate proper monthly dates - CPI data is released with ~2 month delay
-    current_date = datetime.now()
+    # 24 months ending with the latest available month, kept within realistic bounds
+    cube = synthetic_cpi_cube(
+        current={category: info["current"] for category, info in cpi_categories.items()},
+        volatility=1.0,
+        jitter=0.5,
+        bounds={category: info["range"] for category, info in cpi_categories.items()},
+        end=latest_available_cpi_month(),
+    )
+    return cube.to_long()
 
-    # CPI data is typically released 2 months behind (e.g., June data released in August)
-    # So if we're in September 2024, the latest available data would be July 2024
-    latest_available_month = current_date.month - 2
-    latest_available_year = current_date.year
 
-    # Handle year rollover for the latest available data
-    if latest_available_month <= 0:
-        latest_available_month += 12
-        latest_available_year -= 1
+def build_latest_rates(cube):
+    """Latest month's rates by category, plus the display table with status lights"""
+    # Latest rates with their month-over-month and year-over-year changes, highest first
+    latest_data = cube.latest_frame()
 
-    dates = []
-    date_objects = []
+    # Prepare data for display
+    display_data = latest_data.copy()
+    display_data['Rate_Display'] = format_percent_column(display_data['Rate'])
+
+    # Add color coding for the rates: deflation green, low yellow, moderate orange, high red
+    display_data['Status'] = traffic_light_column(display_data['Rate'], [0.0, 2.0, 4.0], ["🟢", "🟡", "🟠", "🔴"])
+
+    return latest_data, display_data
+
+
+def build_trend_figure(cube, selected_categories):
+    """Monthly CPI trend line chart for the selected categories"""
+    import plotly.graph_objects as go
+
+    # One column of the cube per selected category
+    chart_series = [(category, cube.series(category)) for category in selected_categories if category in cube.rates]
+
+    # Create the line chart (WebGL traces once there are too many points for SVG)
+    fig = go.Figure()
+    webgl = use_webgl(sum(len(series) for _, series in chart_series))
+
+    # Add a line for each selected category
+    for category, series in chart_series:
+        fig.add_trace(scatter_trace(
+            webgl,
+            x=series.index,  # Monthly dates for proper monthly intervals
+            y=series.to_numpy(),
+            mode='lines+markers',
+            name=category,
+            line=dict(width=2),
+            marker=dict(size=5),
+            hovertemplate=f'<b>{category}</b><br>' +
+                         'Month: %{x|%b %Y}<br>' +  # Format as "Jan 2024"
+                         'Rate: %{y:.1f}%<br>' +
+                         '<extra></extra>'
+        ))
+
+    # Update layout with monthly-specific formatting
+    fig.update_layout(
+        title="Consumer Price Index - Monthly 12-Month Percentage Change",
+        xaxis_title="Month",
+        yaxis_title="12-Month % Change",
+        hovermode="x unified",
+        height=500,
+        showlegend=True,
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1
+        ),
+        xaxis=dict(
+            tickangle=45,  # Rotate month labels for better readability
+            tickformat='%b %Y',  # Format ticks as "Jan 2024"
+            dtick='M1',  # Show every month (M1 = 1 month interval)
+            tickmode='linear'
+        )
+    )
 
-    # Generate 24 months of data ending with the latest available month
-    for i in range(24):
-        # Calculate the exact month by going back i months from latest available
-        year = latest_available_year
-        month = latest_available_month - i
+    # Add horizontal line at 2% (Fed target)
+    fig.add_hline(
+        y=2.0,
+        line_dash="dash",
+        line_color="red",
+        annotation_text="Fed Target (2%)",
+        annotation_position="bottom right"
+    )
 
-        # Handle year rollover
-        while month <= 0:
-            month += 12
-            year -= 1
+    # Add horizontal line at 0% (deflation threshold)
+    fig.add_hline(
+        y=0.0,
+        line_dash="dot",
+        line_color="gray",
+        annotation_text="Deflation Threshold (0%)",
+        annotation_position="top right"
+    )
+
+    return fig
+
+
+def build_long_run_figure(history_df, selected_categories):
+    """Line chart of the whole archived 12-month change history for the selected categories"""
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+    webgl = use_webgl(len(history_df))
+    for category in selected_categories:
+        category_data = history_df[history_df['Category'] == category]
+        if category_data.empty:
+            continue
+        fig.add_trace(scatter_trace(
+            webgl,
+            x=category_data['Date_Object'],
+            y=category_data['Rate'],
+            mode='lines',
+            name=category,
+            line=dict(width=1.5),
+            hovertemplate=f'<b>{category}</b><br>' +
+                         'Month: %{x|%b %Y}<br>' +
+                         'Rate: %{y:.1f}%<br>' +
+                         '<extra></extra>'
+        ))
+
+    fig.update_layout(
+        title="Consumer Price Index - Long-Run 12-Month Percentage Change",
+        xaxis_title="Year",
+        yaxis_title="12-Month % Change",
+        hovermode="x unified",
+        height=450,
+        showlegend=True,
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        xaxis=dict(tickformat='%Y')
+    )
 
-        # Create date object for the first day of each month
-        month_date = datetime(year, month, 1)
-        date_objects.append(month_date)
-        dates.append(month_date.strftime("%Y-%m"))
+    # Fed target for reference, as on the monthly chart
+    fig.add_hline(y=2.0, line_dash="dash", line_color="red", annotation_text="Fed Target (2%)",
+                  annotation_position="bottom right")
 
-    # Reverse to get chronological order (oldest to newest)
-    dates.reverse()
-    date_objects.reverse()
+    return fig
 
-    inflation_data = []
 
-    for category, info in cpi_categories.items():
-        current_rate = info["current"]
-        rate_range = info["range"]
+def show_long_run_history(selected_categories):
+    """Long-run CPI context from the local archive, with a resumable backfill of older years"""
+    st.subheader(f"Long-Run Inflation Context (since {CPI_BACKFILL_START_YEAR})")
 
-        # Generate historical trend
-        for i, (date_str, date_obj) in enumerate(zip(dates, date_objects)):
-            # Add some realistic variation
-            if i == len(dates) - 1:  # Current month
-                rate = current_rate
+    chunks = year_chunks(CPI_BACKFILL_START_YEAR, datetime.now().year)
+    missing = len(chunks) - len(backfilled_chunks() & {f"{first}-{last}" for first, last in chunks})
+    if missing:
+        st.write(f"📜 {missing} of {len(chunks)} year ranges are not in the local archive yet. "
+                 "The backfill fetches them in parallel and resumes where it stopped if interrupted.")
+        if st.button("Backfill CPI history", key="cpi_backfill"):
+            progress_bar = st.progress(0.0, text="Backfilling CPI history...")
+            result = backfill_archive(
+                CPI_BACKFILL_START_YEAR,
+                progress=lambda done, total: progress_bar.progress(done / total, text=f"Backfilling CPI history... {done}/{total} requests"),
+            )
+            progress_bar.empty()
+            if result is None:
+                st.info("A CPI backfill is already running in another session; check back shortly.")
+            elif result[1]:
+                st.warning(f"⚠️ Backfilled {result[0]} year ranges; {result[1]} failed and will be retried on the next backfill.")
             else:
-                # Create a trend that leads to current rate
-                trend_factor = (len(dates) - 1 - i) / len(dates)
-                variation = random.uniform(-0.5, 0.5)
-                rate = base_rate = current_rate + (trend_factor * random.uniform(-1.0, 1.0)) + variation
+                st.success(f"✅ Backfilled {result[0]} year ranges of CPI history")
+
+    # The archive frame and figure only change when a refresh or backfill lands
+    version = archive_version()
+    history_df = memoize_render("inflation", "long_run_history", version, lambda: load_archive_frame(CPI_BACKFILL_START_YEAR))
+    history_df = history_df[history_df['Category'].isin(selected_categories)]
+    if history_df.empty or history_df['Date_Object'].dt.year.min() >= datetime.now().year - CPI_HISTORY_YEARS:
+        st.info("No long-run history archived yet for the selected categories.")
+        return
+
+    fig = memoize_render(
+        "inflation", "long_run_figure", version,
+        lambda: build_long_run_figure(history_df, selected_categories),
+        params=tuple(selected_categories),
+    )
+    with timed("plotly_render"):
+        st.plotly_chart(fig, use_container_width=True)
 
-                # Keep within realistic bounds
-                rate = max(rate_range[0], min(rate_range[1], rate))
 
-            inflation_data.append({
-                "Date": date_str,
-                "Category": category,
-                "Rate": rate,
-                "Month": date_str,
-                "Month_Name": date_obj.strftime("%b %Y"),  # e.g., "Jan 2024"
-                "Date_Object": date_obj
-            })
+def build_rate_comparison_figure(latest_data):
+    """Horizontal bar chart of the top 10 categories by current rate"""
+    import plotly.express as px
+
+    # Create a horizontal bar chart for current rates
+    fig_bar = px.bar(
+        latest_data.head(10),  # Top 10 categories
+        x='Rate',
+        y='Category',
+        orientation='h',
+        title="Top 10 Categories by Current Inflation Rate",
+        color='Rate',
+        color_continuous_scale=['green', 'yellow', 'orange', 'red'],
+        text='Rate'
+    )
+
+    fig_bar.update_traces(texttemplate='%{text:.1f}%', textposition='outside')
+    fig_bar.update_layout(
+        height=400,
+        xaxis_title="12-Month % Change",
+        yaxis_title="Category",
+        coloraxis_colorbar=dict(title="Inflation Rate (%)")
+    )
+
+    return fig_bar
 
-    return pd.DataFrame(inflation_data)
+
+def cpi_metric(cube, label, category):
+    """Metric with a category's latest rate and its change vs last month in percentage points"""
+    rate = cube.latest(category)
+    change = cube.latest_change(category)
+    st.metric(
+        label,
+        "N/A" if pd.isna(rate) else f"{rate:.1f}%",
+        delta=None if pd.isna(change) else f"{change:+.1f} pp vs last month"
+    )
 
 
-def create_inflation_tab(development_mode=False):
-    """Create the Inflation tab content"""
+def load_cpi_data(development_mode=False, notify=show_notice):
+    """Load the CPI data based on development mode"""
+    if development_mode:
+        notify("info", "🚀 Development Mode: Using mock CPI data for faster iteration...")
+        return generate_mock_inflation_data()
+    else:
+        notify("info", "Fetching real CPI data from Bureau of Labor Statistics...")
+        return fetch_real_cpi_data(notify)
+
+
+def create_inflation_tab(development_mode=False, inflation_df=None, notices=()):
+    """
+    Create the Inflation tab content
+    inflation_df/notices: CPI data and its status messages from the refresh, if prefetched
+    """
     st.subheader("Consumer Price Index (CPI) - 12-Month % Change")
     st.write("Track inflation trends across different consumer categories")
 
     # Add data availability notice
-    current_date = datetime.now()
-    latest_available_month = current_date.month - 2
-    latest_available_year = current_date.year
-
-    if latest_available_month <= 0:
-        latest_available_month += 12
-        latest_available_year -= 1
-
-    latest_month_name = datetime(latest_available_year, latest_available_month, 1).strftime("%B %Y")
+    latest_month_name = latest_available_cpi_month().strftime("%B %Y")
 
     st.info(f"📅 **Data Availability**: CPI data is released by the Bureau of Labor Statistics with approximately a 2-month delay. The most recent data available is for **{latest_month_name}**.")
 
-    # Fetch inflation data based on development mode
-    if development_mode:
-        st.info("🚀 Development Mode: Using mock CPI data for faster iteration...")
-        inflation_df = generate_mock_inflation_data()
+    # Use the CPI data fetched alongside the equities when available, otherwise fetch it now
+    if inflation_df is not None:
+        for kind, message in notices:
+            show_notice(kind, message)
     else:
-        st.info("Fetching real CPI data from Bureau of Labor Statistics...")
-        inflation_df = fetch_real_cpi_data()
+        inflation_df = load_cpi_data(development_mode)
 
-    # Get the latest data for the summary table
-    latest_date = inflation_df['Date'].max()
-    latest_data = inflation_df[inflation_df['Date'] == latest_date].copy()
-    latest_data = latest_data.sort_values('Rate', ascending=False)
+    # Tables and charts derived from the CPI data are memoized against its content version
+    cpi_version = frame_version(inflation_df)
+    cube = memoize_render("inflation", "cpi_cube", cpi_version, lambda: CPICube.from_long(inflation_df))
+    latest_data, display_data = memoize_render("inflation", "latest_rates", cpi_version, lambda: build_latest_rates(cube))
 
     # Create summary metrics
     col1, col2, col3, col4 = st.columns(4)
 
     with col1:
-        all_items_rate = latest_data[latest_data['Category'] == 'All Items']['Rate'].iloc[0]
-        st.metric(
-            "All Items CPI",
-            f"{all_items_rate:.1f}%",
-            delta=f"{random.uniform(-0.3, 0.3):.1f}% vs last month"
-        )
+        cpi_metric(cube, "All Items CPI", "All Items")
 
     with col2:
-        core_cpi_rate = latest_data[latest_data['Category'] == 'Core CPI (ex Food & Energy)']['Rate'].iloc[0]
-        st.metric(
-            "Core CPI",
-            f"{core_cpi_rate:.1f}%",
-            delta=f"{random.uniform(-0.2, 0.2):.1f}% vs last month"
-        )
+        cpi_metric(cube, "Core CPI", "Core CPI (ex Food & Energy)")
 
     with col3:
-        food_rate = latest_data[latest_data['Category'] == 'Food']['Rate'].iloc[0]
-        st.metric(
-            "Food",
-            f"{food_rate:.1f}%",
-            delta=f"{random.uniform(-0.5, 0.5):.1f}% vs last month"
-        )
+        cpi_metric(cube, "Food", "Food")
 
     with col4:
-        energy_rate = latest_data[latest_data['Category'] == 'Energy']['Rate'].iloc[0]
-        st.metric(
-            "Energy",
-            f"{energy_rate:.1f}%",
-            delta=f"{random.uniform(-2.0, 2.0):.1f}% vs last month"
-        )
+        cpi_metric(cube, "Energy", "Energy")
 
     # Current Inflation Rates Table
     st.subheader("Current Inflation Rates by Category")
 
-    # Prepare data for display
-    display_data = latest_data[['Category', 'Rate']].copy()
-    display_data['Rate_Display'] = display_data['Rate'].apply(lambda x: f"{x:.1f}%")
-
-    # Add color coding for the rates
-    def get_inflation_color(rate):
-        if rate < 0:
-            return "🟢"  # Deflation - green
-        elif rate < 2.0:
-            return "🟡"  # Low inflation - yellow
-        elif rate < 4.0:
-            return "🟠"  # Moderate inflation - orange
-        else:
-            return "🔴"  # High inflation - red
-
-    display_data['Status'] = display_data['Rate'].apply(get_inflation_color)
-
     # Display the table
     st.dataframe(
-        display_data[['Category', 'Rate', 'Status']],
+        display_data[['Category', 'Rate', 'MoM Change', 'YoY Change', 'Status']],
         use_container_width=True,
         height=400,
         column_config={
             "Category": st.column_config.TextColumn("Category 📊", width="large"),
             "Rate": st.column_config.NumberColumn("12-Month % Change 📈", format="%.1f%%"),
+            "MoM Change": st.column_config.NumberColumn("vs Last Month", format="%+.1f pp"),
+            "YoY Change": st.column_config.NumberColumn("vs Last Year", format="%+.1f pp"),
             "Status": st.column_config.TextColumn("Status 🚦", width="small"),
         },
         hide_index=True,
@@ -448,104 +444,35 @@ def create_inflation_tab(development_mode=False):
     # Category selector for the chart
     selected_categories = st.multiselect(
         "Select categories to display:",
-        options=inflation_df['Category'].unique(),
+        options=cube.categories,
         default=['All Items', 'Core CPI (ex Food & Energy)', 'Food', 'Energy', 'Housing']
     )
 
     if selected_categories:
-        # Filter data for selected categories
-        chart_data = inflation_df[inflation_df['Category'].isin(selected_categories)]
-
-        # Create the line chart
-        fig = go.Figure()
-
-        # Add a line for each selected category
-        for category in selected_categories:
-            category_data = chart_data[chart_data['Category'] == category]
-
-            fig.add_trace(go.Scatter(
-                x=category_data['Date_Object'],  # Use Date_Object for proper monthly intervals
-                y=category_data['Rate'],
-                mode='lines+markers',
-                name=category,
-                line=dict(width=2),
-                marker=dict(size=5),
-                hovertemplate=f'<b>{category}</b><br>' +
-                             'Month: %{x|%b %Y}<br>' +  # Format as "Jan 2024"
-                             'Rate: %{y:.1f}%<br>' +
-                             '<extra></extra>'
-            ))
-
-        # Update layout with monthly-specific formatting
-        fig.update_layout(
-            title="Consumer Price Index - Monthly 12-Month Percentage Change",
-            xaxis_title="Month",
-            yaxis_title="12-Month % Change",
-            hovermode="x unified",
-            height=500,
-            showlegend=True,
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=1.02,
-                xanchor="right",
-                x=1
-            ),
-            xaxis=dict(
-                tickangle=45,  # Rotate month labels for better readability
-                tickformat='%b %Y',  # Format ticks as "Jan 2024"
-                dtick='M1',  # Show every month (M1 = 1 month interval)
-                tickmode='linear'
-            )
-        )
-
-        # Add horizontal line at 2% (Fed target)
-        fig.add_hline(
-            y=2.0,
-            line_dash="dash",
-            line_color="red",
-            annotation_text="Fed Target (2%)",
-            annotation_position="bottom right"
+        # Figure is memoized against the CPI data version and the selected categories
+        fig = memoize_render(
+            "inflation", "trend_figure", cpi_version,
+            lambda: build_trend_figure(cube, selected_categories),
+            params=tuple(selected_categories),
         )
 
-        # Add horizontal line at 0% (deflation threshold)
-        fig.add_hline(
-            y=0.0,
-            line_dash="dot",
-            line_color="gray",
-            annotation_text="Deflation Threshold (0%)",
-            annotation_position="top right"
-        )
-
-        st.plotly_chart(fig, use_container_width=True)
+        with timed("plotly_render"):
+            st.plotly_chart(fig, use_container_width=True)
 
         # Add monthly data summary
         st.info("📊 **Data Frequency**: This chart displays monthly Consumer Price Index data, with each data point representing the 12-month percentage change for that specific month.")
 
+        # Long-run history only exists for real BLS data
+        if not development_mode:
+            show_long_run_history(selected_categories)
+
     # Category Comparison Chart
     st.subheader("Current Inflation Rate Comparison")
 
-    # Create a horizontal bar chart for current rates
-    fig_bar = px.bar(
-        latest_data.head(10),  # Top 10 categories
-        x='Rate',
-        y='Category',
-        orientation='h',
-        title="Top 10 Categories by Current Inflation Rate",
-        color='Rate',
-        color_continuous_scale=['green', 'yellow', 'orange', 'red'],
-        text='Rate'
-    )
-
-    fig_bar.update_traces(texttemplate='%{text:.1f}%', textposition='outside')
-    fig_bar.update_layout(
-        height=400,
-        xaxis_title="12-Month % Change",
-        yaxis_title="Category",
-        coloraxis_colorbar=dict(title="Inflation Rate (%)")
-    )
+    fig_bar = memoize_render("inflation", "comparison_figure", cpi_version, lambda: build_rate_comparison_figure(latest_data))
 
-    st.plotly_chart(fig_bar, use_container_width=True)
+    with timed("plotly_render"):
+        st.plotly_chart(fig_bar, use_container_width=True)
 
     # Analysis and Insights
     st.subheader("Key Insights")
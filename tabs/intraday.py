@@ -0,0 +1,110 @@
+"""
+Intraday tab for SparkVibe Finance application
+Streams 1-minute bars into fixed-size ring buffers and shows live VWAP, volume pace
+and price vs. moving averages; only this tab reruns on each poll
+"""
+
+import streamlit as st
+from utils.constants import STOCKS
+from utils.timing import timed, fragment_run
+from utils.intraday import IntradayFeed
+from utils.data_source import get_data_source, get_replay_session, LIVE
+from utils.request_budget import rerun_accounting_scope
+from utils.charting import use_webgl, scatter_trace
+
+
+@st.cache_resource(show_spinner=False)
+def get_intraday_feed(source, recording=None):
+    """
+    Intraday feed of a data source (and replayed recording), shared by the sessions using it;
+    offline sources each get their own stand-in stream seeded from their own prices
+    """
+    return IntradayFeed(offline=source != LIVE)
+
+
+def build_intraday_figure(symbol, frame):
+    """Line chart of a symbol's buffered 1-minute closes and its session VWAP"""
+    import plotly.graph_objects as go
+
+    webgl = use_webgl(2 * len(frame))
+    fig = go.Figure()
+    fig.add_trace(scatter_trace(webgl, x=frame.index, y=frame["Close"], mode="lines", name="Price",
+                                line=dict(color="#1f77b4", width=1.5)))
+    fig.add_trace(scatter_trace(webgl, x=frame.index, y=frame["VWAP"], mode="lines", name="VWAP",
+                                line=dict(color="orange", width=1.5, dash="dash")))
+    fig.update_layout(
+        title=f"{symbol} - 1-Minute Price and VWAP",
+        xaxis_title="Time",
+        yaxis_title="Price",
+        hovermode="x unified",
+        height=400,
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+    )
+    return fig
+
+
+def show_intraday_panel(feed, all_stock_data, symbols):
+    """Poll for new bars and render the intraday table and chart"""
+    # Fragment reruns never start a full rerun: each run gets its own spans and request budget
+    with fragment_run("intraday"), rerun_accounting_scope():
+        render_intraday_panel(feed, all_stock_data, symbols)
+
+
+def render_intraday_panel(feed, all_stock_data, symbols):
+    """Body of one intraday fragment run"""
+    feed.poll(symbols, all_stock_data)
+    metrics = feed.book.metrics(all_stock_data, symbols)
+
+    if metrics.empty:
+        st.info("Waiting for the first 1-minute bars...")
+        return
+
+    st.caption(
+        f"{feed.book.bars_applied:,} bars applied; ring buffers hold {feed.book.capacity} bars per symbol "
+        f"({feed.book.nbytes / 1e6:.2f} MB). Updates every {feed.poll_seconds} s."
+    )
+    st.dataframe(
+        metrics,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "Price": st.column_config.NumberColumn(format="$%.2f"),
+            "VWAP": st.column_config.NumberColumn(format="$%.2f"),
+            "vs VWAP %": st.column_config.NumberColumn(format="%+.2f%%"),
+            "Session Volume (M)": st.column_config.NumberColumn(format="%.2f"),
+            "Volume Pace": st.column_config.NumberColumn(
+                format="%.2fx", help="Session volume vs. the daily average, pro rata for the minutes traded"
+            ),
+            "vs 50-Day MA %": st.column_config.NumberColumn(format="%+.2f%%"),
+            "vs 200-Day MA %": st.column_config.NumberColumn(format="%+.2f%%"),
+        },
+    )
+
+    symbol = st.selectbox("Chart symbol", metrics["Symbol"].tolist(), key="intraday_chart_symbol")
+    series = feed.book.series(symbol)
+    fig = build_intraday_figure(symbol, series.frame())
+    with timed("plotly_render", symbol):
+        st.plotly_chart(fig, use_container_width=True)
+
+
+def create_intraday_tab(all_stock_data):
+    """Create the Intraday tab content"""
+    st.subheader("⏱️ Intraday (1-Minute Bars)")
+
+    source = get_data_source()
+    if source != LIVE:
+        st.write("Streaming simulated 1-minute bars (offline stand-in for the live feed).")
+    else:
+        st.write("Pulling new 1-minute bars from Yahoo Finance incrementally.")
+
+    # Off by default: live streaming adds a request per symbol every poll
+    if not st.toggle("Stream intraday bars", value=False, key="intraday_streaming"):
+        st.info("Turn on streaming to follow VWAP, volume pace and price vs. moving averages minute by minute.")
+        return
+
+    symbols = [symbol for symbol in STOCKS if all_stock_data.get(symbol) is not None]
+    replay = get_replay_session()
+    feed = get_intraday_feed(source, replay.recording.name if replay is not None else None)
+
+    # Only this fragment reruns on each poll, not the whole dashboard
+    st.fragment(show_intraday_panel, run_every=feed.poll_seconds)(feed, all_stock_data, symbols)
@@ -0,0 +1,153 @@
+"""
+Screener for SparkVibe Finance application
+Sidebar query builder with saved screens, plus the universe snapshot and screen index the
+Summary Table and the cross tabs query instead of filtering the stock data themselves
+"""
+
+import pandas as pd
+import streamlit as st
+from utils.constants import STOCKS, SCREEN_PREVIEW_SYMBOLS
+from utils.timing import timed
+from utils.snapshot import build_snapshot, snapshot_version, CROSS_STATES
+from utils.render_cache import memoize_render
+from utils.data_source import load_bar_matrices
+from utils.indicators import compute_indicators
+from utils.screener import (
+    SCREEN_FIELDS, CROSS_FIELD, ScreenIndex, validate_conditions, describe_condition,
+    load_saved_screens, save_screen, delete_screen,
+)
+
+# Index symbols lead the universe order
+LOCKED_SYMBOLS = ["^VIX", "SPY", "QQQ"]
+
+NEW_SCREEN = "(new screen)"
+
+
+def universe_symbols():
+    """Watchlist order with the locked symbols first"""
+    return LOCKED_SYMBOLS + [symbol for symbol in STOCKS.keys() if symbol not in LOCKED_SYMBOLS]
+
+
+def build_indicator_frame(symbols):
+    """Technical indicators of the symbols from 2 years of cached daily bars (one vectorized pass each)"""
+    loaded, bars = load_bar_matrices(symbols, "2y", fields=("High", "Low", "Close"))
+    return compute_indicators(loaded, bars["High"], bars["Low"], bars["Close"])
+
+
+def universe_indicators(all_stock_data):
+    """
+    Indicator frame of the universe, memoized per snapshot version once it covers every symbol.
+    Live histories deferred by the request budget leave symbols out; such a partial frame is
+    not kept, so those symbols are loaded again on the next rerun.
+    """
+    symbols = universe_symbols()
+    with timed("indicators"):
+        return memoize_render(
+            "summary", "indicators", snapshot_version(all_stock_data), lambda: build_indicator_frame(symbols),
+            keep=lambda indicators: len(indicators) == len(symbols),
+        )
+
+
+def universe_snapshot(all_stock_data):
+    """Snapshot frame of the whole universe with indicator columns, memoized per snapshot version and indicator symbols"""
+    indicators = universe_indicators(all_stock_data)
+    return memoize_render(
+        "summary", "snapshot", snapshot_version(all_stock_data),
+        lambda: build_snapshot(all_stock_data, universe_symbols(), indicators),
+        params=tuple(indicators["Symbol"]),
+    )
+
+
+def universe_index(all_stock_data):
+    """Screen index over universe_snapshot (same row order), memoized like the snapshot"""
+    indicators = universe_indicators(all_stock_data)
+    return memoize_render(
+        "screener", "index", snapshot_version(all_stock_data), lambda: ScreenIndex(universe_snapshot(all_stock_data)),
+        params=tuple(indicators["Symbol"]),
+    )
+
+
+def screen_symbols(all_stock_data, conditions):
+    """Symbols of the universe meeting every condition, in universe order"""
+    return universe_index(all_stock_data).select(conditions)
+
+
+def _range_rows(conditions):
+    """Editor rows (Field, Min, Max) for the range conditions of a screen"""
+    rows = []
+    for field, op, value in conditions:
+        if field == CROSS_FIELD:
+            continue
+        low, high = value if op == "between" else (value, None) if op == ">=" else (None, value)
+        rows.append((field, low, high))
+    return pd.DataFrame({
+        "Field": pd.Series([row[0] for row in rows], dtype=object),
+        "Min": pd.Series([row[1] for row in rows], dtype=float),
+        "Max": pd.Series([row[2] for row in rows], dtype=float),
+    })
+
+
+def screener_controls(all_stock_data):
+    """Sidebar screener: edit, save and load screens; returns the conditions applied to the Summary Table"""
+    st.subheader("Screener")
+    saved = load_saved_screens()
+    loaded = st.selectbox("Saved screen", [NEW_SCREEN] + sorted(saved), key="screen_saved")
+    conditions = saved.get(loaded, [])
+
+    # Loading another screen starts fresh editors filled from it
+    ranges = st.data_editor(
+        _range_rows(conditions),
+        num_rows="dynamic",
+        hide_index=True,
+        use_container_width=True,
+        key=f"screen_ranges_{loaded}",
+        column_config={
+            "Field": st.column_config.SelectboxColumn("Field", options=list(SCREEN_FIELDS), required=True),
+            "Min": st.column_config.NumberColumn("Min"),
+            "Max": st.column_config.NumberColumn("Max"),
+        },
+    )
+    saved_states = next((value for field, op, value in conditions if field == CROSS_FIELD), CROSS_STATES)
+    cross_states = st.multiselect("Cross state", CROSS_STATES, default=saved_states, key=f"screen_cross_{loaded}")
+
+    # A row without bounds is no condition; a full cross-state selection is no filter
+    candidates = [
+        (row.Field, "between", (None if pd.isna(row.Min) else row.Min, None if pd.isna(row.Max) else row.Max))
+        for row in ranges.itertuples(index=False)
+        if row.Field in SCREEN_FIELDS and not (pd.isna(row.Min) and pd.isna(row.Max))
+    ]
+    if len(cross_states) < len(CROSS_STATES):
+        candidates.append((CROSS_FIELD, "in", cross_states))
+    active, rejected = validate_conditions(candidates)
+    if rejected:
+        st.warning(f"Ignored ranges with Min above Max: {', '.join(field for field, op, value in rejected)}")
+
+    with timed("screen_query"):
+        matches = screen_symbols(all_stock_data, active)
+    if active:
+        st.caption(f"{len(matches)} of {len(universe_index(all_stock_data))} stocks match: "
+                   + "; ".join(describe_condition(condition) for condition in active))
+        if matches:
+            preview = ", ".join(matches[:SCREEN_PREVIEW_SYMBOLS])
+            st.caption(preview + (f" and {len(matches) - SCREEN_PREVIEW_SYMBOLS} more"
+                                  if len(matches) > SCREEN_PREVIEW_SYMBOLS else ""))
+    else:
+        st.caption("Add a range or narrow the cross states to screen the universe.")
+
+    name = st.text_input("Screen name", value="" if loaded == NEW_SCREEN else loaded, key=f"screen_name_{loaded}")
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("💾 Save screen", disabled=not active):
+            if not name.strip() or name.strip() == NEW_SCREEN:
+                st.warning("Name the screen to save it")
+            else:
+                save_screen(name.strip(), active)
+                st.success(f"Saved screen {name.strip()}")
+    with col2:
+        if loaded != NEW_SCREEN and st.button("🗑️ Delete screen"):
+            delete_screen(loaded)
+            st.session_state.pop("screen_saved", None)
+            st.rerun()
+
+    apply = st.checkbox("Apply screen to Summary Table", value=True, key="screen_apply")
+    return active if apply else []
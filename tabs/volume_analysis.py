@@ -4,10 +4,345 @@ Volume Analysis tab for SparkVibe Finance application
 
 import streamlit as st
 import pandas as pd
-import yfinance as yf
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-from utils.constants import STOCKS
+import numpy as np
+from utils.constants import (
+    STOCKS, VOLUME_CHART_BUCKETS, VOLUME_CHART_WINDOWS, FIGURE_CACHE_ENTRIES, WEBGL_MAX_CHARTS_PER_PAGE,
+    VOLUME_CHARTS_PER_PAGE, TIMEFRAMES, TIMEFRAME_UNITS, VOLUME_ANOMALY_METHODS, VOLUME_ANOMALY_WINDOW,
+    VOLUME_ANOMALY_LOOKBACK, VOLUME_ANOMALY_MIN_Z,
+)
+from utils.timing import timed
+from utils.request_budget import allow_request, PRIORITY_NORMAL, PRIORITY_LOW
+from utils.data_fetcher import history_version
+from utils.data_source import get_data_source, load_bars, load_bar_matrices, load_earnings_dates, SYNTHETIC, REPLAY
+from utils.resample import bars_for_sessions
+from utils.snapshot import build_snapshot, snapshot_version
+from utils.render_cache import memoize_render
+from utils.charting import lttb_indices, bucket_bars, use_webgl, scatter_trace, is_webgl_figure
+from utils.volume_anomalies import get_volume_scanner, rank_anomalies
+
+# Last earnings dates fetched per symbol, served when the request budget defers a lookup
+_earnings_dates_cache = {}
+
+# META earnings dates provided by the user
+META_EARNINGS_DATES = [
+    ("July 30, 2025", "Q2 2025"),
+    ("April 30, 2025", "Q1 2025"),
+    ("January 29, 2025", "Q4 2024"),
+    ("October 29, 2024", "Q3 2024"),
+    ("July 30, 2024", "Q2 2024"),
+    ("April 24, 2024", "Q1 2024"),
+    ("February 1, 2024", "Q4 2023"),
+    ("October 25, 2023", "Q3 2023")
+]
+
+
+def _localize(index, tz):
+    """Express earnings timestamps in the price history's timezone"""
+    index = pd.DatetimeIndex(index)
+    if tz is None:
+        return index.tz_localize(None) if index.tz is not None else index
+    return index.tz_localize(tz) if index.tz is None else index.tz_convert(tz)
+
+
+@st.cache_data(max_entries=FIGURE_CACHE_ENTRIES, show_spinner=False)
+def build_volume_figure(symbol, window, timeframe, data_version, earnings_key, webgl_charts_on_page, _hist, _earnings_dates):
+    """
+    Build the volume/price figure for one symbol from its cached history (bars of the timeframe).
+    Volume bars are bucketed and lines LTTB-downsampled to about the chart resolution;
+    the figure is memoized per symbol, window, timeframe and data version (underscore args are not hashed),
+    and every caller gets its own copy to modify.
+    Line and marker traces use WebGL when the window has many bars, while the page shows
+    fewer than WEBGL_MAX_CHARTS_PER_PAGE WebGL charts (webgl_charts_on_page before this one).
+    Returns (figure, earnings notes for the expander).
+    """
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    hist = _hist
+    window_start = hist.index[-1] - pd.Timedelta(days=VOLUME_CHART_WINDOWS[window])
+    view = hist[hist.index >= window_start]
+    dates = view.index
+    volume_m = view['Volume'].to_numpy(dtype=float) / 1e6
+    avg_volume_m = view['Avg_Volume'].to_numpy(dtype=float) / 1e6
+    close = view['Close'].to_numpy(dtype=float)
+
+    # The raw point count of the two lines decides the trace type, then they are downsampled
+    webgl = use_webgl(len(avg_volume_m) + len(close), webgl_charts_on_page)
+    avg_keep = lttb_indices(avg_volume_m, 2 * VOLUME_CHART_BUCKETS)
+    close_keep = lttb_indices(close, 2 * VOLUME_CHART_BUCKETS)
+
+    # Create figure with secondary y-axis
+    fig = make_subplots(specs=[[{"secondary_y": True}]])
+
+    # Add volume bars (bucket means once the window has more bars than the chart has room for)
+    bar_dates, bar_volume = bucket_bars(dates, volume_m, VOLUME_CHART_BUCKETS)
+    bucketed = len(bar_dates) < len(dates)
+    if bucketed:
+        bar_name = f"Avg {timeframe} Volume (M)"
+    else:
+        bar_name = "Volume (M)" if timeframe == "Daily" else f"{timeframe} Volume (M)"
+    fig.add_trace(
+        go.Bar(
+            x=bar_dates,
+            y=np.round(bar_volume, 3),
+            name=bar_name,
+            marker_color='rgba(58, 71, 80, 0.6)',
+            opacity=0.7
+        ),
+        secondary_y=False,
+    )
+
+    # Add average volume line
+    fig.add_trace(
+        scatter_trace(
+            webgl,
+            x=dates[avg_keep],
+            y=np.round(avg_volume_m[avg_keep], 3),
+            name=f"{bars_for_sessions(30, timeframe)}-{TIMEFRAME_UNITS[timeframe]} Avg Volume (M)",
+            line=dict(color='rgba(246, 78, 139, 1.0)', width=2)
+        ),
+        secondary_y=False,
+    )
+
+    # Add price line on secondary axis
+    fig.add_trace(
+        scatter_trace(
+            webgl,
+            x=dates[close_keep],
+            y=np.round(close[close_keep], 2),
+            name="Price",
+            line=dict(color='rgba(31, 119, 180, 1.0)', width=1)
+        ),
+        secondary_y=True,
+    )
+
+    earnings_notes = []
+
+    # Add earnings date markers, matched to the closest trading day in the history
+    # (or, for longer bars, the bar whose period contains the date)
+    if not _earnings_dates.empty:
+        earnings_index = _localize(_earnings_dates.index, hist.index.tz)
+        earnings_index = earnings_index[(earnings_index >= hist.index[0]) & (earnings_index <= hist.index[-1])]
+        closest = hist.index.get_indexer(earnings_index, method="nearest" if timeframe == "Daily" else "bfill")
+        earnings_volume = hist['Volume'].to_numpy(dtype=float)[closest] / 1e6
+        earnings_price = hist['Close'].to_numpy(dtype=float)[closest]
+
+        for date, volume_value, price_value in zip(earnings_index, earnings_volume, earnings_price):
+            earnings_notes.append(f"• {date.strftime('%Y-%m-%d')}: ${price_value:.1f}, Vol: {volume_value:.1f}M")
+
+        in_window = earnings_index >= window_start
+        if in_window.any():
+            # Add markers on volume bars for earnings dates
+            fig.add_trace(
+                scatter_trace(
+                    webgl,
+                    x=earnings_index[in_window],
+                    y=np.round(earnings_volume[in_window], 3),
+                    mode='markers',
+                    name='Earnings Date',
+                    marker=dict(
+                        symbol='star',
+                        size=12,
+                        color='yellow',
+                        line=dict(color='black', width=1)
+                    ),
+                    hovertemplate='Earnings Date: %{x}<br>Volume: %{y:.1f}M<extra></extra>'
+                ),
+                secondary_y=False,
+            )
+
+            # Add markers on price line for earnings dates
+            fig.add_trace(
+                scatter_trace(
+                    webgl,
+                    x=earnings_index[in_window],
+                    y=np.round(earnings_price[in_window], 2),
+                    mode='markers',
+                    name='Earnings Date (Price)',
+                    marker=dict(
+                        symbol='star',
+                        size=8,
+                        color='gold',
+                        line=dict(color='black', width=1)
+                    ),
+                    hovertemplate='Earnings Date: %{x}<br>Price: $%{y:.1f}<extra></extra>',
+                    showlegend=False
+                ),
+                secondary_y=True,
+            )
+
+    # DIRECT META EARNINGS DATE HANDLING - ADD ALL META EARNINGS DATES
+    if symbol == "META":
+        # Use the most recent values in the history to place the markers
+        volume_value = hist['Volume'].iloc[-1] / 1e6
+        price_value = hist['Close'].iloc[-1]
+
+        meta_dates = _localize([pd.Timestamp(date) for date, quarter in META_EARNINGS_DATES], hist.index.tz)
+        meta_quarters = np.array([quarter for date, quarter in META_EARNINGS_DATES])
+        in_window = meta_dates >= window_start
+
+        # Add a special trace for META's earnings dates with large red star markers
+        fig.add_trace(
+            scatter_trace(
+                webgl,
+                x=meta_dates[in_window],
+                y=[round(volume_value * 1.2, 3)] * int(in_window.sum()),  # Make them stand out
+                mode='markers',
+                name='META Earnings',
+                marker=dict(
+                    symbol='star',
+                    size=15,  # Larger than regular earnings markers
+                    color='red',  # Different color to stand out
+                    line=dict(color='black', width=2)
+                ),
+                hovertemplate='META Earnings: %{x}<br>Quarter: %{text}<extra></extra>',
+                text=meta_quarters[in_window]
+            ),
+            secondary_y=False,
+        )
+
+        # Add markers on price line too
+        fig.add_trace(
+            scatter_trace(
+                webgl,
+                x=meta_dates[in_window],
+                y=[round(price_value, 2)] * int(in_window.sum()),
+                mode='markers',
+                name='META Earnings (Price)',
+                marker=dict(
+                    symbol='star',
+                    size=10,  # Smaller on the price line
+                    color='red',  # Different color to stand out
+                    line=dict(color='black', width=1)
+                ),
+                hovertemplate='META Earnings: %{x}<br>Quarter: %{text}<extra></extra>',
+                text=meta_quarters[in_window],
+                showlegend=False
+            ),
+            secondary_y=True,
+        )
+
+        # Add to earnings notes for the expander section
+        for date, quarter in META_EARNINGS_DATES:
+            earnings_notes.append(f"• {date} (META {quarter}): ${price_value:.1f}")
+
+    # Update layout
+    fig.update_layout(
+        title=f"Volume (M) Analysis for {symbol} with Earnings Dates" + ("" if timeframe == "Daily" else f" ({timeframe})"),
+        xaxis_title="Date",
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1
+        ),
+        hovermode="x unified",
+        height=500,
+    )
+
+    # Set y-axes titles
+    fig.update_yaxes(title_text="Volume (M)", secondary_y=False)
+    fig.update_yaxes(title_text="Price ($)", secondary_y=True)
+
+    return fig, earnings_notes
+
+
+def build_volume_table(all_stock_data, symbols):
+    """Build the volume table from the columnar snapshot (whole-column operations, no per-cell loop)"""
+    snapshot = build_snapshot(all_stock_data, symbols)
+    volume_df = pd.DataFrame({
+        "Symbol": snapshot["Symbol"],
+        "Company": snapshot["Company"],
+        "Current Price": snapshot["Price"],
+        "Daily Change": snapshot["Change %"],
+        "Volume": snapshot["Volume (M)"],
+        "Avg Volume": snapshot["Avg Volume (M)"],
+    })
+
+    # Calculate Volume/Avg Ratio (NaN where the average volume is missing)
+    avg_volume = volume_df["Avg Volume"].where(volume_df["Avg Volume"] > 0)
+    volume_df["Volume/Avg Ratio"] = volume_df["Volume"] / avg_volume
+    return volume_df
+
+
+def build_volume_anomalies(symbols, method, min_z):
+    """
+    Rank unusual volume across the symbols from their cached daily volume matrix; the scores
+    are kept between refreshes, so only new or revised sessions are rescored.
+    Returns (anomaly table, number of symbols scanned).
+    """
+    loaded, bars = load_bar_matrices(symbols, "2y", fields=("Volume",))
+    z = get_volume_scanner().scores(get_data_source(), loaded, bars["Volume"], method)
+    return rank_anomalies(loaded, bars["Volume"], z, method, min_z), len(loaded)
+
+
+def show_volume_anomalies(all_stock_data, symbols):
+    """Ranked unusual volume table; returns the symbols selected in it (charted first below)"""
+    st.markdown("### Unusual Volume")
+
+    # Off by default: the live source loads 2 years of history for every symbol
+    if not st.toggle("Run unusual volume scan", value=False, key="volume_anomaly_enabled"):
+        st.info("Turn on the scan to rank every stock by how far its recent volume is from its usual level.")
+        return []
+
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        method = st.radio(
+            "Baseline", options=VOLUME_ANOMALY_METHODS, horizontal=True, key="volume_anomaly_method",
+            help=f"Each session's volume is scored against the {VOLUME_ANOMALY_WINDOW} sessions before it: "
+                 "median/MAD ignores earlier spikes, mean/std is the classic z-score",
+        )
+    with col2:
+        min_z = st.number_input("Minimum z-score", min_value=0.5, max_value=10.0, value=VOLUME_ANOMALY_MIN_Z,
+                                step=0.5, key="volume_anomaly_min_z")
+
+    with timed("volume_anomalies"):
+        anomalies, scanned = memoize_render(
+            "volume_analysis", "anomalies", snapshot_version(all_stock_data),
+            lambda: build_volume_anomalies(symbols, method, float(min_z)),
+            params=(method, float(min_z)),
+            keep=lambda result: result[1] == len(symbols),  # Rescan symbols the request budget deferred
+        )
+    st.caption(f"{len(anomalies)} of {scanned} stocks reached a volume z-score of {min_z:g} in the last "
+               f"{VOLUME_ANOMALY_LOOKBACK} sessions. Select rows to chart those stocks first below.")
+    if anomalies.empty:
+        st.info("No unusual volume in the recent sessions")
+        return []
+
+    # The ranking is memoized: add the company column to a copy
+    anomalies = anomalies.copy()
+    anomalies.insert(1, "Company", anomalies["Symbol"].map(STOCKS))
+    event = st.dataframe(
+        anomalies,
+        use_container_width=True,
+        hide_index=True,
+        on_select="rerun",
+        selection_mode="multi-row",
+        key="volume_anomaly_table",
+        column_config={
+            "Peak Z": st.column_config.NumberColumn("Peak Z 🔥", format="%.1f",
+                                                    help=f"Highest z-score in the last {VOLUME_ANOMALY_LOOKBACK} sessions"),
+            "Days Ago": st.column_config.NumberColumn("Days Ago", format="%d"),
+            "Z-Score": st.column_config.NumberColumn("Latest Z", format="%.1f"),
+            "Volume (M)": st.column_config.NumberColumn("Volume (M) 📊", format="%.1f"),
+            "Typical Volume (M)": st.column_config.NumberColumn("Typical (M)", format="%.1f"),
+            "Vol/Typical": st.column_config.NumberColumn("Vol/Typical", format="%.1fx"),
+        },
+    )
+    return anomalies["Symbol"].iloc[event.selection.rows].tolist()
+
+
+def order_volume_feed(volume_df, symbols, feed_order):
+    """Order the chart feed so the most interesting symbols come first (NaN ratios sort last)"""
+    if feed_order == "Volume/Avg Ratio":
+        feed_symbols = volume_df.sort_values("Volume/Avg Ratio", ascending=False)["Symbol"].tolist()
+    elif feed_order == "Daily Change":
+        feed_symbols = volume_df.sort_values("Daily Change", key=abs, ascending=False)["Symbol"].tolist()
+    else:
+        feed_symbols = list(symbols)
+    # Symbols without snapshot data are still charted, after the ranked ones
+    return feed_symbols + [symbol for symbol in symbols if symbol not in feed_symbols]
 
 
 def create_volume_analysis_tab(all_stock_data):
@@ -40,73 +375,23 @@ def create_volume_analysis_tab(all_stock_data):
     important_stocks = locked_symbols + remaining_stocks
 
     # Display a message about the stocks being shown
-    st.info(f"Showing volume analysis for {len(important_stocks)} key stocks. Scroll down to view all charts.")
+    st.info(f"Showing volume analysis for {len(important_stocks)} key stocks. Charts are shown {VOLUME_CHARTS_PER_PAGE} per page.")
+
+    # Unusual volume across the universe, ranked; selected rows are charted first
+    pinned = show_volume_anomalies(all_stock_data, important_stocks)
+    if pinned != st.session_state.get("volume_anomaly_pinned", []):
+        st.session_state["volume_anomaly_pinned"] = pinned
+        if pinned:
+            st.session_state["volume_feed_page"] = 1
 
     # Create a table with stock information
     st.markdown("### Volume Analysis Stocks")
 
-    # Create a DataFrame for display with clickable symbols
-    volume_analysis_data = []
-    for symbol in important_stocks:
-        if symbol in all_stock_data and all_stock_data[symbol] is not None:
-            data = all_stock_data[symbol]
-            # Format daily change with color
-            daily_change = data['percentage_change']
-            change_color = "green" if daily_change >= 0 else "red"
-            change_symbol = "+" if daily_change >= 0 else ""
-            formatted_change = f'<span style="color: {change_color};">{change_symbol}{daily_change:.1f}%</span>'
-
-            # Calculate volume ratio
-            current_volume = data['volume']
-            avg_volume = data['avg_volume']
-            if avg_volume != "N/A" and avg_volume > 0:
-                volume_ratio = current_volume / avg_volume
-                volume_ratio_display = f"{volume_ratio:.1f}x"
-                # Color code the volume ratio
-                if volume_ratio > 1.5:
-                    volume_ratio_display = f'<span style="color: red; font-weight: bold;">{volume_ratio:.1f}x</span>'
-                elif volume_ratio < 0.5:
-                    volume_ratio_display = f'<span style="color: green; font-weight: bold;">{volume_ratio:.1f}x</span>'
-            else:
-                volume_ratio_display = "N/A"
-
-            volume_analysis_data.append({
-                "Symbol": f'<a href="#" onclick="parent.postMessage({{cmd: \'streamlit:setComponentValue\', componentValue: \'{symbol}\', componentKey: \'stock_click\'}}, \'*\'); return false;" style="text-decoration: none; color: #1E88E5; font-weight: bold;">{symbol}</a>',
-                "Company": STOCKS[symbol],
-                "Current Price": f"${data['current_price']:.2f}",
-                "Daily Change": formatted_change,
-                "Volume": f"{data['volume']/1e6:.1f}M",
-                "Avg Volume": f"{data['avg_volume']/1e6:.1f}M" if data['avg_volume'] != "N/A" else "N/A",
-                "Volume/Avg Ratio": volume_ratio_display
-            })
-
-    volume_analysis_df = pd.DataFrame(volume_analysis_data)
-
-    # Create a clean DataFrame for sorting (without HTML formatting)
-    sort_volume_df = pd.DataFrame({
-        "Symbol": [symbol for symbol in important_stocks if symbol in all_stock_data and all_stock_data[symbol] is not None],
-        "Company": [STOCKS[symbol] for symbol in important_stocks if symbol in all_stock_data and all_stock_data[symbol] is not None],
-        "Current Price": [all_stock_data[symbol]['current_price'] for symbol in important_stocks if symbol in all_stock_data and all_stock_data[symbol] is not None],
-        "Daily Change": [all_stock_data[symbol]['percentage_change'] for symbol in important_stocks if symbol in all_stock_data and all_stock_data[symbol] is not None],
-        "Volume": [all_stock_data[symbol]['volume']/1e6 for symbol in important_stocks if symbol in all_stock_data and all_stock_data[symbol] is not None],
-        "Avg Volume": [all_stock_data[symbol]['avg_volume']/1e6 if all_stock_data[symbol]['avg_volume'] != "N/A" else float('nan') for symbol in important_stocks if symbol in all_stock_data and all_stock_data[symbol] is not None]
-    })
-
-    # Calculate Volume/Avg Ratio
-    volume_ratios = []
-    for symbol in important_stocks:
-        if symbol in all_stock_data and all_stock_data[symbol] is not None:
-            data = all_stock_data[symbol]
-            current_volume = data['volume']
-            avg_volume = data['avg_volume']
-            if avg_volume != "N/A" and avg_volume > 0:
-                volume_ratio = current_volume / avg_volume
-            else:
-                volume_ratio = float('nan')
-            volume_ratios.append(volume_ratio)
-
-    # Add Volume/Avg Ratio to the DataFrame
-    sort_volume_df["Volume/Avg Ratio"] = volume_ratios
+    # Table and feed orders are memoized against the snapshot version, so widget-only reruns reuse them
+    version = snapshot_version(all_stock_data)
+    sort_volume_df = memoize_render(
+        "volume_analysis", "table", version, lambda: build_volume_table(all_stock_data, important_stocks)
+    )
 
     # Display the dataframe with built-in sorting using NumberColumn for proper sorting
     st.dataframe(
@@ -128,46 +413,96 @@ def create_volume_analysis_tab(all_stock_data):
     # Display charts for all important stocks
     st.markdown("### Volume Charts")
 
-    # Show charts for each important stock
-    for symbol in important_stocks:
+    # Long windows are bucketed to the chart resolution; shorter windows show full daily detail
+    chart_window = st.radio(
+        "Chart window",
+        options=list(VOLUME_CHART_WINDOWS.keys()),
+        horizontal=True,
+        key="volume_chart_window",
+    )
+
+    # Longer bars are resampled from the same cached daily history (no extra upstream request)
+    timeframe = st.radio(
+        "Timeframe",
+        options=list(TIMEFRAMES.keys()),
+        horizontal=True,
+        key="volume_timeframe",
+    )
+
+    # Number of charts on this page drawn with WebGL (browsers limit live WebGL contexts)
+    webgl_charts = 0
+
+    # Order the chart feed so the most interesting symbols come first (NaN ratios sort last)
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        feed_order = st.selectbox(
+            "Order charts by",
+            options=["Watchlist order", "Volume/Avg Ratio", "Daily Change"],
+            key="volume_feed_order",
+        )
+    feed_symbols = memoize_render(
+        "volume_analysis", "feed_order", version,
+        lambda: order_volume_feed(sort_volume_df, important_stocks, feed_order),
+        params=(feed_order,),
+    )
+    feed_symbols = pinned + [symbol for symbol in feed_symbols if symbol not in pinned]
+
+    # Only the current page of charts is fetched and built
+    page_count = max(1, -(-len(feed_symbols) // VOLUME_CHARTS_PER_PAGE))
+    with col2:
+        page = st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1, key="volume_feed_page")
+    page_start = (page - 1) * VOLUME_CHARTS_PER_PAGE
+    page_symbols = feed_symbols[page_start:page_start + VOLUME_CHARTS_PER_PAGE]
+    st.caption(f"Charts {page_start + 1}-{page_start + len(page_symbols)} of {len(feed_symbols)} (page {page} of {page_count})")
+
+    # Show charts for each stock on the current page
+    for symbol in page_symbols:
         st.subheader(f"📊 {symbol} - {STOCKS[symbol]}")
 
-        with st.spinner(f"Fetching volume data for {symbol}..."):
-            ticker = yf.Ticker(symbol)
-            hist = ticker.history(period="2y")  # Get 2 years of data
+        # Skip the chart for now if the upstream request budget is used up
+        if not allow_request(PRIORITY_NORMAL):
+            st.info(f"Volume chart for {symbol} deferred: upstream request budget reached. It will load on a later refresh.")
+            continue
+
+        with st.spinner(f"Fetching volume data for {symbol}..."), timed("volume_history", symbol):
+            hist = load_bars(symbol, "2y", timeframe)  # Get 2 years of data
 
         # Get earnings dates
         earnings_dates = pd.DataFrame()  # Initialize empty DataFrame
 
         # For META, use the provided list of earnings dates
         if symbol == "META":
-            # Use the list of META earnings dates provided by the user
-            meta_earnings_dates = [
-                ("July 30, 2025", "Q2 2025"),
-                ("April 30, 2025", "Q1 2025"),
-                ("January 29, 2025", "Q4 2024"),
-                ("October 29, 2024", "Q3 2024"),
-                ("July 30, 2024", "Q2 2024"),
-                ("April 24, 2024", "Q1 2024"),
-                ("February 1, 2024", "Q4 2023"),
-                ("October 25, 2023", "Q3 2023")
-            ]
-
-            # Convert to timestamps and create DataFrame
-            meta_dates = [pd.Timestamp(date) for date, quarter in meta_earnings_dates]
-            meta_quarters = [quarter for date, quarter in meta_earnings_dates]
-
             # Create DataFrame with dates as index and quarters as a column
-            earnings_dates = pd.DataFrame({'Quarter': meta_quarters}, index=meta_dates)
-
-            st.success(f"Using {len(meta_earnings_dates)} provided META earnings dates")
+            earnings_dates = pd.DataFrame(
+                {'Quarter': [quarter for date, quarter in META_EARNINGS_DATES]},
+                index=pd.DatetimeIndex([pd.Timestamp(date) for date, quarter in META_EARNINGS_DATES]),
+            )
+
+            st.success(f"Using {len(META_EARNINGS_DATES)} provided META earnings dates")
+        # Synthetic and replayed markets carry their own earnings dates
+        elif get_data_source() in (SYNTHETIC, REPLAY):
+            earnings_dates = load_earnings_dates(symbol)
         # For other stocks, try to fetch from Yahoo Finance
+        # Earnings lookups are low priority: once the budget is tight, serve the last known dates
+        elif symbol not in ["^VIX", "SPY", "QQQ", "GLD", "SLV", "BTC-USD"] and not allow_request(PRIORITY_LOW):
+            if symbol in _earnings_dates_cache:
+                earnings_dates = _earnings_dates_cache[symbol]
+                st.info(f"Using {len(earnings_dates)} cached earnings dates (upstream request budget reached)")
+            else:
+                st.info("Earnings dates deferred: upstream request budget reached")
         elif symbol not in ["^VIX", "SPY", "QQQ", "GLD", "SLV", "BTC-USD"]:
+            # Imported lazily: only needed for the earnings lookup
+            import yfinance as yf
+            from utils.http_session import get_session
+
             try:
                 # Get earnings dates from Yahoo Finance API
-                api_earnings_dates = ticker.get_earnings_dates(limit=20)
+                with timed("volume_earnings", symbol):
+                    ticker = yf.Ticker(symbol, session=get_session())
+                    api_earnings_dates = ticker.get_earnings_dates(limit=20)
                 if api_earnings_dates is not None and not api_earnings_dates.empty:
                     earnings_dates = api_earnings_dates[~api_earnings_dates.index.duplicated(keep='first')]
+                    _earnings_dates_cache[symbol] = earnings_dates
                     st.success(f"Found {len(earnings_dates)} earnings dates from Yahoo Finance")
                 else:
                     st.warning("No earnings dates found from Yahoo Finance")
@@ -175,237 +510,43 @@ def create_volume_analysis_tab(all_stock_data):
                 st.warning(f"Could not fetch earnings dates: {str(e)}")
 
         if not hist.empty:
-            # Calculate the average volume (30-day moving average)
-            hist['Avg_Volume'] = hist['Volume'].rolling(window=30).mean()
-
-            # Create a DataFrame for the chart
-            volume_data = pd.DataFrame({
-                'Date': hist.index,
-                'Volume': hist['Volume'],
-                'Avg Volume (30-day MA)': hist['Avg_Volume']
-            })
+            # Calculate the average volume (moving average over about 30 sessions; the bars may be shared, so copy)
+            hist = hist.assign(Avg_Volume=hist['Volume'].rolling(window=bars_for_sessions(30, timeframe)).mean())
 
             # Display the chart
             st.subheader(f"Volume Analysis for {symbol} - {STOCKS[symbol]}")
 
-            # Convert volume to millions for better readability
-            volume_data['Volume (M)'] = volume_data['Volume'] / 1e6
-            volume_data['Avg Volume (M)'] = volume_data['Avg Volume (30-day MA)'] / 1e6
-
-            # Create the chart with earnings dates marked
+            # Create the chart with earnings dates marked (memoized per symbol, window and data version)
+            earnings_notes = []
             try:
-                # Create figure with secondary y-axis
-                fig = make_subplots(specs=[[{"secondary_y": True}]])
-
-                # Add volume bars
-                fig.add_trace(
-                    go.Bar(
-                        x=volume_data['Date'],
-                        y=volume_data['Volume (M)'],
-                        name="Volume (M)",
-                        marker_color='rgba(58, 71, 80, 0.6)',
-                        opacity=0.7
-                    ),
-                    secondary_y=False,
-                )
-
-                # Add average volume line
-                fig.add_trace(
-                    go.Scatter(
-                        x=volume_data['Date'],
-                        y=volume_data['Avg Volume (M)'],
-                        name="30-Day Avg Volume (M)",
-                        line=dict(color='rgba(246, 78, 139, 1.0)', width=2)
-                    ),
-                    secondary_y=False,
-                )
-
-                # Add price line on secondary axis
-                fig.add_trace(
-                    go.Scatter(
-                        x=hist.index,
-                        y=hist['Close'],
-                        name="Price",
-                        line=dict(color='rgba(31, 119, 180, 1.0)', width=1)
-                    ),
-                    secondary_y=True,
-                )
-
-                # Initialize lists for earnings data
-                valid_earnings_dates = []
-                earnings_notes = []
-
-                # Add earnings date markers if available
-                if not earnings_dates.empty:
-                    # Filter earnings dates to only include those within our historical data range
-                    for date in earnings_dates.index:
-                        try:
-                            if date in hist.index or date >= hist.index[0]:
-                                # Find the closest date in our historical data
-                                closest_date = min(hist.index, key=lambda x: abs(x - date))
-
-                                # Get the volume and price for this date
-                                if closest_date in volume_data.set_index('Date').index:
-                                    volume_value = volume_data.set_index('Date').loc[closest_date, 'Volume (M)']
-                                    price_value = hist.loc[closest_date, 'Close']
-
-                                    valid_earnings_dates.append({
-                                        'date': date,
-                                        'volume': volume_value,
-                                        'price': price_value
-                                    })
-
-                                    # Format the earnings date for display
-                                    earnings_notes.append(f"• {date.strftime('%Y-%m-%d')}: ${price_value:.1f}, Vol: {volume_value:.1f}M")
-                        except Exception as e:
-                            st.warning(f"Error processing earnings date {date}: {str(e)}")
-                            pass  # Continue with other dates
-
-                # DIRECT META EARNINGS DATE HANDLING - ADD ALL META EARNINGS DATES
-                if symbol == "META":
-                    # Use the list of META earnings dates provided by the user
-                    meta_earnings_dates = [
-                        ("July 30, 2025", "Q2 2025"),
-                        ("April 30, 2025", "Q1 2025"),
-                        ("January 29, 2025", "Q4 2024"),
-                        ("October 29, 2024", "Q3 2024"),
-                        ("July 30, 2024", "Q2 2024"),
-                        ("April 24, 2024", "Q1 2024"),
-                        ("February 1, 2024", "Q4 2023"),
-                        ("October 25, 2023", "Q3 2023")
-                    ]
-
-                    # Create a separate trace just for META's earnings dates
-                    try:
-                        # Use the most recent date in historical data for volume/price values
-                        closest_date = hist.index[-1]
-
-                        # Get the volume and price for this date
-                        volume_value = volume_data.set_index('Date').loc[closest_date, 'Volume (M)']
-                        price_value = hist.loc[closest_date, 'Close']
-
-                        # Convert dates to timestamps
-                        meta_dates = [pd.Timestamp(date) for date, quarter in meta_earnings_dates]
-                        meta_quarters = [quarter for date, quarter in meta_earnings_dates]
-
-                        # Add a special trace for META's earnings dates with large red star markers
-                        fig.add_trace(
-                            go.Scatter(
-                                x=meta_dates,
-                                y=[volume_value * 1.2] * len(meta_dates),  # Make them stand out
-                                mode='markers',
-                                name='META Earnings',
-                                marker=dict(
-                                    symbol='star',
-                                    size=15,  # Larger than regular earnings markers
-                                    color='red',  # Different color to stand out
-                                    line=dict(color='black', width=2)
-                                ),
-                                hovertemplate='META Earnings: %{x}<br>Quarter: %{text}<extra></extra>',
-                                text=meta_quarters
-                            ),
-                            secondary_y=False,
-                        )
-
-                        # Add markers on price line too
-                        fig.add_trace(
-                            go.Scatter(
-                                x=meta_dates,
-                                y=[price_value] * len(meta_dates),
-                                mode='markers',
-                                name='META Earnings (Price)',
-                                marker=dict(
-                                    symbol='star',
-                                    size=10,  # Smaller on the price line
-                                    color='red',  # Different color to stand out
-                                    line=dict(color='black', width=1)
-                                ),
-                                hovertemplate='META Earnings: %{x}<br>Quarter: %{text}<extra></extra>',
-                                text=meta_quarters,
-                                showlegend=False
-                            ),
-                            secondary_y=True,
-                        )
-
-                        # Add to earnings notes for the expander section
-                        for date, quarter in meta_earnings_dates:
-                            earnings_notes.append(f"• {date} (META {quarter}): ${price_value:.1f}")
-
-                        st.success(f"✅ Successfully added {len(meta_earnings_dates)} META earnings dates with red star markers")
-                    except Exception as e:
-                        st.error(f"Could not add META earnings date markers: {str(e)}")
-
-                # Add markers for earnings dates if we found any valid ones
-                if valid_earnings_dates:
-                    earnings_x = [item['date'] for item in valid_earnings_dates]
-                    earnings_y_volume = [item['volume'] for item in valid_earnings_dates]
-                    earnings_y_price = [item['price'] for item in valid_earnings_dates]
-
-                    # Add markers on volume bars for earnings dates
-                    fig.add_trace(
-                        go.Scatter(
-                            x=earnings_x,
-                            y=earnings_y_volume,
-                            mode='markers',
-                            name='Earnings Date',
-                            marker=dict(
-                                symbol='star',
-                                size=12,
-                                color='yellow',
-                                line=dict(color='black', width=1)
-                            ),
-                            hovertemplate='Earnings Date: %{x}<br>Volume: %{y:.1f}M<extra></extra>'
-                        ),
-                        secondary_y=False,
+                with timed("plotly_build", symbol):
+                    fig, earnings_notes = build_volume_figure(
+                        symbol,
+                        chart_window,
+                        timeframe,
+                        history_version(hist),
+                        tuple(earnings_dates.index.astype(str)),
+                        min(webgl_charts, WEBGL_MAX_CHARTS_PER_PAGE),
+                        hist,
+                        earnings_dates,
                     )
 
-                    # Add markers on price line for earnings dates
-                    fig.add_trace(
-                        go.Scatter(
-                            x=earnings_x,
-                            y=earnings_y_price,
-                            mode='markers',
-                            name='Earnings Date (Price)',
-                            marker=dict(
-                                symbol='star',
-                                size=8,
-                                color='gold',
-                                line=dict(color='black', width=1)
-                            ),
-                            hovertemplate='Earnings Date: %{x}<br>Price: $%{y:.1f}<extra></extra>',
-                            showlegend=False
-                        ),
-                        secondary_y=True,
-                    )
+                webgl_charts += is_webgl_figure(fig)
 
-                # Update layout
-                fig.update_layout(
-                    title=f"Volume (M) Analysis for {symbol} with Earnings Dates",
-                    xaxis_title="Date",
-                    legend=dict(
-                        orientation="h",
-                        yanchor="bottom",
-                        y=1.02,
-                        xanchor="right",
-                        x=1
-                    ),
-                    hovermode="x unified",
-                    height=500,
-                )
-
-                # Set y-axes titles
-                fig.update_yaxes(title_text="Volume (M)", secondary_y=False)
-                fig.update_yaxes(title_text="Price ($)", secondary_y=True)
+                if symbol == "META":
+                    st.success(f"✅ Successfully added {len(META_EARNINGS_DATES)} META earnings dates with red star markers")
 
                 # Display the interactive chart
-                st.plotly_chart(fig, use_container_width=True)
+                with timed("plotly_render", symbol):
+                    st.plotly_chart(fig, use_container_width=True)
 
             except Exception as e:
                 # Fallback to Streamlit's built-in charts
                 st.warning(f"Could not create interactive chart with earnings dates: {str(e)}")
-                st.line_chart(
-                    volume_data.set_index('Date')[['Volume (M)', 'Avg Volume (M)']]
-                )
+                st.line_chart(pd.DataFrame({
+                    'Volume (M)': hist['Volume'] / 1e6,
+                    'Avg Volume (M)': hist['Avg_Volume'] / 1e6,
+                }))
 
             # Display earnings dates in a separate section if available
             if not earnings_dates.empty and len(earnings_notes) > 0:
@@ -414,7 +555,8 @@ def create_volume_analysis_tab(all_stock_data):
                     st.markdown("\n".join(earnings_notes))
                     st.markdown("*Yellow stars on the chart mark earnings announcement dates*")
 
-            # Calculate and display volume metrics
+            # Calculate and display volume metrics (per bar of the selected timeframe)
+            avg_span = f"{bars_for_sessions(30, timeframe)}-{TIMEFRAME_UNITS[timeframe].lower()}"
             current_volume = hist['Volume'].iloc[-1]
             avg_volume = hist['Avg_Volume'].iloc[-1] if not pd.isna(hist['Avg_Volume'].iloc[-1]) else 0
             volume_ratio = current_volume / avg_volume if avg_volume > 0 else 0
@@ -429,7 +571,7 @@ def create_volume_analysis_tab(all_stock_data):
 
             with col2:
                 st.metric(
-                    "30-Day Avg Volume (M)",
+                    f"{avg_span.title()} Avg Volume (M)",
                     f"{avg_volume/1e6:.1f}M"
                 )
 
@@ -452,13 +594,13 @@ def create_volume_analysis_tab(all_stock_data):
             st.markdown("### Volume Analysis")
 
             if volume_ratio > 1.5:
-                st.info(f"**High Volume Alert**: {symbol} is trading at {volume_ratio:.1f}x its 30-day average volume. "
+                st.info(f"**High Volume Alert**: {symbol} is trading at {volume_ratio:.1f}x its {avg_span} average volume. "
                        "Unusually high volume may indicate significant market interest or news affecting the stock.")
             elif volume_ratio < 0.5:
-                st.info(f"**Low Volume Alert**: {symbol} is trading at only {volume_ratio:.1f}x its 30-day average volume. "
+                st.info(f"**Low Volume Alert**: {symbol} is trading at only {volume_ratio:.1f}x its {avg_span} average volume. "
                        "Low volume may indicate reduced market interest or a quiet trading period.")
             else:
-                st.info(f"{symbol} is trading at normal volume levels relative to its 30-day average.")
+                st.info(f"{symbol} is trading at normal volume levels relative to its {avg_span} average.")
 
             # Show volume trend over time
             st.subheader("Volume (M) Trend Analysis")
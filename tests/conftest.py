@@ -0,0 +1,9 @@
+"""
+Test setup for SparkVibe Finance
+Tests import the app packages (utils, tabs) from the repository root, like the benchmarks
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,65 @@
+"""Tests for utils.backtest: per-symbol statistics against an event-by-event loop"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.backtest import backtest_crossovers
+from utils.synthetic import SyntheticMarket
+
+HORIZONS = (5, 20, 60)
+
+
+def _reference(symbols, close, window_fast, window_slow):
+    """Crossover events of two SMAs found session by session, and what followed each"""
+    rows = []
+    for column, symbol in enumerate(symbols):
+        prices = pd.Series(close[:, column])
+        fast, slow = prices.rolling(window_fast).mean(), prices.rolling(window_slow).mean()
+        for signal, direction in (("Golden cross", 1), ("Death cross", -1)):
+            events = [
+                t for t in range(1, len(prices))
+                if direction * (fast[t] - slow[t]) > 0 and direction * (fast[t - 1] - slow[t - 1]) <= 0
+            ]
+            row = {"Symbol": symbol, "Signal": signal, "Signals": len(events)}
+            for horizon in HORIZONS:
+                returns = [prices[t + horizon] / prices[t] - 1 for t in events if t + horizon < len(prices)]
+                row[f"{horizon}D Avg %"] = np.mean(returns) * 100 if returns else np.nan
+                row[f"{horizon}D Hit %"] = np.mean([direction * r > 0 for r in returns]) * 100 if returns else np.nan
+            drawdowns = []
+            for t in events:
+                if t + 60 >= len(prices):
+                    continue
+                ahead = prices[t + 1:t + 61]
+                adverse = ahead.min() / prices[t] - 1 if direction > 0 else -(ahead.max() / prices[t] - 1)
+                drawdowns.append(min(0.0, adverse))
+            row["Avg Drawdown %"] = np.mean(drawdowns) * 100 if drawdowns else np.nan
+            row["Worst Drawdown %"] = np.min(drawdowns) * 100 if drawdowns else np.nan
+            rows.append(row)
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture(scope="module")
+def history():
+    market = SyntheticMarket.generate([f"S{i}" for i in range(12)], years=4, seed=5)
+    close = market.close.astype(float)
+    close[:400, 3] = np.nan  # Shorter history
+    return market.symbols, close
+
+
+def test_backtest_matches_event_loop(history):
+    symbols, close = history
+    result = backtest_crossovers(symbols, close, ("SMA", 20, 50), horizons=HORIZONS)
+    got = result[result["Symbol"] != "All"].set_index(["Symbol", "Signal"]).sort_index()
+    expected = _reference(symbols, close, 20, 50).set_index(["Symbol", "Signal"]).sort_index()
+    pd.testing.assert_frame_equal(got.astype(float), expected[got.columns].astype(float), rtol=1e-9)
+
+
+def test_pooled_rows_weight_every_event(history):
+    symbols, close = history
+    result = backtest_crossovers(symbols, close, ("EMA", 12, 26), horizons=HORIZONS)
+    for signal in ("Golden cross", "Death cross"):
+        rows = result[(result["Signal"] == signal) & (result["Symbol"] != "All")]
+        pooled = result[(result["Signal"] == signal) & (result["Symbol"] == "All")].iloc[0]
+        assert pooled["Signals"] == rows["Signals"].sum()
+        assert pooled["Worst Drawdown %"] == rows["Worst Drawdown %"].min()
@@ -0,0 +1,70 @@
+"""Tests for utils.bars: stock data from bar arrays against per-symbol pandas computations"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.bars import last_cross, stock_data_from_bars, FUNDAMENTAL_FIELDS
+from utils.synthetic import SyntheticMarket
+
+
+def _last_cross_reference(diff, direction, lookback=30):
+    """Sessions ago (1..lookback) of the most recent sign change of a fast-minus-slow series, NaN if none"""
+    for days_ago in range(1, min(lookback + 1, len(diff))):
+        now, before = diff.iloc[-days_ago], diff.iloc[-days_ago - 1]
+        if direction * now > 0 and direction * before <= 0:
+            return days_ago
+    return np.nan
+
+
+@pytest.fixture(scope="module")
+def market():
+    return SyntheticMarket.generate([f"S{i}" for i in range(30)], years=2, seed=3)
+
+
+def _stock_data(market, close, volume):
+    fundamentals = {field: [None] * len(market.symbols) for field in FUNDAMENTAL_FIELDS}
+    return stock_data_from_bars(market.symbols, market.open, market.high, market.low, close, volume, fundamentals)
+
+
+def test_last_cross_matches_loop():
+    rng = np.random.default_rng(0)
+    diff = rng.normal(0, 1, (31, 200))
+    diff[:, 0] = 1.0  # Never crosses
+    diff[:10, 1] = np.nan  # Averages only complete 20 sessions ago
+    for direction in (1, -1):
+        days_ago = last_cross(diff, direction)
+        for column in range(diff.shape[1]):
+            np.testing.assert_equal(days_ago[column], _last_cross_reference(pd.Series(diff[:, column]), direction))
+
+
+def test_stock_data_matches_pandas(market):
+    close, volume = market.close.astype(float), market.volume.astype(float)
+    close[:150, 5] = volume[:150, 5] = np.nan  # Shorter history
+    data = _stock_data(market, close, volume)
+
+    for column, symbol in enumerate(market.symbols):
+        prices = pd.Series(close[:, column]).dropna()
+        history_volume = pd.Series(volume[:, column]).dropna()
+        ma_50, ma_200 = prices.rolling(50).mean(), prices.rolling(200).mean()
+        row = data[symbol]
+        assert row["current_price"] == prices.iloc[-1]
+        assert row["previous_close"] == prices.iloc[-2]
+        assert np.isclose(row["percentage_change"], (prices.iloc[-1] / prices.iloc[-2] - 1) * 100)
+        assert row["volume"] == int(history_volume.iloc[-1])
+        assert np.isclose(row["avg_volume"], history_volume.tail(63).mean())
+        assert np.isclose(row["ma_50d"], ma_50.iloc[-1])
+        assert np.isclose(row["ma_200d"], ma_200.iloc[-1])
+        for kind, direction in (("golden_cross", 1), ("death_cross", -1)):
+            expected = _last_cross_reference(ma_50 - ma_200, direction)
+            assert row[kind] == (not np.isnan(expected))
+            assert row[f"{kind}_days_ago"] == (None if np.isnan(expected) else expected)
+
+
+def test_short_history_has_no_long_averages(market):
+    close = market.close[-120:].astype(float)
+    close[:100, 2] = np.nan  # 20 sessions of history
+    short = _stock_data(market, close, market.volume[-120:].astype(float))
+    assert short["S0"]["ma_50d"] is not None and short["S0"]["ma_200d"] is None
+    assert short["S2"]["ma_50d"] is None
+    assert not short["S2"]["golden_cross"] and not short["S2"]["death_cross"]
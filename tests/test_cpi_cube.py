@@ -0,0 +1,55 @@
+"""Tests for utils.cpi_cube: month-over-month and year-over-year deltas against calendar-aligned pandas"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.cpi_cube import CPICube
+
+
+@pytest.fixture
+def rates():
+    months = pd.date_range("2022-01-01", periods=30, freq="MS")
+    rng = np.random.default_rng(2)
+    frame = pd.DataFrame({"All Items": rng.normal(3, 1, 30), "Energy": rng.normal(1, 4, 30)}, index=months)
+    frame.loc["2023-09-01", "Energy"] = np.nan  # Not published for one category
+    return frame.drop(pd.Timestamp("2023-03-01"))  # A month missing altogether
+
+
+def _delta(rates, months):
+    """Change vs the rate `months` calendar months earlier (NaN when that month is missing)"""
+    earlier = rates.copy()
+    earlier.index = earlier.index + pd.DateOffset(months=months)
+    return rates - earlier.reindex(rates.index)
+
+
+def test_deltas_follow_the_calendar(rates):
+    cube = CPICube(rates)
+    pd.testing.assert_frame_equal(cube.mom, _delta(rates, 1))
+    pd.testing.assert_frame_equal(cube.yoy, _delta(rates, 12))
+    # The month after the gap has no month-over-month change
+    assert cube.mom.loc["2023-04-01"].isna().all()
+
+
+def test_latest_values(rates):
+    cube = CPICube(rates)
+    latest = cube.latest_frame()
+    assert cube.latest_month == rates.index[-1]
+    assert latest["Rate"].is_monotonic_decreasing
+    for category, row in latest.set_index("Category").iterrows():
+        assert row["Rate"] == rates[category].iloc[-1]
+        assert row["MoM Change"] == pytest.approx(rates[category].iloc[-1] - rates[category].iloc[-2])
+    assert np.isnan(cube.latest("Unknown"))
+
+
+def test_long_frame_round_trip(rates):
+    cube = CPICube(rates)
+    again = CPICube.from_long(cube.to_long())
+    pd.testing.assert_frame_equal(again.rates, cube.rates, check_freq=False, check_names=False)
+    assert again.categories == cube.categories
+
+
+def test_empty_cube():
+    cube = CPICube(pd.DataFrame(dtype=float, index=pd.DatetimeIndex([])))
+    assert cube.latest_month is None
+    assert cube.latest_frame().empty
@@ -0,0 +1,75 @@
+"""Tests for utils.crossovers: the vectorized scanner against pandas rolling and ewm averages"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.crossovers import scan_crossovers, crossover_events, parse_pairs
+from utils.synthetic import SyntheticMarket
+
+PAIRS = [("SMA", 20, 50), ("SMA", 50, 200), ("EMA", 12, 26), ("EMA", 5, 20)]
+
+
+@pytest.fixture(scope="module")
+def market():
+    return SyntheticMarket.generate([f"S{i}" for i in range(30)], years=2, seed=3)
+
+
+@pytest.fixture(scope="module")
+def padded_close(market):
+    close = market.close.astype(float)
+    close[:150, 5] = np.nan  # Shorter history
+    return close
+
+
+def _averages(close, kind, fast, slow):
+    """Pandas moving averages of one symbol's own sessions; an EMA counts once it has seen `span` prices"""
+    close = pd.Series(close).dropna().reset_index(drop=True)
+    if kind == "SMA":
+        return close.rolling(fast).mean(), close.rolling(slow).mean()
+    averages = []
+    for span in (fast, slow):
+        ema = close.ewm(span=span, adjust=False).mean()
+        ema[:span - 1] = np.nan
+        averages.append(ema)
+    return tuple(averages)
+
+
+def _last_cross(fast, slow, direction, lookback=30):
+    """Sessions ago (1..lookback) of the most recent cross of two average series, NaN if none"""
+    diff = fast - slow
+    for days_ago in range(1, min(lookback + 1, len(diff))):
+        if direction * diff.iloc[-days_ago] > 0 and direction * diff.iloc[-days_ago - 1] <= 0:
+            return days_ago
+    return np.nan
+
+
+@pytest.mark.parametrize("pair", PAIRS)
+def test_scan_matches_pandas(padded_close, pair):
+    scan = scan_crossovers(padded_close, PAIRS, lookback=30)[pair]
+    for column in range(padded_close.shape[1]):
+        fast, slow = _averages(padded_close[:, column], *pair)
+        np.testing.assert_allclose(scan["fast"][column], fast.iloc[-1])
+        np.testing.assert_allclose(scan["slow"][column], slow.iloc[-1])
+        np.testing.assert_equal(scan["golden"][column], _last_cross(fast, slow, 1))
+        np.testing.assert_equal(scan["death"][column], _last_cross(fast, slow, -1))
+
+
+def test_crossover_events_lists_every_cross(market, padded_close):
+    scan = scan_crossovers(padded_close, PAIRS, lookback=30)
+    events = crossover_events(market.symbols, padded_close, scan, 1)
+    assert len(events) == sum(int(np.isfinite(result["golden"]).sum()) for result in scan.values())
+    assert events["Days Ago"].is_monotonic_increasing
+
+
+def test_short_history_has_no_crosses():
+    close = np.full((10, 3), np.nan)
+    close[-3:] = [[1.0, 2.0, 3.0], [2.0, 1.0, 3.0], [3.0, 2.0, 1.0]]
+    scan = scan_crossovers(close, [("SMA", 2, 5)], lookback=30)[("SMA", 2, 5)]
+    assert np.isnan(scan["golden"]).all() and np.isnan(scan["slow"]).all()
+
+
+def test_parse_pairs():
+    pairs, rejected = parse_pairs("SMA 10/30, ema 5/20; 7/3, foo, 50/200")
+    assert pairs == [("SMA", 10, 30), ("EMA", 5, 20), ("SMA", 50, 200)]
+    assert rejected == ["7/3", "foo"]
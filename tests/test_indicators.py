@@ -0,0 +1,61 @@
+"""Tests for utils.indicators: every indicator column against a per-symbol pandas computation"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.indicators import compute_indicators, INDICATOR_COLUMNS
+from utils.synthetic import SyntheticMarket
+
+
+def _reference(high, low, close):
+    """RSI, MACD histogram, Bollinger %B, ATR %, and distance from the 52-week high/low of one symbol"""
+    close, high, low = (pd.Series(values).dropna().reset_index(drop=True) for values in (close, high, low))
+    change = close.diff().dropna()
+    gain = change.clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean().iloc[-1]
+    loss = (-change).clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean().iloc[-1]
+    rsi = 100 - 100 / (1 + gain / loss)
+
+    macd = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+    histogram = (macd - macd.ewm(span=9, adjust=False).mean()).iloc[-1]
+
+    window = close.tail(20)
+    percent_b = (close.iloc[-1] - (window.mean() - 2 * window.std(ddof=0))) / (4 * window.std(ddof=0))
+
+    previous = close.shift()
+    true_range = pd.concat([high - low, (high - previous).abs(), (low - previous).abs()], axis=1).max(axis=1)
+    atr = true_range.ewm(alpha=1 / 14, adjust=False).mean().iloc[-1] / close.iloc[-1] * 100
+
+    full_year = len(close) >= 252
+    vs_high = (close.iloc[-1] / high.tail(252).max() - 1) * 100 if full_year else np.nan
+    vs_low = (close.iloc[-1] / low.tail(252).min() - 1) * 100 if full_year else np.nan
+    return [rsi, histogram, percent_b, atr, vs_high, vs_low]
+
+
+@pytest.fixture(scope="module")
+def market():
+    return SyntheticMarket.generate([f"S{i}" for i in range(30)], years=2, seed=3)
+
+
+@pytest.fixture
+def padded_bars(market):
+    high, low, close = market.high.astype(float), market.low.astype(float), market.close.astype(float)
+    for values in (high, low, close):
+        values[:300, 7] = np.nan  # Less than a year of history
+    return high, low, close
+
+
+def test_indicators_match_pandas(market, padded_bars):
+    high, low, close = padded_bars
+    frame = compute_indicators(market.symbols, high, low, close)
+    assert list(frame.columns) == ["Symbol"] + INDICATOR_COLUMNS
+    assert frame["Symbol"].tolist() == market.symbols
+
+    expected = np.array([_reference(high[:, i], low[:, i], close[:, i]) for i in range(len(market.symbols))])
+    np.testing.assert_allclose(frame[INDICATOR_COLUMNS].to_numpy(dtype=float), expected, rtol=1e-7, atol=1e-9)
+    assert np.isnan(frame.loc[7, ["vs 52W High %", "vs 52W Low %"]].to_numpy(dtype=float)).all()
+
+
+def test_too_short_history_is_all_missing():
+    frame = compute_indicators(["A", "B"], np.ones((1, 2)), np.ones((1, 2)), np.ones((1, 2)))
+    assert frame[INDICATOR_COLUMNS].isna().all().all()
@@ -0,0 +1,67 @@
+"""Tests for utils.resample: incremental updates of the resample cache against a pandas groupby"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.resample import ResampleCache, resample_bars
+from utils.synthetic import SyntheticMarket
+
+PERIODS = {"Weekly": "W-FRI", "Monthly": "M", "Quarterly": "Q"}
+
+
+def _reference(daily, timeframe):
+    """OHLCV per calendar period of the sessions, from a pandas groupby"""
+    naive = daily.set_axis(daily.index.tz_localize(None))
+    groups = naive.groupby(naive.index.to_period(PERIODS[timeframe]))
+    return pd.DataFrame({
+        "Open": groups["Open"].first(),
+        "High": groups["High"].max(),
+        "Low": groups["Low"].min(),
+        "Close": groups["Close"].last(),
+        "Volume": groups["Volume"].sum(),
+    })
+
+
+def _assert_matches(bars, daily, timeframe):
+    expected = _reference(daily, timeframe)
+    assert len(bars) == len(expected)
+    np.testing.assert_allclose(bars[["Open", "High", "Low", "Close"]].to_numpy(),
+                               expected[["Open", "High", "Low", "Close"]].to_numpy())
+    np.testing.assert_array_equal(bars["Volume"].to_numpy(), expected["Volume"].to_numpy())
+    # Each bar is labelled by its last session, so the partial bar ends at the latest one
+    assert bars.index[-1] == daily.index[-1]
+
+
+@pytest.fixture(scope="module")
+def daily():
+    return SyntheticMarket.generate(["AAPL"], years=3, seed=1).history("AAPL", "3y")
+
+
+@pytest.mark.parametrize("timeframe", list(PERIODS))
+def test_incremental_updates_match_groupby(daily, timeframe):
+    cache = ResampleCache(4)
+    for end in range(400, len(daily) + 1, 9):
+        for start, key in ((0, "growing"), (end - 397, "rolling")):
+            history = daily.iloc[start:end].copy()
+            # The latest session is still trading: its close moves between polls
+            history.iloc[-1, history.columns.get_loc("Close")] *= 1.01
+            _assert_matches(cache.get(key, history, timeframe), history, timeframe)
+    stats = cache.stats()
+    assert stats["incremental"] > stats["full"]
+
+
+@pytest.mark.parametrize("timeframe", list(PERIODS))
+def test_revised_history_recomputes(daily, timeframe):
+    cache = ResampleCache(4)
+    cache.get("k", daily.iloc[:-5], timeframe)
+    adjusted = daily.copy()
+    adjusted[["Open", "High", "Low", "Close"]] *= 0.5  # A split rewrites every past price
+    _assert_matches(cache.get("k", adjusted, timeframe), adjusted, timeframe)
+    assert cache.stats()["full"] == 2
+
+
+def test_full_resample_matches_groupby(daily):
+    for timeframe in PERIODS:
+        _assert_matches(resample_bars(daily, timeframe), daily, timeframe)
+    assert resample_bars(daily, "Daily") is daily
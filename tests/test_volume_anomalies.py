@@ -0,0 +1,82 @@
+"""Tests for utils.volume_anomalies: z-scores against pandas rolling windows, incremental against full"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.constants import VOLUME_ANOMALY_LOOKBACK
+from utils.synthetic import SyntheticMarket
+from utils.volume_anomalies import MAD_SCALE, VolumeAnomalyScanner, rank_anomalies, volume_zscores
+
+METHODS = ["Mean/Std", "Median/MAD"]
+
+
+@pytest.fixture(scope="module")
+def volume():
+    rng = np.random.default_rng(0)
+    values = rng.lognormal(15, 0.4, (300, 40))
+    values[:40, 3] = np.nan  # Shorter history
+    values[-10, 7] = np.nan  # Missing session inside the window
+    values[-3, 5] *= 8  # Spike
+    return values
+
+
+def _reference(volume, rows, window, method):
+    """Z-score of each session against the `window` sessions before it, from pandas rolling windows"""
+    frame = pd.DataFrame(volume)
+    before = frame.shift(1).rolling(window)
+    if method == "Mean/Std":
+        center, spread = before.mean(), before.std()
+    else:
+        center = before.median()
+        spread = MAD_SCALE * before.apply(lambda w: np.median(np.abs(w - np.median(w))), raw=True)
+    return ((frame - center) / spread).to_numpy()[-rows:]
+
+
+@pytest.mark.parametrize("method", METHODS)
+def test_zscores_match_pandas(volume, method):
+    np.testing.assert_allclose(volume_zscores(volume, 5, 20, method), _reference(volume, 5, 20, method))
+
+
+@pytest.mark.parametrize("method", METHODS)
+def test_incremental_scores_match_full(volume, method):
+    scanner = VolumeAnomalyScanner(rows=5, window=20)
+    symbols = range(volume.shape[1])
+    for end in range(200, 260):
+        matrix = volume[end - 150:end].copy()
+        if end % 3 == 0:
+            matrix[-1] *= 1.1  # Intraday volume of the last session revised
+        np.testing.assert_allclose(scanner.scores("k", symbols, matrix, method), volume_zscores(matrix, 5, 20, method))
+        np.testing.assert_allclose(scanner.scores("k", symbols, matrix, method), volume_zscores(matrix, 5, 20, method))
+    # Several sessions added at once
+    matrix = volume[100:290]
+    np.testing.assert_allclose(scanner.scores("k", symbols, matrix, method), volume_zscores(matrix, 5, 20, method))
+
+    stats = scanner.stats()
+    assert stats["hits"] == 60 and stats["incremental"] > 0
+
+
+def test_other_symbols_rescore_everything(volume):
+    scanner = VolumeAnomalyScanner(rows=5, window=20)
+    scanner.scores("k", range(40), volume)
+    z = scanner.scores("k", range(1, 41), volume)
+    np.testing.assert_allclose(z, volume_zscores(volume, 5, 20))
+    assert scanner.stats()["full"] == 2
+
+
+def test_rank_anomalies_puts_the_spike_first(volume):
+    symbols = [f"S{i}" for i in range(volume.shape[1])]
+    table = rank_anomalies(symbols, volume, volume_zscores(volume, 5, 20), min_z=3.0)
+    assert table.loc[0, "Symbol"] == "S5"
+    assert table.loc[0, "Days Ago"] == 2
+    assert table["Peak Z"].is_monotonic_decreasing
+    assert (table["Peak Z"] >= 3.0).all()
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_default_threshold_flags_a_minority(seed):
+    # The default minimum z-score keeps the table a short list on a whole synthetic universe
+    market = SyntheticMarket.generate([f"S{i}" for i in range(500)], years=1, seed=seed)
+    volume = market.volume.astype(float)
+    table = rank_anomalies(market.symbols, volume, volume_zscores(volume, VOLUME_ANOMALY_LOOKBACK))
+    assert 0.02 < len(table) / len(market.symbols) < 0.2
@@ -0,0 +1,240 @@
+"""
+Alert rules engine for SparkVibe Finance application
+Evaluates alert rules (golden and death crosses, volume spikes, upcoming earnings) on every
+snapshot refresh, but only for the symbols whose data changed since the previous refresh,
+so the cost follows the number of changes rather than the universe size. Fired alerts are
+remembered on disk so the same alert is sent once, and are written to a JSON-lines log and,
+when configured, a webhook.
+"""
+
+import json
+import os
+import threading
+import urllib.request
+from collections import OrderedDict, deque
+from datetime import datetime
+
+import pandas as pd
+
+from .constants import ALERT_DIR, ALERT_LOG_PATH, ALERT_WEBHOOK_URL, ALERT_HISTORY, ALERT_RULE_SETS, HTTP_TIMEOUT
+from .snapshot import symbol_fingerprints, changed_symbols, _to_float, _naive_timestamp
+
+RULE_LABELS = {
+    "golden_cross": "Golden cross",
+    "death_cross": "Death cross",
+    "volume_spike": "Volume spike",
+    "earnings_soon": "Earnings soon",
+}
+
+
+def _cross_rule(kind):
+    def rule(data, param, today):
+        if not data.get(kind):
+            return None
+        days_ago = _to_float(data.get(f"{kind}_days_ago"))
+        when = "" if pd.isna(days_ago) else f" {int(days_ago)} sessions ago"
+        # One alert per cross: the state clears once the cross leaves the lookback window
+        return "active", f"{RULE_LABELS[kind]} of the 50/200-day MAs{when}"
+    return rule
+
+
+def _volume_rule(data, multiple, today):
+    volume, avg_volume = _to_float(data.get("volume")), _to_float(data.get("avg_volume"))
+    if not avg_volume > 0 or not volume >= multiple * avg_volume:
+        return None
+    # At most one volume alert per symbol and day
+    return today.isoformat(), f"Volume {volume / avg_volume:.1f}× its average ({volume / 1e6:.1f}M shares)"
+
+
+def _earnings_rule(data, days, today):
+    date = _naive_timestamp(data.get("earnings_date"))
+    if pd.isna(date):
+        return None
+    days_left = (date.normalize() - pd.Timestamp(today)).days
+    if not 0 <= days_left <= days:
+        return None
+    when = {0: "today", 1: "tomorrow"}.get(days_left, f"in {days_left} days")
+    return date.date().isoformat(), f"Earnings {when} ({date:%Y-%m-%d})"
+
+
+# Rule name -> function(stock data, parameter, today) returning (event key, message) or None
+RULES = {
+    "golden_cross": _cross_rule("golden_cross"),
+    "death_cross": _cross_rule("death_cross"),
+    "volume_spike": _volume_rule,
+    "earnings_soon": _earnings_rule,
+}
+
+# Rules whose outcome changes with the date alone, re-checked for every symbol on a new day
+DATE_RULES = {"earnings_soon"}
+
+
+class FileAlertSink:
+    """Appends alerts to a JSON-lines file"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def send(self, alerts):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "a") as f:
+            for alert in alerts:
+                f.write(json.dumps(alert) + "\n")
+
+
+class WebhookAlertSink:
+    """
+    Posts alerts as one JSON payload to a webhook URL. A plain one-shot request: the shared
+    Yahoo session would retry (and deliver a batch twice) and charge the Yahoo request budget.
+    """
+
+    def __init__(self, url):
+        self.url = url
+
+    def send(self, alerts):
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps({"alerts": alerts}).encode(),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=sum(HTTP_TIMEOUT)):
+            pass
+
+
+def _slot(rule, param, symbol):
+    """Fired-state slot of a rule, its parameter and a symbol (volume 2x and 3x rules dedup separately)"""
+    return f"{rule}|{symbol}" if param is None else f"{rule}@{param:g}|{symbol}"
+
+
+class AlertEngine:
+    """
+    Incremental evaluation of alert rules over successive stock snapshots.
+    rules: tuple of (rule name, parameter) pairs, e.g. (("golden_cross", None), ("volume_spike", 2.0))
+    Sessions may use different rules: the snapshot each rule set last saw is tracked per rule
+    set, and the fired state per rule and parameter, so they neither rescan nor re-send.
+    """
+
+    def __init__(self, source, state_path, sinks):
+        self.source = source
+        self.state_path = state_path
+        self.sinks = list(sinks)
+        self.recent = deque(maxlen=ALERT_HISTORY)
+        self.sink_errors = []
+        self._lock = threading.Lock()
+        # rules -> fingerprints and day of the last evaluation with them, and its stats (LRU)
+        self._tracking = OrderedDict()
+        # _slot(rule, param, symbol) -> key of the last event that fired, so each event fires once
+        self._fired = self._load_state()
+
+    def _load_state(self):
+        try:
+            with open(self.state_path) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return state if isinstance(state, dict) else {}
+
+    def _save_state(self):
+        os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._fired, f, sort_keys=True)
+        os.replace(tmp_path, self.state_path)
+
+    def evaluate(self, all_stock_data, rules, today=None):
+        """Evaluate the rules for the symbols that changed since the last call; returns the new alerts"""
+        today = today or datetime.now().date()
+        with self._lock:
+            fingerprints = symbol_fingerprints(all_stock_data)
+            # A rule set seen for the first time checks everything; otherwise only the changed
+            # symbols, plus the date rules for the others on a new day (earnings get closer
+            # without any data changing)
+            tracked = self._tracking.get(rules)
+            if tracked is None:
+                changed = list(fingerprints)
+            else:
+                changed = changed_symbols(tracked["fingerprints"], fingerprints)
+            work = [(symbol, rules) for symbol in changed]
+            date_rules = tuple(rule for rule in rules if rule[0] in DATE_RULES)
+            if date_rules and tracked is not None and today != tracked["day"]:
+                changed_set = set(changed)
+                work += [(symbol, date_rules) for symbol in fingerprints if symbol not in changed_set]
+
+            alerts, state_changed = [], False
+            for symbol, symbol_rules in work:
+                data = all_stock_data.get(symbol)
+                # A failed fetch says nothing about the rules: keep their state as it was
+                if data is None:
+                    continue
+                for rule, param in symbol_rules:
+                    slot = _slot(rule, param, symbol)
+                    event = RULES[rule](data, param, today)
+                    if event is None:
+                        state_changed |= self._fired.pop(slot, None) is not None
+                        continue
+                    key, message = event
+                    if self._fired.get(slot) == key:
+                        continue
+                    self._fired[slot] = key
+                    state_changed = True
+                    alerts.append({
+                        "time": datetime.now().isoformat(timespec="seconds"),
+                        "source": self.source,
+                        "symbol": symbol,
+                        "rule": rule,
+                        "message": message,
+                    })
+
+            self._tracking[rules] = {
+                "fingerprints": fingerprints,
+                "day": today,
+                "stats": {
+                    "changed": len(changed), "symbols": len(fingerprints),
+                    "checks": sum(len(symbol_rules) for symbol, symbol_rules in work), "fired": len(alerts),
+                },
+            }
+            self._tracking.move_to_end(rules)
+            while len(self._tracking) > ALERT_RULE_SETS:
+                self._tracking.popitem(last=False)
+            if state_changed:
+                self._save_state()
+            if alerts:
+                self.recent.extendleft(alerts)
+
+        # Delivery (possibly a slow webhook) runs outside the lock; the fired state is already saved
+        if alerts:
+            errors = self._deliver(alerts)
+            with self._lock:
+                self.sink_errors = errors
+        return alerts
+
+    def _deliver(self, alerts):
+        errors = []
+        for sink in self.sinks:
+            try:
+                sink.send(alerts)
+            except Exception as e:
+                errors.append(f"{type(sink).__name__}: {e}")
+        return errors
+
+    def stats(self, rules):
+        """Changed symbols, universe size, rule checks and alerts fired on the last evaluation of a rule set"""
+        with self._lock:
+            tracked = self._tracking.get(rules)
+            return dict(tracked["stats"]) if tracked else {"changed": 0, "symbols": 0, "checks": 0, "fired": 0}
+
+
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def get_alert_engine(source):
+    """Return the process-wide alert engine of a data source (fired-alert state is kept per source)"""
+    with _engines_lock:
+        if source not in _engines:
+            sinks = [FileAlertSink(ALERT_LOG_PATH)]
+            if ALERT_WEBHOOK_URL:
+                sinks.append(WebhookAlertSink(ALERT_WEBHOOK_URL))
+            _engines[source] = AlertEngine(source, os.path.join(ALERT_DIR, f"state_{source}.json"), sinks)
+        return _engines[source]
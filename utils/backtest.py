@@ -0,0 +1,99 @@
+"""
+Crossover backtester for SparkVibe Finance application
+Finds every past crossover of a moving-average pair in the daily history of a whole
+universe (sessions x symbols) and measures what followed: forward returns at several
+horizons, hit rates and drawdowns, per symbol and signal, with array operations only
+"""
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .constants import BACKTEST_HORIZONS
+from .crossovers import sma_tails, ema_tails
+
+SIGNALS = {"Golden cross": 1, "Death cross": -1}
+
+
+def crossover_signals(close, pair):
+    """Boolean (sessions x symbols) matrices of the golden and death crosses of a pair over the whole history"""
+    kind, fast, slow = pair
+    averages = (sma_tails if kind == "SMA" else ema_tails)(close, {fast, slow}, len(close))
+    diff = averages[fast] - averages[slow]
+    golden = np.zeros(diff.shape, dtype=bool)
+    death = np.zeros(diff.shape, dtype=bool)
+    golden[1:] = (diff[1:] > 0) & (diff[:-1] <= 0)
+    death[1:] = (diff[1:] < 0) & (diff[:-1] >= 0)
+    return golden, death
+
+
+def forward_returns(close, horizon):
+    """Return from each session's close to the close `horizon` sessions later (NaN near the end)"""
+    returns = np.full(close.shape, np.nan)
+    if len(close) > horizon:
+        returns[:-horizon] = close[horizon:] / close[:-horizon] - 1
+    return returns
+
+
+def forward_extremes(close, horizon):
+    """Lowest and highest close over the next `horizon` sessions, relative to each session's close"""
+    lowest = np.full(close.shape, np.nan)
+    highest = np.full(close.shape, np.nan)
+    if len(close) > horizon:
+        windows = sliding_window_view(close[1:], horizon, axis=0)  # (sessions - horizon) x symbols x horizon
+        lowest[:-horizon] = windows.min(axis=-1) / close[:-horizon] - 1
+        highest[:-horizon] = windows.max(axis=-1) / close[:-horizon] - 1
+    return lowest, highest
+
+
+def _sums_at(events, values):
+    """Count and sum of the measurable values at the event sessions, per symbol"""
+    valid = events & np.isfinite(values)
+    return valid.sum(axis=0), np.where(valid, values, 0.0).sum(axis=0)
+
+
+def _ratio(total, count):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.asarray(total, dtype=float) / count
+
+
+def backtest_crossovers(symbols, close, pair, horizons=BACKTEST_HORIZONS):
+    """
+    One row per symbol and signal, plus an "All" row per signal pooling every event:
+    Signals, then the average forward price return and hit rate at each horizon (a golden
+    cross hits when the price is higher, a death cross when it is lower), then the average
+    and worst drawdown of the position the signal suggests (long on golden, short on death)
+    over the longest horizon. Returns and drawdowns are in percent.
+    """
+    close = np.asarray(close, dtype=float)
+    golden, death = crossover_signals(close, pair)
+    returns = {horizon: forward_returns(close, horizon) for horizon in horizons}
+    lowest, highest = forward_extremes(close, max(horizons))
+
+    frames = []
+    for signal, events in (("Golden cross", golden), ("Death cross", death)):
+        direction = SIGNALS[signal]
+        signals = events.sum(axis=0)
+        per_symbol = {"Symbol": list(symbols), "Signal": signal, "Signals": signals}
+        pooled = {"Symbol": ["All"], "Signal": signal, "Signals": [signals.sum()]}
+
+        for horizon in horizons:
+            count, total = _sums_at(events, returns[horizon])
+            hit_count, hits = _sums_at(events, np.where(np.isfinite(returns[horizon]), direction * returns[horizon] > 0, np.nan))
+            per_symbol[f"{horizon}D Avg %"] = _ratio(total, count) * 100
+            per_symbol[f"{horizon}D Hit %"] = _ratio(hits, hit_count) * 100
+            pooled[f"{horizon}D Avg %"] = [_ratio(total.sum(), count.sum()) * 100]
+            pooled[f"{horizon}D Hit %"] = [_ratio(hits.sum(), hit_count.sum()) * 100]
+
+        # Drawdown of the position the signal suggests, over the longest horizon (0 if it never went against it)
+        drawdown = np.minimum(lowest if direction > 0 else -highest, 0.0)
+        count, total = _sums_at(events, drawdown)
+        worst = np.where(events & np.isfinite(drawdown), drawdown, np.inf).min(axis=0)
+        worst = np.where(np.isfinite(worst), worst, np.nan)
+        per_symbol["Avg Drawdown %"] = _ratio(total, count) * 100
+        per_symbol["Worst Drawdown %"] = worst * 100
+        pooled["Avg Drawdown %"] = [_ratio(total.sum(), count.sum()) * 100]
+        pooled["Worst Drawdown %"] = [np.fmin.reduce(worst) * 100 if len(worst) else np.nan]
+
+        frames += [pd.DataFrame(per_symbol), pd.DataFrame(pooled)]
+    return pd.concat(frames, ignore_index=True)
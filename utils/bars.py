@@ -0,0 +1,109 @@
+"""
+Bar-array indicators for SparkVibe Finance application
+Computes the stock data fetch_stock_data returns (price change, moving averages,
+recent golden/death crosses) for a whole universe at once from daily bar arrays
+(days x symbols) aligned at the last row, as the synthetic and replay data sources serve
+them; a symbol with a shorter history is padded with NaN at the top
+"""
+
+import numpy as np
+import pandas as pd
+
+# Fundamentals taken as given per symbol (lists aligned with the symbols)
+FUNDAMENTAL_FIELDS = ["pe_ratio", "eps", "peg_ratio", "pb_ratio", "short_percent_float", "market_cap", "earnings_date"]
+
+
+def _rolling_mean_tail(cumsum, counts, window, rows):
+    """
+    Trailing window means for the last `rows` days, from the cumulative sum and count of the
+    finite values with a leading zero row; NaN where the window is not complete
+    """
+    end = np.arange(len(cumsum) - rows, len(cumsum))
+    means = (cumsum[end] - cumsum[end - window]) / window
+    return np.where(counts[end] - counts[end - window] == window, means, np.nan)
+
+
+def last_cross(diff, direction):
+    """
+    Days ago (1-30) of the most recent crossover in the last 30 sessions, NaN if none, per column.
+    diff is fast MA - slow MA over the last 31 sessions (e.g. MA50 - MA200; any lookback + 1
+    sessions work the same); direction 1 finds golden, -1 death crosses. Shared by the
+    summary snapshot and the crossover scanner.
+    """
+    now, before = diff[:0:-1], diff[-2::-1]  # Row i-1 holds sessions -i and -i-1
+    if direction > 0:
+        crossed = (now > 0) & (before <= 0)
+    else:
+        crossed = (now < 0) & (before >= 0)
+    days_ago = np.argmax(crossed, axis=0) + 1.0
+    days_ago[~crossed.any(axis=0)] = np.nan
+    return days_ago
+
+
+def stock_data_from_bars(symbols, open_, high, low, close, volume, fundamentals):
+    """
+    Symbol -> stock data dict (the keys fetch_stock_data returns) for the last bar of the arrays.
+    fundamentals: FUNDAMENTAL_FIELDS -> per-symbol values (None or "N/A" where unknown)
+    """
+    n_days, n = close.shape
+
+    current = close[-1]
+    previous = close[-2] if n_days >= 2 else close[-1]
+    # A symbol with a single session has no previous close yet
+    previous = np.where(np.isnan(previous), current, previous)
+    daily_change = current - previous
+    percentage_change = daily_change / previous * 100
+    # About three months, like Yahoo's averageVolume, over the sessions the symbol has
+    recent_volume = volume[-63:]
+    avg_volume = np.nansum(recent_volume, axis=0) / np.maximum(np.isfinite(recent_volume).sum(axis=0), 1)
+
+    # Moving averages and crossovers in the last 30 sessions, as fetch_stock_data detects them
+    finite = np.isfinite(close)
+    cumsum = np.vstack([np.zeros((1, n)), np.cumsum(np.where(finite, close, 0.0), axis=0)])
+    counts = np.vstack([np.zeros((1, n), dtype=np.int64), np.cumsum(finite, axis=0)])
+    ma_50d = _rolling_mean_tail(cumsum, counts, 50, 1)[0] if n_days >= 50 else np.full(n, np.nan)
+    if n_days >= 231:
+        diff = _rolling_mean_tail(cumsum, counts, 50, 31) - _rolling_mean_tail(cumsum, counts, 200, 31)
+        ma_200d = _rolling_mean_tail(cumsum, counts, 200, 1)[0]
+        golden_days = last_cross(diff, 1)
+        death_days = last_cross(diff, -1)
+    else:
+        ma_200d = golden_days = death_days = np.full(n, np.nan)
+
+    timestamp = pd.Timestamp.now().to_pydatetime()
+
+    def optional(value):
+        return None if np.isnan(value) else value
+
+    def days_ago(value):
+        return None if np.isnan(value) else int(value)
+
+    return {
+        symbol: {
+            "symbol": symbol,
+            "current_price": current[i],
+            "pe_ratio": fundamentals["pe_ratio"][i],
+            "eps": fundamentals["eps"][i],
+            "peg_ratio": fundamentals["peg_ratio"][i],
+            "pb_ratio": fundamentals["pb_ratio"][i],
+            "short_percent_float": fundamentals["short_percent_float"][i],
+            "open_price": open_[-1, i],
+            "high_price": high[-1, i],
+            "low_price": low[-1, i],
+            "volume": int(volume[-1, i]),
+            "avg_volume": float(avg_volume[i]),
+            "daily_change": daily_change[i],
+            "percentage_change": percentage_change[i],
+            "market_cap": fundamentals["market_cap"][i],
+            "previous_close": previous[i],
+            "ma_50d": optional(ma_50d[i]),
+            "ma_200d": optional(ma_200d[i]),
+            "golden_cross": not np.isnan(golden_days[i]),
+            "golden_cross_days_ago": days_ago(golden_days[i]),
+            "death_cross": not np.isnan(death_days[i]),
+            "death_cross_days_ago": days_ago(death_days[i]),
+            "earnings_date": fundamentals["earnings_date"][i],
+            "timestamp": timestamp,
+        }
+        for i, symbol in enumerate(symbols)
+    }
@@ -0,0 +1,86 @@
+"""
+Chart data reduction helpers for SparkVibe Finance application
+Downsample long series to roughly the on-screen resolution before they are
+turned into Plotly traces
+"""
+
+import numpy as np
+
+from .constants import WEBGL_POINT_THRESHOLD, WEBGL_MAX_CHARTS_PER_PAGE
+
+
+def lttb_indices(values, n_out):
+    """
+    Largest-Triangle-Three-Buckets downsampling over evenly spaced points.
+    Returns the positions of the points to keep (NaNs are skipped, first and last kept).
+    """
+    values = np.asarray(values, dtype=float)
+    valid = np.flatnonzero(~np.isnan(values))
+    if len(valid) <= n_out or n_out < 3:
+        return valid
+
+    x = valid.astype(float)
+    y = values[valid]
+    # Bucket edges for the interior points; the first and last points are always kept
+    edges = np.linspace(1, len(valid) - 1, n_out - 1).astype(int)
+
+    kept = np.empty(n_out, dtype=int)
+    kept[0] = 0
+    previous = 0
+    for bucket in range(n_out - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+
+        # Average of the next bucket is the third triangle vertex
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else len(valid)
+        next_x = x[end:next_end].mean()
+        next_y = y[end:next_end].mean()
+
+        # Keep the point forming the largest triangle with the previous kept point
+        areas = np.abs(
+            (x[previous] - next_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (next_y - y[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        kept[bucket + 1] = previous
+
+    kept[-1] = len(valid) - 1
+    return valid[kept]
+
+
+def bucket_bars(dates, values, n_buckets):
+    """
+    Aggregate daily bar values into at most n_buckets contiguous buckets.
+    Each bucket is drawn at its first date with the mean of its finite values (NaN
+    for a bucket without any), so the scale stays comparable to daily averages and
+    gaps do not pull it down. Short series are returned unchanged.
+    """
+    values = np.asarray(values, dtype=float)
+    if len(values) <= n_buckets:
+        return dates, values
+
+    starts = np.linspace(0, len(values), n_buckets, endpoint=False).astype(int)
+    finite = np.isfinite(values)
+    sums = np.add.reduceat(np.where(finite, values, 0.0), starts)
+    counts = np.add.reduceat(finite.astype(np.int64), starts)
+    with np.errstate(invalid="ignore"):
+        means = sums / counts
+    return dates[starts], means
+
+
+def use_webgl(n_points, webgl_charts_on_page=0):
+    """
+    Whether a chart of n_points raw data points (counted before any downsampling) should use
+    WebGL traces, given how many WebGL charts the page already shows
+    """
+    return n_points > WEBGL_POINT_THRESHOLD and webgl_charts_on_page < WEBGL_MAX_CHARTS_PER_PAGE
+
+
+def scatter_trace(webgl, **kwargs):
+    """Build a line/marker trace, as go.Scattergl when webgl is set and go.Scatter otherwise"""
+    import plotly.graph_objects as go
+    return (go.Scattergl if webgl else go.Scatter)(**kwargs)
+
+
+def is_webgl_figure(fig):
+    """Whether a figure contains any WebGL traces"""
+    return any(trace.type == "scattergl" for trace in fig.data)
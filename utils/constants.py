@@ -2,6 +2,8 @@
 Constants and configuration for SparkVibe Finance application
 """
 
+import os
+
 # Define global decimal precision
 DECIMAL_PRECISION = 1
 
@@ -177,3 +179,200 @@ CSS_STYLES = """
     }
 </style>
 """
+
+# Diagnostics: path of a Prometheus textfile refreshed after every rerun (None disables it)
+METRICS_TEXTFILE_PATH = None
+
+# Upstream request budgets (HTTP requests) to stay under provider rate limits
+REQUEST_BUDGET_PER_RERUN = 300
+REQUEST_BUDGET_PER_MINUTE = 360
+# Low-priority calls (e.g. volume-tab earnings lookups) stop at this share of either budget
+LOW_PRIORITY_BUDGET_SHARE = 0.8
+
+# Shared HTTP session: connections kept alive, retries on transient failures, (connect, read) timeout
+HTTP_POOL_SIZE = 20
+HTTP_MAX_RETRIES = 2
+HTTP_RETRY_BACKOFF = 0.5
+HTTP_TIMEOUT = (5, 30)
+
+# On-disk HTTP response cache (set SPARKVIBE_CACHE_DIR to relocate, HTTP_CACHE_PATH = None disables it)
+CACHE_DIR = os.environ.get("SPARKVIBE_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "sparkvibe"))
+HTTP_CACHE_PATH = os.path.join(CACHE_DIR, "http_cache.sqlite")
+QUOTE_CACHE_TTL = 30            # seconds: quotes, info and short chart ranges
+HISTORY_CACHE_TTL = 15 * 60     # seconds: long chart ranges ending today
+EARNINGS_CACHE_TTL = 6 * 3600   # seconds: earnings calendars and fundamentals
+BLS_RETRY_TTL = 6 * 3600        # seconds: BLS responses still missing the latest scheduled month
+
+# CPI release schedule estimate: BLS publishes around mid-month at 8:30 a.m. Eastern
+CPI_RELEASE_DAY = 10
+CPI_RELEASE_TIME = (8, 30)
+CPI_RELEASE_TIMEZONE = "America/New_York"
+
+# Volume charts: buckets/points per trace (about the on-screen resolution) and selectable windows in days
+VOLUME_CHART_BUCKETS = 120
+VOLUME_CHART_WINDOWS = {"2Y": 730, "1Y": 365, "6M": 182, "3M": 91}
+FIGURE_CACHE_ENTRIES = 200
+
+# Chart timeframes: daily bars resampled into longer bars (pandas period frequencies, None = as fetched)
+TIMEFRAMES = {"Daily": None, "Weekly": "W-FRI", "Monthly": "M", "Quarterly": "Q"}
+TIMEFRAME_SESSIONS = {"Daily": 1, "Weekly": 5, "Monthly": 21, "Quarterly": 63}  # trading sessions per bar
+TIMEFRAME_UNITS = {"Daily": "Day", "Weekly": "Week", "Monthly": "Month", "Quarterly": "Quarter"}
+CROSS_TIMEFRAMES = ["Daily", "Weekly", "Monthly"]  # enough bars in the chart history for both moving averages
+RESAMPLE_CACHE_ENTRIES = 1000   # (symbol, timeframe) results kept for incremental updates
+
+# Crossover screen: preset moving-average pairs (kind, fast window, slow window), the sessions
+# crossovers are reported for, and the longest custom window (the screen scans 2 years of daily bars)
+CROSSOVER_PAIRS = {"SMA 20/50": ("SMA", 20, 50), "SMA 50/200": ("SMA", 50, 200), "EMA 12/26": ("EMA", 12, 26)}
+CROSSOVER_LOOKBACK = 30
+CROSSOVER_MAX_WINDOW = 400
+
+# Technical indicators in the summary table (periods in sessions)
+RSI_PERIOD = 14
+MACD_PERIODS = (12, 26, 9)      # fast EMA, slow EMA, signal EMA
+BOLLINGER_PERIOD = 20
+BOLLINGER_STDS = 2
+ATR_PERIOD = 14
+YEAR_SESSIONS = 252             # 52-week high/low
+
+# Crossover backtest: daily history scanned for past signals and forward-return horizons in sessions
+BACKTEST_PERIOD = "10y"
+BACKTEST_HORIZONS = (5, 20, 60)
+
+# Charts with more plotted points than this switch to WebGL (Scattergl) traces.
+# Browsers only allow a limited number of live WebGL contexts, so cap WebGL charts per page.
+WEBGL_POINT_THRESHOLD = 1000
+WEBGL_MAX_CHARTS_PER_PAGE = 8
+
+# Volume Analysis chart feed: charts fetched and built per page
+VOLUME_CHARTS_PER_PAGE = 6
+
+# Unusual volume scanner: each session's volume is scored against the sessions before it
+VOLUME_ANOMALY_METHODS = ["Median/MAD", "Mean/Std"]
+VOLUME_ANOMALY_WINDOW = 20      # sessions of history per score
+VOLUME_ANOMALY_LOOKBACK = 5     # recent sessions scanned for spikes
+VOLUME_ANOMALY_MIN_Z = 3.5     # peak z-score to list; flags about one symbol in eight on the synthetic market
+
+# Summary table: above this many rows, sort/filter/paginate on the server and send one page
+SUMMARY_TABLE_SERVER_SIDE_ROWS = 500
+SUMMARY_TABLE_PAGE_SIZE = 50
+
+# Render-model memo: memory cap for the tables and chart specs tabs derive from a snapshot
+RENDER_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# BLS CPI series (official BLS series IDs) by display category
+BLS_API_URL = "https://api.bls.gov/publicAPI/v2/timeseries/data/"
+BLS_CPI_SERIES = {
+    "All Items": "CUUR0000SA0",
+    "Core CPI (ex Food & Energy)": "CUUR0000SA0L1E",
+    "Food": "CUUR0000SAF1",
+    "Energy": "CUUR0000SA0E",
+    "Housing": "CUUR0000SAH1",
+    "Transportation": "CUUR0000SAT1",
+    "Medical Care": "CUUR0000SAM",
+    "Recreation": "CUUR0000SAR",
+    "Education": "CUUR0000SAE1",
+    "Apparel": "CUUR0000SAA",
+    "Shelter": "CUUR0000SEHA",
+    "Used Vehicles": "CUUR0000SETA02",
+    "New Vehicles": "CUUR0000SETA01",
+    "Gasoline": "CUUR0000SETB01",
+}
+BLS_SERIES_PER_REQUEST = 25     # API limit on series per request
+BLS_MAX_WORKERS = 4             # parallel BLS requests
+
+# Local CPI archive: one parquet file per series, refreshed after each scheduled release
+CPI_ARCHIVE_DIR = os.path.join(CACHE_DIR, "cpi")
+CPI_HISTORY_YEARS = 2           # years before the current one shown in the Inflation tab
+CPI_REFRESH_FAILURE_BACKOFF = 15 * 60  # seconds before retrying a refresh that returned nothing
+BLS_YEARS_PER_REQUEST = 10      # API limit on years per request (without a registration key)
+CPI_BACKFILL_START_YEAR = 1990  # first year pulled by the long-run history backfill
+
+# Synthetic market (development mode and benchmarks): seeded, simulated history length in years
+SYNTHETIC_SEED = 42
+SYNTHETIC_YEARS = 2
+SYNTHETIC_TRADING_DAYS = 252
+SYNTHETIC_REGIME_SWITCH_PROB = 1 / 80  # daily chance of a regime change (mean regime ~80 sessions)
+SYNTHETIC_BASE_PRICES = {
+    "^VIX": 20.5,
+    "SPY": 445.2,
+    "QQQ": 375.8,
+    "AAPL": 185.3,
+    "MSFT": 378.9,
+    "AMZN": 145.7,
+    "GOOGL": 138.4,
+    "META": 325.6,
+    "TSLA": 248.5,
+    "NVDA": 875.2,
+    "AMD": 142.8,
+    "NFLX": 485.3,
+    "CRM": 245.7,
+    "ADBE": 578.9,
+    "ORCL": 115.4,
+    "INTC": 43.2,
+    "IBM": 165.8,
+    "CSCO": 51.7,
+    "V": 245.9,
+    "MA": 425.3,
+    "JPM": 158.7,
+    "BAC": 32.4,
+    "WFC": 45.8,
+    "GS": 385.2,
+    "MS": 87.6,
+    "C": 58.9,
+    "BRK-B": 385.4,
+    "JNJ": 162.3,
+    "PFE": 28.7,
+    "UNH": 525.8,
+    "ABBV": 158.9,
+    "MRK": 115.6,
+    "LLY": 785.4,
+    "TMO": 545.7,
+    "ABT": 108.9,
+    "DHR": 245.3,
+    "BMY": 52.1,
+    "AMGN": 285.7,
+    "GILD": 78.4,
+    "REGN": 875.2,
+    "VRTX": 425.8,
+    "BIIB": 245.7,
+    "XOM": 115.8,
+    "CVX": 158.4,
+    "COP": 125.7,
+    "SLB": 48.9,
+    "EOG": 125.4,
+    "PXD": 245.8,
+    "KMI": 18.7,
+    "OKE": 95.4,
+    "WMB": 38.9,
+    "EPD": 15.2,
+    "GLD": 185.4,
+    "SLV": 22.8,
+    "BTC-USD": 42500.0,
+}
+
+# Market replay: recorded daily bars streamed back at an adjustable speed (None = one bar per rerun)
+REPLAY_DIR = os.path.join(CACHE_DIR, "replay")
+REPLAY_SPEEDS = {"1×": 1, "60×": 60, "3600×": 3600, "As fast as possible": None}
+REPLAY_WARMUP_BARS = 231        # bars shown before the first replayed one: 200-day MA plus the 30-session cross window
+REPLAY_REFRESH_INTERVAL = 2     # seconds between reruns while a replay is running
+
+# Intraday mode: 1-minute bars kept per symbol (ring buffer) and how often new bars are pulled
+INTRADAY_BUFFER_BARS = 390              # one regular session
+INTRADAY_SESSION_MINUTES = 390
+INTRADAY_POLL_SECONDS = 60              # live: incremental 1-minute bar pulls
+INTRADAY_STANDIN_POLL_SECONDS = 2       # offline stand-in stream
+INTRADAY_STANDIN_SECONDS_PER_BAR = 1.0  # offline stand-in: one simulated minute per wall second
+
+# Screener: saved screens (name -> declarative conditions) and how many matches the sidebar lists
+SCREENS_PATH = os.path.join(CACHE_DIR, "screens.json")
+SCREEN_PREVIEW_SYMBOLS = 20
+
+# Alerts: fired-alert state and the JSON-lines alert log (set SPARKVIBE_ALERT_WEBHOOK to also POST them)
+ALERT_DIR = os.path.join(CACHE_DIR, "alerts")
+ALERT_LOG_PATH = os.path.join(ALERT_DIR, "alerts.jsonl")
+ALERT_WEBHOOK_URL = os.environ.get("SPARKVIBE_ALERT_WEBHOOK")
+ALERT_VOLUME_MULTIPLE = 2.0     # default volume rule: volume at least this many times the average volume
+ALERT_EARNINGS_DAYS = 7         # default earnings rule: report within this many days
+ALERT_HISTORY = 200             # alerts kept in memory for the sidebar panel
+ALERT_PANEL_ITEMS = 10
+ALERT_RULE_SETS = 16            # rule sets (one per distinct sidebar setting) tracked for incremental checks
@@ -0,0 +1,318 @@
+"""
+Local CPI archive for SparkVibe Finance application
+One parquet file per BLS series plus a manifest; the archive is only refreshed from
+the BLS API after the next scheduled CPI release, every other read comes from disk.
+Long-run history is backfilled separately in year chunks that are recorded in the
+manifest as they land, so an interrupted backfill resumes where it stopped
+"""
+
+import contextvars
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+from .constants import (
+    BLS_API_URL, BLS_CPI_SERIES, BLS_SERIES_PER_REQUEST, BLS_MAX_WORKERS, BLS_YEARS_PER_REQUEST,
+    CPI_ARCHIVE_DIR, BLS_RETRY_TTL, CPI_REFRESH_FAILURE_BACKOFF,
+)
+from .release_calendar import next_cpi_release, latest_published_cpi_month
+from .timing import timed
+
+# Columns stored per series: month, index level and BLS-calculated percent changes
+SERIES_COLUMNS = ["date", "value", "pct_change_1", "pct_change_12"]
+
+_MANIFEST = "manifest.json"
+
+# Serializes refreshes so concurrent sessions do not fetch the same release twice
+_refresh_lock = threading.Lock()
+
+# Only one backfill runs at a time; the others would fetch the same chunks
+_backfill_lock = threading.Lock()
+
+
+def _utcnow():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _series_path(series_id):
+    return os.path.join(CPI_ARCHIVE_DIR, f"{series_id}.parquet")
+
+
+def _atomic_write(path, write):
+    """Write through a temporary file so readers never see a partial file"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def read_manifest():
+    """Return the archive manifest, or {} when there is no archive yet"""
+    try:
+        with open(os.path.join(CPI_ARCHIVE_DIR, _MANIFEST)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_manifest(manifest):
+    def write(path):
+        with open(path, "w") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+    _atomic_write(os.path.join(CPI_ARCHIVE_DIR, _MANIFEST), write)
+
+
+def _empty_series():
+    return pd.DataFrame({
+        "date": pd.Series(dtype="datetime64[ns]"),
+        **{column: pd.Series(dtype=float) for column in SERIES_COLUMNS[1:]},
+    })
+
+
+def read_series(series_id):
+    """Archived rows of one series (empty frame if not archived)"""
+    try:
+        return pd.read_parquet(_series_path(series_id))
+    except (OSError, ValueError):
+        return _empty_series()
+
+
+def write_series(series_id, rows):
+    """Merge new rows into a series file; newer values replace archived ones for the same month"""
+    merged = pd.concat([read_series(series_id), rows], ignore_index=True)
+    merged = merged.drop_duplicates("date", keep="last").sort_values("date").reset_index(drop=True)
+    _atomic_write(_series_path(series_id), lambda path: merged[SERIES_COLUMNS].to_parquet(path, index=False))
+
+
+def _numeric(points, column):
+    """Numeric column of the normalized points (all NaN when BLS left it out)"""
+    if column not in points:
+        return pd.Series(float("nan"), index=points.index)
+    return pd.to_numeric(points[column], errors="coerce")
+
+
+def parse_series(data):
+    """Normalize one series' BLS data points to monthly rows (annual averages and M13 dropped)"""
+    if not data:
+        return _empty_series()
+
+    points = pd.json_normalize(data)
+    monthly = points[points["period"].str.fullmatch(r"M(0[1-9]|1[0-2])")]
+    return pd.DataFrame({
+        "date": pd.to_datetime(monthly["year"] + "-" + monthly["period"].str[1:] + "-01"),
+        "value": _numeric(monthly, "value"),
+        "pct_change_1": _numeric(monthly, "calculations.pct_changes.1"),
+        "pct_change_12": _numeric(monthly, "calculations.pct_changes.12"),
+    }).sort_values("date").reset_index(drop=True)
+
+
+def _fetch_batch(session, series_ids, start_year, end_year):
+    """POST one batch of series to the BLS API; returns {series_id: rows} (empty on failure)"""
+    payload = {
+        "seriesid": series_ids,
+        "startyear": str(start_year),
+        "endyear": str(end_year),
+        "calculations": True,  # This gives us 1- and 12-month percent changes
+        "annualaverage": False,
+    }
+    try:
+        with timed("bls_post"):
+            response = session.post(
+                BLS_API_URL,
+                data=json.dumps(payload),
+                headers={"Content-type": "application/json"},
+                timeout=30,
+            )
+        if response.status_code != 200:
+            return {}
+        json_data = response.json()
+        if json_data.get("status") != "REQUEST_SUCCEEDED" or "Results" not in json_data:
+            return {}
+        return {
+            series["seriesID"]: parse_series(series.get("data", []))
+            for series in json_data["Results"]["series"]
+        }
+    except Exception:
+        return {}
+
+
+def _series_batches(series_ids):
+    return [series_ids[i:i + BLS_SERIES_PER_REQUEST] for i in range(0, len(series_ids), BLS_SERIES_PER_REQUEST)]
+
+
+def fetch_series(series_ids, start_year, end_year):
+    """Fetch series from the BLS API in parallel batches of up to BLS_SERIES_PER_REQUEST"""
+    from .http_session import get_session
+
+    session = get_session()
+    batches = _series_batches(series_ids)
+    results = {}
+    with ThreadPoolExecutor(max_workers=min(BLS_MAX_WORKERS, len(batches)), thread_name_prefix="bls") as pool:
+        # Each batch runs in a copy of this context, so its spans and requests count in this rerun
+        futures = [
+            pool.submit(contextvars.copy_context().run, _fetch_batch, session, batch, start_year, end_year)
+            for batch in batches
+        ]
+        for future in futures:
+            results.update(future.result())
+    return results
+
+
+def archive_is_current(now=None):
+    """Whether the archive is still valid (no CPI release since it was last refreshed)"""
+    refresh_after = read_manifest().get("refresh_after")
+    return refresh_after is not None and (now or _utcnow()) < datetime.fromisoformat(refresh_after)
+
+
+def refresh_archive(start_year, end_year=None):
+    """
+    Fetch every CPI series for the year range and merge it into the archive.
+    Returns the number of series that came back with data, or None when another
+    session refreshed the archive while this one waited.
+    """
+    end_year = end_year or datetime.now().year
+    with _refresh_lock:
+        if archive_is_current():
+            return None  # Another session refreshed it while we waited
+
+        fetched = fetch_series(list(BLS_CPI_SERIES.values()), start_year, end_year)
+        fetched = {series_id: rows for series_id, rows in fetched.items() if not rows.empty}
+        for series_id, rows in fetched.items():
+            write_series(series_id, rows)
+
+        now = _utcnow()
+        manifest = read_manifest()
+        series_months = manifest.get("series", {})
+        for series_id, rows in fetched.items():
+            series_months[series_id] = rows["date"].max().strftime("%Y-%m")
+
+        # Valid until the next release once we hold the latest published month; retry sooner otherwise
+        expected = latest_published_cpi_month(now).strftime("%Y-%m")
+        if not fetched:
+            refresh_after = now + timedelta(seconds=CPI_REFRESH_FAILURE_BACKOFF)
+        elif max(series_months.values()) >= expected:
+            refresh_after = next_cpi_release(now)
+        else:
+            refresh_after = now + timedelta(seconds=BLS_RETRY_TTL)
+
+        manifest.update({
+            "series": series_months,
+            "refresh_after": refresh_after.isoformat(),
+            "updated_at": now.isoformat() if fetched else manifest.get("updated_at"),
+        })
+        _write_manifest(manifest)
+        return len(fetched)
+
+
+def year_chunks(start_year, end_year):
+    """Split a year range into (first, last) chunks of at most BLS_YEARS_PER_REQUEST years"""
+    return [
+        (first, min(first + BLS_YEARS_PER_REQUEST - 1, end_year))
+        for first in range(start_year, end_year + 1, BLS_YEARS_PER_REQUEST)
+    ]
+
+
+def _chunk_key(chunk):
+    return f"{chunk[0]}-{chunk[1]}"
+
+
+def backfilled_chunks():
+    """Year chunks the backfill has completed, as "first-last" strings"""
+    return set(read_manifest().get("backfill", {}).get("chunks", []))
+
+
+def archive_version():
+    """Version of the archive contents: changes on every refresh and every backfilled chunk"""
+    manifest = read_manifest()
+    return repr((manifest.get("updated_at"), sorted(manifest.get("backfill", {}).get("chunks", []))))
+
+
+def backfill_archive(start_year, end_year=None, progress=None):
+    """
+    Backfill every CPI series from start_year to end_year into the archive.
+    The range is split into year chunks, each chunk into series batches, and all
+    requests run in parallel; a chunk is recorded in the manifest once all its
+    batches are merged, so a rerun only fetches the chunks that are still missing.
+    progress(done, total) is called after each request.
+    Returns (chunks completed now, chunks still missing), or None if a backfill is already running.
+    """
+    from .http_session import get_session
+
+    end_year = end_year or datetime.now().year
+    if not _backfill_lock.acquire(blocking=False):
+        return None
+
+    try:
+        done_chunks = backfilled_chunks()
+        pending = [chunk for chunk in year_chunks(start_year, end_year) if _chunk_key(chunk) not in done_chunks]
+        batches = _series_batches(list(BLS_CPI_SERIES.values()))
+        jobs = [(chunk, batch) for chunk in pending for batch in batches]
+        if not jobs:
+            return 0, 0
+
+        session = get_session()
+        remaining = {chunk: len(batches) for chunk in pending}
+        failed = set()
+        completed = 0
+        with ThreadPoolExecutor(max_workers=min(BLS_MAX_WORKERS, len(jobs)), thread_name_prefix="bls_backfill") as pool:
+            futures = {
+                pool.submit(contextvars.copy_context().run, _fetch_batch, session, batch, chunk[0], chunk[1]): chunk
+                for chunk, batch in jobs
+            }
+            for finished, future in enumerate(as_completed(futures), start=1):
+                chunk = futures[future]
+                fetched = future.result()
+                if not fetched:
+                    failed.add(chunk)  # Retried on the next backfill
+                else:
+                    # Merges share files with regular refreshes, so write under the same lock
+                    with _refresh_lock:
+                        for series_id, rows in fetched.items():
+                            if not rows.empty:
+                                write_series(series_id, rows)
+
+                remaining[chunk] -= 1
+                if remaining[chunk] == 0 and chunk not in failed:
+                    with _refresh_lock:
+                        manifest = read_manifest()
+                        backfill = manifest.setdefault("backfill", {})
+                        backfill["chunks"] = sorted(set(backfill.get("chunks", [])) | {_chunk_key(chunk)})
+                        _write_manifest(manifest)
+                    completed += 1
+
+                if progress is not None:
+                    progress(finished, len(jobs))
+
+        return completed, len(failed)
+    finally:
+        _backfill_lock.release()
+
+
+def load_archive_frame(start_year):
+    """
+    Archived CPI 12-month changes from start_year on, in the Inflation tab's long format
+    (Date, Category, Rate, Month, Month_Name, Date_Object)
+    """
+    frames = []
+    for category, series_id in BLS_CPI_SERIES.items():
+        rows = read_series(series_id)
+        rows = rows[(rows["date"].dt.year >= start_year) & rows["pct_change_12"].notna()]
+        if not rows.empty:
+            frames.append(pd.DataFrame({
+                "Category": category,
+                "Rate": rows["pct_change_12"].round(1),
+                "Date_Object": rows["date"],
+            }))
+
+    if not frames:
+        return pd.DataFrame(columns=["Date", "Category", "Rate", "Month", "Month_Name", "Date_Object"])
+
+    df = pd.concat(frames, ignore_index=True).sort_values("Date_Object", kind="stable").reset_index(drop=True)
+    df["Date"] = df["Date_Object"].dt.strftime("%Y-%m")
+    df["Month"] = df["Date"]
+    df["Month_Name"] = df["Date_Object"].dt.strftime("%b %Y")
+    return df[["Date", "Category", "Rate", "Month", "Month_Name", "Date_Object"]]
@@ -0,0 +1,81 @@
+"""
+CPI cube for SparkVibe Finance application
+Wide month x category matrix of 12-month CPI rates with precomputed month-over-month
+and year-over-year deltas, so the Inflation tab reads values by label instead of
+filtering the long frame
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class CPICube:
+    """12-month % change by month (rows) and category (columns), with deltas in percentage points"""
+
+    def __init__(self, rates):
+        self.rates = rates.sort_index()
+        # Deltas on the regular month grid, so a missing month shifts nothing onto its neighbour
+        monthly = self.rates.asfreq("MS") if len(self.rates) else self.rates
+        self.mom = monthly.diff().reindex(self.rates.index)     # Change vs the previous month
+        self.yoy = monthly.diff(12).reindex(self.rates.index)   # Change vs the same month a year earlier
+
+        # Latest month with any data; categories missing that month are left out of the latest values
+        self.latest_month = self.rates.index[-1] if len(self.rates) else None
+        if self.latest_month is None:
+            self._latest = self._latest_mom = self._latest_yoy = {}
+        else:
+            self._latest = self.rates.iloc[-1].dropna().to_dict()
+            self._latest_mom = self.mom.iloc[-1].to_dict()
+            self._latest_yoy = self.yoy.iloc[-1].to_dict()
+
+    @classmethod
+    def from_long(cls, inflation_df):
+        """Pivot the long CPI frame (Date_Object, Category, Rate) into a cube"""
+        rates = inflation_df.drop_duplicates(["Date_Object", "Category"], keep="last").pivot(
+            index="Date_Object", columns="Category", values="Rate"
+        )
+        # Keep the categories in the order they first appear in the data
+        rates = rates[list(pd.unique(inflation_df["Category"]))]
+        rates.columns.name = None
+        return cls(rates.astype(float))
+
+    @property
+    def categories(self):
+        return list(self.rates.columns)
+
+    def latest(self, category):
+        """Latest 12-month rate of a category (NaN if it has none for the latest month)"""
+        return self._latest.get(category, np.nan)
+
+    def latest_change(self, category):
+        """Month-over-month change of the latest rate in percentage points (NaN if unknown)"""
+        return self._latest_mom.get(category, np.nan)
+
+    def latest_frame(self):
+        """Latest rates with their MoM/YoY changes, one row per category, highest rate first"""
+        categories = list(self._latest)
+        return pd.DataFrame({
+            "Category": categories,
+            "Rate": [self._latest[category] for category in categories],
+            "MoM Change": [self._latest_mom[category] for category in categories],
+            "YoY Change": [self._latest_yoy[category] for category in categories],
+        }).sort_values("Rate", ascending=False, kind="stable").reset_index(drop=True)
+
+    def to_long(self):
+        """The cube as the long CPI frame (Date, Category, Rate, Month, Month_Name, Date_Object), by category"""
+        months = self.rates.index
+        n_months, n_categories = self.rates.shape
+        dates = pd.DatetimeIndex(np.tile(months, n_categories))
+        month = np.tile(months.strftime("%Y-%m"), n_categories)
+        return pd.DataFrame({
+            "Date": month,
+            "Category": np.repeat(self.rates.columns.to_numpy(), n_months),
+            "Rate": self.rates.to_numpy().T.ravel(),
+            "Month": month,
+            "Month_Name": np.tile(months.strftime("%b %Y"), n_categories),
+            "Date_Object": dates,
+        })
+
+    def series(self, category):
+        """Monthly 12-month rates of one category (missing months dropped)"""
+        return self.rates[category].dropna()
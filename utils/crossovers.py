@@ -0,0 +1,164 @@
+"""
+Crossover scanner for SparkVibe Finance application
+Scans a whole universe for moving-average crossovers of several pairs at once (SMA or EMA,
+any windows) in one pass over the price matrix (sessions x symbols): every SMA window
+comes from one shared cumulative sum and every EMA span from one shared recursion, so an
+extra pair costs about one more vector operation
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+from .constants import CROSSOVER_LOOKBACK, CROSSOVER_MAX_WINDOW
+from .bars import last_cross
+
+MA_KINDS = ["SMA", "EMA"]
+
+_PAIR_PATTERN = re.compile(r"^(SMA|EMA)?\s*(\d+)\s*/\s*(\d+)$", re.IGNORECASE)
+
+
+def pair_name(pair):
+    """Display name of a (kind, fast, slow) pair, e.g. 'SMA 50/200'"""
+    kind, fast, slow = pair
+    return f"{kind} {fast}/{slow}"
+
+
+def parse_pairs(text):
+    """
+    Parse custom pairs such as "SMA 10/30, EMA 5/20" (kind defaults to SMA).
+    Returns (pairs, rejected items); a pair needs 1 <= fast < slow <= CROSSOVER_MAX_WINDOW.
+    """
+    pairs, rejected = [], []
+    for item in re.split(r"[,;]", text or ""):
+        item = item.strip()
+        if not item:
+            continue
+        match = _PAIR_PATTERN.match(item)
+        if match is None:
+            rejected.append(item)
+            continue
+        kind = (match.group(1) or "SMA").upper()
+        fast, slow = int(match.group(2)), int(match.group(3))
+        if not 1 <= fast < slow <= CROSSOVER_MAX_WINDOW:
+            rejected.append(item)
+            continue
+        pairs.append((kind, fast, slow))
+    return pairs, rejected
+
+
+def sma_tails(close, windows, rows):
+    """
+    Trailing simple moving averages for the last `rows` sessions, one array per window, all
+    from one cumulative sum. A mean is NaN unless its whole window has prices (columns may
+    start with NaN padding). Also used by the backtester.
+    """
+    n_days, n = close.shape
+    finite = np.isfinite(close)
+    cumsum = np.vstack([np.zeros((1, n)), np.cumsum(np.where(finite, close, 0.0), axis=0)])
+    counts = np.vstack([np.zeros((1, n), dtype=np.int64), np.cumsum(finite, axis=0)])
+
+    end = np.arange(n_days + 1 - rows, n_days + 1)
+    averages = {}
+    for window in windows:
+        start = end - window
+        in_range = start >= 0
+        start = np.maximum(start, 0)
+        means = (cumsum[end] - cumsum[start]) / window
+        complete = ((counts[end] - counts[start]) == window) & in_range[:, None]
+        averages[window] = np.where(complete, means, np.nan)
+    return averages
+
+
+def ema_tails(close, spans, rows):
+    """
+    Exponential moving averages (span convention, seeded with the first price) for the last
+    `rows` sessions, one array per span. Every column starts from its first price, so each
+    session is one update of all spans and symbols at once (missing prices leave the average
+    unchanged); an average is NaN until it has seen `span` prices. Also used by the backtester.
+    """
+    spans = sorted(spans)
+    if not spans:
+        return {}
+    n_days, n = close.shape
+    span_array = np.array(spans, dtype=float)[:, None]
+    alpha = 2.0 / (span_array + 1.0)
+    finite = np.isfinite(close)
+    prices = np.where(finite, close, 0.0)
+
+    state = np.repeat(close[finite.argmax(axis=0), np.arange(n)][None, :], len(spans), axis=0)
+    tails = np.empty((rows, len(spans), n))
+    first_row = n_days - rows
+    for day in range(n_days):
+        state += (alpha * finite[day]) * (prices[day] - state)
+        if day >= first_row:
+            tails[day - first_row] = state
+    seen = np.cumsum(finite, axis=0)[first_row:, None, :]
+    tails[seen < span_array] = np.nan
+    return {span: tails[:, i] for i, span in enumerate(spans)}
+
+
+def scan_crossovers(close, pairs, lookback=CROSSOVER_LOOKBACK):
+    """
+    Crossovers of each (kind, fast, slow) pair in the last `lookback` sessions for every
+    column of a close matrix (sessions x symbols, NaN-padded at the top where a symbol has
+    less history). Returns pair -> dict of per-symbol arrays: "fast" and "slow" averages at
+    the last session, and "golden"/"death" sessions ago of the most recent cross (NaN if none).
+    """
+    close = np.asarray(close, dtype=float)
+    pairs = list(dict.fromkeys(pairs))
+    n_days, n = close.shape
+    rows = min(lookback + 1, n_days)
+    if rows < 2:
+        empty = np.full(n, np.nan)
+        return {pair: {"fast": empty, "slow": empty, "golden": empty, "death": empty} for pair in pairs}
+
+    windows = {kind: {window for pair_kind, fast, slow in pairs if pair_kind == kind for window in (fast, slow)}
+               for kind in MA_KINDS}
+    averages = {
+        "SMA": sma_tails(close, windows["SMA"], rows),
+        "EMA": ema_tails(close, windows["EMA"], rows),
+    }
+
+    results = {}
+    for pair in pairs:
+        kind, fast, slow = pair
+        fast_ma, slow_ma = averages[kind][fast], averages[kind][slow]
+        diff = fast_ma - slow_ma
+        results[pair] = {
+            "fast": fast_ma[-1],
+            "slow": slow_ma[-1],
+            "golden": last_cross(diff, 1),
+            "death": last_cross(diff, -1),
+        }
+    return results
+
+
+def crossover_events(symbols, close, scan, direction):
+    """
+    One row per symbol and pair with a crossover in the scan (direction 1: golden, -1: death),
+    most recent first: Symbol, Pair, Days Ago, Price, Fast MA, Slow MA and Spread %
+    """
+    key = "golden" if direction > 0 else "death"
+    symbols = np.asarray(symbols, dtype=object)
+    price = np.asarray(close, dtype=float)[-1]
+
+    frames = []
+    for pair, result in scan.items():
+        hit = ~np.isnan(result[key])
+        if not hit.any():
+            continue
+        fast, slow = result["fast"][hit], result["slow"][hit]
+        frames.append(pd.DataFrame({
+            "Symbol": symbols[hit],
+            "Pair": pair_name(pair),
+            "Days Ago": result[key][hit].astype(int),
+            "Price": price[hit],
+            "Fast MA": fast,
+            "Slow MA": slow,
+            "Spread %": (fast / slow - 1) * 100,
+        }))
+    if not frames:
+        return pd.DataFrame(columns=["Symbol", "Pair", "Days Ago", "Price", "Fast MA", "Slow MA", "Spread %"])
+    return pd.concat(frames, ignore_index=True).sort_values(["Days Ago", "Symbol"], kind="stable", ignore_index=True)
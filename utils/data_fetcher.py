@@ -3,11 +3,13 @@ Data fetching utilities for SparkVibe Finance application
 """
 
 import streamlit as st
-import yfinance as yf
 import pandas as pd
+import time
 from datetime import datetime
-from .constants import STOCKS
+from .constants import STOCKS, HISTORY_CACHE_TTL
 from .formatters import format_currency, format_volume
+from .timing import timed, record_span
+from .crossovers import scan_crossovers
 
 
 def fetch_stock_data(symbol):
@@ -15,23 +17,29 @@ def fetch_stock_data(symbol):
     Fetch real-time stock data for a given symbol using yfinance
     Returns a dictionary with key metrics or None if error occurs
     """
+    # Imported lazily: yfinance and the HTTP backend are only needed when fetching live data
+    import yfinance as yf
+    from .http_session import get_session
+
     try:
         # Handle special symbols that might need different formatting
         ticker_symbol = symbol
 
         # Create ticker object with error handling
-        ticker = yf.Ticker(ticker_symbol)
+        ticker = yf.Ticker(ticker_symbol, session=get_session())
 
         # Try to get info with additional error handling
         try:
-            info = ticker.info
+            with timed("ticker_info", symbol):
+                info = ticker.info
         except Exception as info_error:
             st.warning(f"Could not fetch info for {symbol}: {str(info_error)}")
             info = {}  # Use empty dict as fallback
 
         # Get historical data for the last 2 days to calculate daily change
         try:
-            hist_recent = ticker.history(period="2d", interval="1d")
+            with timed("history_recent", symbol):
+                hist_recent = ticker.history(period="2d", interval="1d")
         except Exception as hist_error:
             st.warning(f"Could not fetch recent history for {symbol}: {str(hist_error)}")
             return None
@@ -58,9 +66,10 @@ def fetch_stock_data(symbol):
             )
 
         # Get historical data for moving averages (get extra days to check for recent golden cross)
-        hist_long = ticker.history(
-            period="250d"
-        )  # Get extra days to ensure we have enough data
+        with timed("history_long", symbol):
+            hist_long = ticker.history(
+                period="250d"
+            )  # Get extra days to ensure we have enough data
 
         # Calculate 50-day moving average
         ma_50d = None
@@ -73,34 +82,20 @@ def fetch_stock_data(symbol):
             ma_200d = hist_long["Close"].tail(200).mean()
 
         # Check if Golden Cross or Death Cross occurred in the past 30 days
-        golden_cross = False
-        death_cross = False
+        # (50-day MA crossing above / below the 200-day MA), with the crossover scanner
         golden_cross_days_ago = None
         death_cross_days_ago = None
 
         if len(hist_long) >= 200:
-            # Calculate 50-day and 200-day MAs for the past 60 days
-            # (we need 30 days + some buffer to detect the crossover)
-            ma_50d_series = hist_long["Close"].rolling(window=50).mean().tail(60)
-            ma_200d_series = hist_long["Close"].rolling(window=200).mean().tail(60)
-
-            # Check if there was a golden crossover in the past 30 days
-            # (50-day MA crossing above 200-day MA)
-            for i in range(1, min(31, len(ma_50d_series))):
-                if (ma_50d_series.iloc[-i] > ma_200d_series.iloc[-i] and
-                    ma_50d_series.iloc[-i-1] <= ma_200d_series.iloc[-i-1]):
-                    golden_cross = True
-                    golden_cross_days_ago = i
-                    break
-
-            # Check if there was a death crossover in the past 30 days
-            # (50-day MA crossing below 200-day MA)
-            for i in range(1, min(31, len(ma_50d_series))):
-                if (ma_50d_series.iloc[-i] < ma_200d_series.iloc[-i] and
-                    ma_50d_series.iloc[-i-1] >= ma_200d_series.iloc[-i-1]):
-                    death_cross = True
-                    death_cross_days_ago = i
-                    break
+            pair = ("SMA", 50, 200)
+            crosses = scan_crossovers(hist_long["Close"].to_numpy(dtype=float)[:, None], [pair])[pair]
+            if not pd.isna(crosses["golden"][0]):
+                golden_cross_days_ago = int(crosses["golden"][0])
+            if not pd.isna(crosses["death"][0]):
+                death_cross_days_ago = int(crosses["death"][0])
+
+        golden_cross = golden_cross_days_ago is not None
+        death_cross = death_cross_days_ago is not None
 
         # Get financial metrics
         pe_ratio = info.get("trailingPE", info.get("forwardPE", "N/A"))
@@ -114,6 +109,7 @@ def fetch_stock_data(symbol):
         earnings_date = None
         earnings_date_note = None
         current_date = pd.Timestamp.now()
+        earnings_started = time.perf_counter()
 
         # Skip earnings date fetching for indices and ETFs
         if symbol not in ["^VIX", "SPY", "QQQ", "GLD", "SLV", "BTC-USD"]:
@@ -252,6 +248,8 @@ def fetch_stock_data(symbol):
                     earnings_date_note = "estimated"
                     # st.info(f"Using estimated earnings date for {symbol}: {earnings_date}")
 
+            record_span("earnings", time.perf_counter() - earnings_started, symbol)
+
         # Debug info - print what we're getting from Yahoo Finance
         # print(f"Debug for {symbol}: EPS={eps}, PEG={peg_ratio}")
 
@@ -298,6 +296,23 @@ def fetch_stock_data(symbol):
         return None
 
 
+@st.cache_data(ttl=HISTORY_CACHE_TTL, show_spinner=False)
+def fetch_history(symbol, period):
+    """Fetch daily price history for a symbol, cached per symbol and period"""
+    import yfinance as yf
+    from .http_session import get_session
+
+    return yf.Ticker(symbol, session=get_session()).history(period=period)
+
+
+def history_version(hist):
+    """Cheap fingerprint of a price history: changes whenever a bar is added or the last bars move"""
+    if hist.empty:
+        return 0
+    tail = pd.util.hash_pandas_object(hist.tail(5), index=True).sum()
+    return hash((len(hist), str(hist.index[0]), int(tail)))
+
+
 def display_stock_card(stock_data, company_name):
     """Display individual stock data in a card format"""
     if stock_data is None:
@@ -0,0 +1,150 @@
+"""
+Market data sources for SparkVibe Finance application
+The live source fetches from Yahoo Finance; the synthetic source serves a seeded
+simulated market, so development mode exercises every code path without network access;
+a replay streams a recorded market back bar by bar in one browser session
+"""
+
+import streamlit as st
+
+from .constants import STOCKS, SYNTHETIC_YEARS, SYNTHETIC_SEED
+
+LIVE = "live"
+SYNTHETIC = "synthetic"
+REPLAY = "replay"
+DATA_SOURCES = [LIVE, SYNTHETIC]
+
+_REPLAY_STATE_KEY = "replay_session"
+_DATA_SOURCE_STATE_KEY = "data_source"
+
+
+def set_data_source(name):
+    """Select where this session's tabs load market data from (LIVE or SYNTHETIC)"""
+    if name not in DATA_SOURCES:
+        raise ValueError(f"Unknown data source {name!r}, expected one of {DATA_SOURCES}")
+    st.session_state[_DATA_SOURCE_STATE_KEY] = name
+
+
+def _selected_source():
+    return st.session_state.get(_DATA_SOURCE_STATE_KEY, LIVE)
+
+
+def get_data_source():
+    """Return the data source of this session (REPLAY while a replay runs, else the selected one)"""
+    if get_replay_session() is not None:
+        return REPLAY
+    return _selected_source()
+
+
+@st.cache_resource(show_spinner=False)
+def load_recording(name):
+    """Stored recording as bar arrays, loaded once per process"""
+    from .replay import Recording
+    return Recording(name)
+
+
+def start_replay(name, speed=None):
+    """Start replaying a recording in this session (speed None: one bar per rerun)"""
+    from .replay import ReplaySession
+    st.session_state[_REPLAY_STATE_KEY] = ReplaySession(load_recording(name), speed)
+    return st.session_state[_REPLAY_STATE_KEY]
+
+
+def stop_replay():
+    """Return this session to its regular data source"""
+    st.session_state.pop(_REPLAY_STATE_KEY, None)
+
+
+def get_replay_session():
+    """The replay running in this session, or None"""
+    return st.session_state.get(_REPLAY_STATE_KEY)
+
+
+@st.cache_resource(show_spinner=False)
+def get_synthetic_market(symbols=tuple(STOCKS), years=SYNTHETIC_YEARS, seed=SYNTHETIC_SEED):
+    """Simulated market for the symbols, generated once per process"""
+    from .synthetic import SyntheticMarket
+    return SyntheticMarket.generate(list(symbols), years=years, seed=seed)
+
+
+def load_all_stock_data():
+    """Symbol -> stock data for the whole synthetic or replayed universe (the live source fetches per symbol)"""
+    replay = get_replay_session()
+    if replay is not None:
+        return replay.stock_data()
+    return get_synthetic_market().stock_data()
+
+
+def load_history(symbol, period):
+    """Daily price history of a symbol from the selected source"""
+    replay = get_replay_session()
+    if replay is not None:
+        return replay.history(symbol, period)
+    if _selected_source() == SYNTHETIC:
+        return get_synthetic_market().history(symbol, period)
+
+    from .data_fetcher import fetch_history
+    return fetch_history(symbol, period)
+
+
+def load_earnings_dates(symbol):
+    """Simulated or recorded earnings dates of a symbol (live earnings lookups go through yfinance in the tabs)"""
+    replay = get_replay_session()
+    if replay is not None:
+        return replay.earnings_dates(symbol)
+    return get_synthetic_market().earnings_dates(symbol)
+
+
+def load_bars(symbol, period, timeframe):
+    """
+    Price bars of a symbol in a timeframe (Daily, Weekly, Monthly or Quarterly), resampled
+    from the cached daily history so switching timeframe needs no extra upstream request
+    """
+    from .resample import resampled_history
+
+    hist = load_history(symbol, period)
+    return resampled_history((get_data_source(), symbol, period), hist, timeframe)
+
+
+def load_bar_matrices(symbols, period="2y", fields=("Open", "High", "Low", "Close", "Volume")):
+    """
+    Daily bars of the symbols as (sessions x symbols) arrays, one per field, for universe-wide
+    scans. Each column holds that symbol's own most recent sessions aligned at the last row,
+    padded with NaN at the top. Returns (symbols loaded, field -> array); live symbols deferred
+    by the request budget are left out.
+    """
+    import numpy as np
+
+    # Synthetic and replayed markets already store bar arrays
+    replay = get_replay_session()
+    if replay is not None:
+        return replay.bar_matrices(symbols, period, fields)
+    if _selected_source() == SYNTHETIC:
+        return get_synthetic_market().bar_matrices(symbols, period, fields)
+
+    from .data_fetcher import fetch_history
+    from .request_budget import allow_request, PRIORITY_LOW
+
+    loaded, histories = [], []
+    for symbol in symbols:
+        if not allow_request(PRIORITY_LOW):
+            continue
+        hist = fetch_history(symbol, period)
+        if hist.empty:
+            continue
+        loaded.append(symbol)
+        histories.append(hist)
+    rows = max((len(hist) for hist in histories), default=0)
+    matrices = {}
+    for field in fields:
+        matrix = np.full((rows, len(histories)), np.nan)
+        for i, hist in enumerate(histories):
+            matrix[rows - len(hist):, i] = hist[field].to_numpy(dtype=float)
+        matrices[field] = matrix
+    return loaded, matrices
+
+
+def load_close_matrix(symbols, period="2y"):
+    """Daily closes of the symbols as one (sessions x symbols) array; see load_bar_matrices"""
+    loaded, matrices = load_bar_matrices(symbols, period, fields=("Close",))
+    return loaded, matrices["Close"]
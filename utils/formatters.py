@@ -2,6 +2,7 @@
 Formatting utilities for SparkVibe Finance application
 """
 
+import numpy as np
 import pandas as pd
 from .constants import DECIMAL_PRECISION
 
@@ -30,3 +31,107 @@ def format_volume(volume):
 
     # Always show volume in millions
     return f"{volume/1e6:.{DECIMAL_PRECISION}f}M"
+
+
+def format_cross(present, days_ago, parenthesized=True):
+    """Format a Golden/Death Cross flag as a traffic light, with its age when known"""
+    if present and days_ago is not None and not pd.isna(days_ago):
+        days_ago = int(days_ago)
+        age = f"({days_ago}d ago)" if parenthesized else f"{days_ago}d ago"
+        if days_ago <= 15:
+            return f"🟢 {age}"
+        elif days_ago <= 30:
+            return f"🟡 {age}"
+        else:
+            return f"🔴 {age}"
+    elif present:
+        return "🟢"
+    else:
+        return "🔴"
+
+
+# Column formatters: format whole arrays/Series at once instead of one cell at a time.
+# Missing or non-numeric values (None, NaN, "N/A") come out as "N/A".
+
+def _as_float_array(values):
+    """Coerce a column to a float array, with NaN for anything missing or not numeric"""
+    return pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(dtype=float)
+
+
+def _like(values, formatted):
+    """Return formatted strings as a Series aligned with the input when it was a Series"""
+    if isinstance(values, pd.Series):
+        return pd.Series(formatted, index=values.index, dtype=object)
+    return formatted
+
+
+def _format_numbers(numbers, precision, prefix="", suffix=""):
+    """Format a float array with fixed precision, prefix and suffix (NaN -> "N/A")"""
+    missing = ~np.isfinite(numbers)
+    # Work on scaled integers so the digits come from array string ops, not per-cell formatting
+    scaled = np.round(np.abs(np.where(missing, 0.0, numbers)) * 10 ** precision).astype(np.int64)
+    text = (scaled // 10 ** precision).astype(str)
+    if precision > 0:
+        # Fractional digits are looked up from a small precomputed table
+        fractions = np.array([f".{digits:0{precision}d}" for digits in range(10 ** precision)])
+        text = np.char.add(text, fractions[scaled % 10 ** precision])
+    lead = np.where((numbers < 0) & (scaled > 0), "-" + prefix, prefix)
+    text = np.char.add(np.char.add(lead, text), suffix) if suffix else np.char.add(lead, text)
+    return np.where(missing, "N/A", text)
+
+
+def format_number_column(values, precision=DECIMAL_PRECISION, prefix="", suffix="", scale=1.0):
+    """Format a numeric column, e.g. prices with prefix="$" or ratios with suffix="x" """
+    return _like(values, _format_numbers(_as_float_array(values) * scale, precision, prefix, suffix))
+
+
+def format_percent_column(values, precision=DECIMAL_PRECISION, signed=False):
+    """Format a column of percentages; signed adds "+" to non-negative values"""
+    numbers = _as_float_array(values)
+    text = _format_numbers(numbers, precision, suffix="%")
+    if signed:
+        text = np.where(numbers >= 0, np.char.add("+", text), text)
+    return _like(values, text)
+
+
+def format_currency_column(values):
+    """Vectorized format_currency: $B above a billion, $M above a million, dollars otherwise"""
+    numbers = _as_float_array(values)
+    text = np.full(len(numbers), "N/A", dtype=object)
+    billions = numbers >= 1e9
+    millions = (numbers >= 1e6) & ~billions
+    text[billions] = _format_numbers(numbers[billions] / 1e9, DECIMAL_PRECISION, "$", "B")
+    text[millions] = _format_numbers(numbers[millions] / 1e6, DECIMAL_PRECISION, "$", "M")
+    # Plain dollars keep thousands separators, so format only those cells
+    small = numbers < 1e6
+    text[small] = [f"${value:,.{DECIMAL_PRECISION}f}" for value in numbers[small]]
+    return _like(values, text)
+
+
+def format_volume_column(values):
+    """Vectorized format_volume: always in millions"""
+    return format_number_column(values, suffix="M", scale=1e-6)
+
+
+def traffic_light_column(values, thresholds, lights):
+    """
+    Map a numeric column to status symbols: values below thresholds[i] get lights[i],
+    values at or above the last threshold get lights[-1]
+    """
+    numbers = _as_float_array(values)
+    text = np.asarray(lights, dtype=object)[np.digitize(numbers, thresholds)]
+    return _like(values, np.where(np.isnan(numbers), "N/A", text))
+
+
+def format_cross_column(present, days_ago, parenthesized=True):
+    """Vectorized format_cross for Golden/Death Cross flag and age columns"""
+    present = np.asarray(present, dtype=bool)
+    days = _as_float_array(days_ago)
+    known = present & ~np.isnan(days)
+
+    text = np.where(present, "🟢", "🔴").astype(object)
+    # Crosses are at most a few dozen distinct ages, so format each distinct age once
+    ages, positions = np.unique(days[known].astype(int), return_inverse=True)
+    labels = np.array([format_cross(True, age, parenthesized) for age in ages], dtype=object)
+    text[known] = labels[positions]
+    return _like(days_ago, text)
@@ -0,0 +1,109 @@
+"""
+Shared HTTP session for SparkVibe Finance application
+One connection-pooled, keep-alive session for all Yahoo Finance and BLS calls,
+with default timeouts, retries, an on-disk response cache and upstream call accounting
+"""
+
+import threading
+import time
+
+from .constants import HTTP_POOL_SIZE, HTTP_MAX_RETRIES, HTTP_RETRY_BACKOFF, HTTP_TIMEOUT
+from .request_budget import record_request, record_cache_hit
+from .response_cache import get_response_cache, cache_policy, cache_key, expires_at
+
+# Prefer curl_cffi (what yfinance uses for browser TLS impersonation), fall back to requests
+try:
+    from curl_cffi import requests as _http_backend
+    from curl_cffi import CurlOpt
+    from curl_cffi.requests import Headers as _Headers
+    # curl handles are kept per thread and each keeps up to HTTP_POOL_SIZE connections alive
+    _SESSION_KWARGS = {"impersonate": "chrome", "curl_options": {CurlOpt.MAXCONNECTS: HTTP_POOL_SIZE}}
+    _USES_CURL = True
+except ImportError:
+    import requests as _http_backend
+    from requests.adapters import HTTPAdapter
+    from requests.structures import CaseInsensitiveDict as _Headers
+    _SESSION_KWARGS = {}
+    _USES_CURL = False
+
+# Transient failures worth retrying; rate limiting (429) is left to the request budget
+_RETRY_STATUSES = {500, 502, 503, 504}
+_RETRY_ERRORS = (_http_backend.exceptions.ConnectionError, _http_backend.exceptions.Timeout)
+
+
+class AccountedSession(_http_backend.Session):
+    """Pooled HTTP session with default timeouts, retries and call accounting"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        if not _USES_CURL:
+            adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+            self.mount("https://", adapter)
+            self.mount("http://", adapter)
+
+    def request(self, method, url, *args, **kwargs):
+        # Serve fresh responses from the on-disk cache without touching the network
+        response_cache = get_response_cache()
+        cacheable = response_cache is not None and not args and not kwargs.get("stream")
+        endpoint = cache_policy(method, url) if cacheable else None
+        if endpoint is not None:
+            key = cache_key(method, url, kwargs.get("params"), kwargs.get("data"), kwargs.get("json"))
+            cached = response_cache.get(key)
+            if cached is not None:
+                record_cache_hit(url)
+                return _build_response(url, *cached)
+
+        response = self._send(method, url, *args, **kwargs)
+
+        if endpoint is not None and response.status_code == 200:
+            expiry = expires_at(endpoint, url, kwargs.get("params"), response.content)
+            content_type = response.headers.get("content-type")
+            headers = {"content-type": content_type} if content_type else {}
+            response_cache.set(key, url, response.status_code, headers, response.content, expiry)
+        return response
+
+    def _send(self, method, url, *args, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = HTTP_TIMEOUT
+
+        for attempt in range(HTTP_MAX_RETRIES + 1):
+            record_request(url)
+            try:
+                response = super().request(method, url, *args, **kwargs)
+            except _RETRY_ERRORS:
+                if attempt == HTTP_MAX_RETRIES:
+                    raise
+            else:
+                if response.status_code not in _RETRY_STATUSES or attempt == HTTP_MAX_RETRIES:
+                    return response
+
+            # Exponential backoff before the next attempt
+            time.sleep(HTTP_RETRY_BACKOFF * 2 ** attempt)
+
+
+def _build_response(url, status, headers, body):
+    """Rebuild a backend Response object from a cached entry"""
+    response = _http_backend.Response()
+    response.url = url
+    response.status_code = status
+    response.headers = _Headers(headers)
+    if _USES_CURL:
+        response.content = body
+    else:
+        response._content = body
+        response.encoding = "utf-8"
+    return response
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Return the process-wide shared HTTP session"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = AccountedSession(**_SESSION_KWARGS)
+    return _session
@@ -0,0 +1,112 @@
+"""
+Technical indicator engine for SparkVibe Finance application
+Computes RSI, MACD, Bollinger %B, ATR and 52-week high/low proximity for a whole
+universe at once from aligned daily bar arrays (sessions x symbols, NaN-padded at the
+top where a symbol has less history): one NumPy pass per indicator, no per-symbol loops
+"""
+
+import numpy as np
+import pandas as pd
+
+from .constants import RSI_PERIOD, MACD_PERIODS, BOLLINGER_PERIOD, BOLLINGER_STDS, ATR_PERIOD, YEAR_SESSIONS
+
+# Summary table columns, in display order
+INDICATOR_COLUMNS = ["RSI", "MACD Hist", "Bollinger %B", "ATR %", "vs 52W High %", "vs 52W Low %"]
+
+
+def _wilder(values, period):
+    """
+    Wilder-smoothed last value of each column (alpha 1/period, seeded with the first value),
+    in one pass over the sessions; NaN where a column has fewer than `period` values.
+    values may carry extra axes after the session axis (e.g. gains and losses stacked).
+    """
+    alpha = 1.0 / period
+    state = np.full(values.shape[1:], np.nan)
+    seen = np.zeros(values.shape[1:], dtype=np.int64)
+    for row in values:
+        has_value = np.isfinite(row)
+        updated = np.where(np.isnan(state), row, state + alpha * (row - state))
+        state = np.where(has_value, updated, state)
+        seen += has_value
+    return np.where(seen >= period, state, np.nan)
+
+
+def rsi(close, period=RSI_PERIOD):
+    """Relative strength index (0-100) at the last session"""
+    change = np.diff(close, axis=0)
+    gains_losses = np.stack([np.maximum(change, 0.0), np.maximum(-change, 0.0)], axis=1)  # NaN stays NaN
+    avg_gain, avg_loss = _wilder(gains_losses, period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        value = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    # No losses in the window: RSI is 100
+    return np.where((avg_loss == 0) & (avg_gain > 0), 100.0, value)
+
+
+def macd_histogram(close, periods=MACD_PERIODS):
+    """MACD line minus its signal line at the last session (EMAs seeded with the first price)"""
+    fast_span, slow_span, signal_span = periods
+    fast_alpha, slow_alpha, signal_alpha = (2.0 / (span + 1.0) for span in periods)
+
+    n = close.shape[1]
+    fast = np.full(n, np.nan)
+    slow = np.full(n, np.nan)
+    signal = np.full(n, np.nan)
+    seen = np.zeros(n, dtype=np.int64)
+    for price in close:
+        has_price = np.isfinite(price)
+        fast = np.where(has_price, np.where(np.isnan(fast), price, fast + fast_alpha * (price - fast)), fast)
+        slow = np.where(has_price, np.where(np.isnan(slow), price, slow + slow_alpha * (price - slow)), slow)
+        line = fast - slow
+        signal = np.where(has_price, np.where(np.isnan(signal), line, signal + signal_alpha * (line - signal)), signal)
+        seen += has_price
+    return np.where(seen >= slow_span + signal_span, (fast - slow) - signal, np.nan)
+
+
+def bollinger_percent_b(close, period=BOLLINGER_PERIOD, stds=BOLLINGER_STDS):
+    """Position of the last close within its Bollinger bands (0 = lower band, 1 = upper band)"""
+    window = close[-period:]
+    if len(window) < period:
+        return np.full(close.shape[1], np.nan)
+    mean = window.mean(axis=0)
+    std = window.std(axis=0)
+    lower = mean - stds * std
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (close[-1] - lower) / (2 * stds * std)
+
+
+def atr_percent(high, low, close, period=ATR_PERIOD):
+    """Average true range at the last session as a percentage of the last close"""
+    previous = np.vstack([np.full((1, close.shape[1]), np.nan), close[:-1]])
+    true_range = np.fmax(high - low, np.fmax(np.abs(high - previous), np.abs(low - previous)))
+    return _wilder(true_range, period) / close[-1] * 100
+
+
+def year_range_proximity(high, low, close, sessions=YEAR_SESSIONS):
+    """Last close vs. the 52-week high and low, in percent (NaN without a full year of bars)"""
+    if len(close) < sessions:
+        missing = np.full(close.shape[1], np.nan)
+        return missing, missing
+    full_year = np.isfinite(close[-sessions:]).all(axis=0)
+    year_high = np.fmax.reduce(high[-sessions:], axis=0)
+    year_low = np.fmin.reduce(low[-sessions:], axis=0)
+    vs_high = np.where(full_year, (close[-1] / year_high - 1) * 100, np.nan)
+    vs_low = np.where(full_year, (close[-1] / year_low - 1) * 100, np.nan)
+    return vs_high, vs_low
+
+
+def compute_indicators(symbols, high, low, close):
+    """Indicator frame for the symbols (Symbol plus INDICATOR_COLUMNS) from aligned bar arrays"""
+    high, low, close = (np.asarray(values, dtype=float) for values in (high, low, close))
+    if len(close) < 2:
+        return pd.DataFrame({"Symbol": list(symbols), **{column: np.nan for column in INDICATOR_COLUMNS}})
+
+    vs_high, vs_low = year_range_proximity(high, low, close)
+    return pd.DataFrame({
+        "Symbol": list(symbols),
+        "RSI": rsi(close),
+        "MACD Hist": macd_histogram(close),
+        "Bollinger %B": bollinger_percent_b(close),
+        "ATR %": atr_percent(high, low, close),
+        "vs 52W High %": vs_high,
+        "vs 52W Low %": vs_low,
+    })
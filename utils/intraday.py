@@ -0,0 +1,328 @@
+"""
+Intraday streaming for SparkVibe Finance application
+1-minute bars land in a preallocated ring buffer per symbol, with running session sums,
+so VWAP, volume pace and price vs. the daily moving averages update in O(1) per bar
+and memory stays fixed however long the session runs
+"""
+
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from .constants import (
+    INTRADAY_BUFFER_BARS, INTRADAY_SESSION_MINUTES, INTRADAY_POLL_SECONDS,
+    INTRADAY_STANDIN_POLL_SECONDS, INTRADAY_STANDIN_SECONDS_PER_BAR,
+)
+from .timing import timed
+
+# Columns of a buffered bar: the 1-minute OHLCV plus the session VWAP as of that bar
+BAR_COLUMNS = ["Open", "High", "Low", "Close", "Volume", "VWAP"]
+
+_OPEN, _HIGH, _LOW, _CLOSE, _VOLUME, _VWAP = range(len(BAR_COLUMNS))
+
+
+class RingBuffer:
+    """Fixed-capacity bar store: preallocated arrays, the oldest bar overwritten once full"""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.times = np.zeros(capacity, dtype=np.int64)  # epoch seconds
+        self.bars = np.zeros((capacity, len(BAR_COLUMNS)))
+        self.count = 0
+        self._next = 0
+
+    def append(self, timestamp, bar):
+        """Store a bar in the next slot"""
+        self.times[self._next] = timestamp
+        self.bars[self._next] = bar
+        self._next = (self._next + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def last(self):
+        """The newest bar (a view into the buffer)"""
+        return self.bars[self._next - 1]
+
+    def replace_last(self, bar):
+        """Overwrite the newest bar (an in-progress minute that was updated)"""
+        self.bars[self._next - 1] = bar
+
+    def ordered(self):
+        """(times, bars) oldest first"""
+        slots = (self._next - self.count + np.arange(self.count)) % self.capacity
+        return self.times[slots], self.bars[slots]
+
+    @property
+    def nbytes(self):
+        return self.times.nbytes + self.bars.nbytes
+
+
+class IntradaySeries:
+    """Ring buffer of one symbol's 1-minute bars plus running session sums"""
+
+    def __init__(self, capacity=INTRADAY_BUFFER_BARS):
+        self.buffer = RingBuffer(capacity)
+        self.session = None
+        self.session_start = None
+        self.last_time = None
+        self._price_volume = 0.0
+        self._volume = 0.0
+
+    def update(self, timestamp, open_, high, low, close, volume, session):
+        """
+        Add a 1-minute bar (or update the newest one when the timestamp repeats) in O(1).
+        Bars older than the newest are ignored. Returns whether the bar was applied.
+        """
+        if self.last_time is not None and timestamp < self.last_time:
+            return False
+
+        if session != self.session:
+            # A new session starts the VWAP and volume sums over
+            self.session = session
+            self.session_start = timestamp
+            self._price_volume = 0.0
+            self._volume = 0.0
+            replacing = False
+        else:
+            replacing = timestamp == self.last_time
+
+        if replacing:
+            # Take the previous version of this minute back out of the sums
+            previous = self.buffer.last()
+            self._price_volume -= (previous[_HIGH] + previous[_LOW] + previous[_CLOSE]) / 3 * previous[_VOLUME]
+            self._volume -= previous[_VOLUME]
+
+        # VWAP from the typical price of each bar
+        self._price_volume += (high + low + close) / 3 * volume
+        self._volume += volume
+        vwap = self._price_volume / self._volume if self._volume > 0 else close
+        bar = (open_, high, low, close, volume, vwap)
+
+        if replacing:
+            self.buffer.replace_last(bar)
+        else:
+            self.buffer.append(timestamp, bar)
+        self.last_time = timestamp
+        return True
+
+    @property
+    def vwap(self):
+        return self._price_volume / self._volume if self._volume > 0 else float(self.buffer.last()[_CLOSE])
+
+    @property
+    def session_volume(self):
+        return self._volume
+
+    @property
+    def last_price(self):
+        return float(self.buffer.last()[_CLOSE]) if self.buffer.count else np.nan
+
+    def session_minutes(self):
+        """Minutes since the first bar of the session (at least one)"""
+        return (self.last_time - self.session_start) / 60 + 1 if self.session_start is not None else 0
+
+    def frame(self):
+        """Buffered bars as a DataFrame (oldest first) for charts"""
+        times, bars = self.buffer.ordered()
+        return pd.DataFrame(bars, columns=BAR_COLUMNS, index=pd.to_datetime(times, unit="s", utc=True))
+
+
+class IntradayBook:
+    """Intraday series of every symbol, updated bar by bar"""
+
+    def __init__(self, capacity=INTRADAY_BUFFER_BARS):
+        self.capacity = capacity
+        self._series = {}
+        self._lock = threading.Lock()
+        self.bars_applied = 0
+
+    def series(self, symbol):
+        return self._series.get(symbol)
+
+    def last_time(self, symbol):
+        series = self._series.get(symbol)
+        return None if series is None else series.last_time
+
+    def ingest(self, symbol, times, bars, sessions):
+        """Apply bars (epoch seconds, rows of OHLCV, session keys) to a symbol; returns how many were applied"""
+        with self._lock:
+            series = self._series.get(symbol)
+            if series is None:
+                series = self._series[symbol] = IntradaySeries(self.capacity)
+            applied = 0
+            for timestamp, (open_, high, low, close, volume), session in zip(times.tolist(), bars.tolist(), sessions):
+                applied += series.update(timestamp, open_, high, low, close, volume, session)
+            self.bars_applied += applied
+            return applied
+
+    def ingest_frame(self, symbol, frame):
+        """Apply a yfinance-style 1-minute history frame (tz-aware index, Open/High/Low/Close/Volume)"""
+        if frame is None or frame.empty:
+            return 0
+        index = pd.DatetimeIndex(frame.index)
+        times = index.as_unit("s").asi8
+        sessions = index.date.tolist()  # Exchange-local trading day
+        bars = frame[["Open", "High", "Low", "Close", "Volume"]].to_numpy(dtype=float)
+        return self.ingest(symbol, times, bars, sessions)
+
+    @property
+    def nbytes(self):
+        """Memory held by the ring buffers (fixed per symbol)"""
+        return sum(series.buffer.nbytes for series in self._series.values())
+
+    def metrics(self, all_stock_data, symbols):
+        """
+        Live intraday metrics per symbol: price, VWAP, session volume against the daily average
+        (pro rata for the minutes traded so far) and price against the daily moving averages
+        """
+        rows = []
+        with self._lock:
+            for symbol in symbols:
+                series = self._series.get(symbol)
+                if series is None or series.buffer.count == 0:
+                    continue
+                daily = all_stock_data.get(symbol) or {}
+                price = series.last_price
+                vwap = series.vwap
+                avg_volume = _number(daily.get("avg_volume"))
+                expected = avg_volume * min(1.0, series.session_minutes() / INTRADAY_SESSION_MINUTES)
+                ma_50d = _number(daily.get("ma_50d"))
+                ma_200d = _number(daily.get("ma_200d"))
+                rows.append({
+                    "Symbol": symbol,
+                    "Price": price,
+                    "VWAP": vwap,
+                    "vs VWAP %": (price / vwap - 1) * 100,
+                    "Session Volume (M)": series.session_volume / 1e6,
+                    "Volume Pace": series.session_volume / expected if expected > 0 else np.nan,
+                    "vs 50-Day MA %": (price / ma_50d - 1) * 100,
+                    "vs 200-Day MA %": (price / ma_200d - 1) * 100,
+                    "Bars": series.buffer.count,
+                })
+        return pd.DataFrame(rows)
+
+
+def _number(value):
+    """Float of a snapshot value, NaN when missing"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+class SimulatedMinuteStream:
+    """
+    Offline stand-in for the 1-minute feed: seeded random-walk bars for every symbol,
+    one simulated minute per INTRADAY_STANDIN_SECONDS_PER_BAR of wall time from today's open
+    """
+
+    def __init__(self, start_prices, avg_volumes, seed=0, started_at=None):
+        self.symbols = list(start_prices)
+        self._prices = np.array([start_prices[symbol] for symbol in self.symbols], dtype=float)
+        self._minute_volumes = np.nan_to_num(
+            np.array([avg_volumes.get(symbol, np.nan) for symbol in self.symbols], dtype=float), nan=1e6
+        ) / INTRADAY_SESSION_MINUTES
+        self._rng = np.random.default_rng(seed)
+        self.started_at = started_at or time.time()
+        today = pd.Timestamp.now(tz="America/New_York").normalize()
+        self._open = int((today + pd.Timedelta(hours=9, minutes=30)).timestamp())
+        self._session = today.date()
+        self._emitted = 0
+
+    def poll(self, now=None):
+        """Bars due since the last poll: (epoch seconds, bars as minutes x symbols x OHLCV)"""
+        elapsed = (now or time.time()) - self.started_at
+        due = min(INTRADAY_SESSION_MINUTES, int(elapsed / INTRADAY_STANDIN_SECONDS_PER_BAR) + 1)
+        count = due - self._emitted
+        if count <= 0:
+            return np.zeros(0, dtype=np.int64), np.zeros((0, len(self.symbols), 5))
+
+        # Random walk with about 25% annualized volatility per minute bar
+        sigma = 0.25 / np.sqrt(252 * INTRADAY_SESSION_MINUTES)
+        steps = sigma * self._rng.standard_normal((count, len(self.symbols)))
+        closes = self._prices * np.exp(np.cumsum(steps, axis=0))
+        opens = np.vstack([self._prices[None, :], closes[:-1]])
+        wick = 1 + sigma * np.abs(self._rng.standard_normal((2, count, len(self.symbols))))
+        bars = np.stack([
+            opens,
+            np.maximum(opens, closes) * wick[0],
+            np.minimum(opens, closes) / wick[1],
+            closes,
+            np.round(self._minute_volumes * self._rng.lognormal(0.0, 0.5, (count, len(self.symbols)))),
+        ], axis=-1)
+
+        times = self._open + 60 * np.arange(self._emitted, due, dtype=np.int64)
+        self._prices = closes[-1]
+        self._emitted = due
+        return times, bars
+
+    @property
+    def session(self):
+        return self._session
+
+
+class IntradayFeed:
+    """Pulls new 1-minute bars into an IntradayBook, from Yahoo Finance or the offline stand-in"""
+
+    def __init__(self, offline, capacity=INTRADAY_BUFFER_BARS):
+        self.offline = offline
+        self.book = IntradayBook(capacity)
+        self.poll_seconds = INTRADAY_STANDIN_POLL_SECONDS if offline else INTRADAY_POLL_SECONDS
+        self.last_poll = None
+        self._stream = None
+        self._poll_lock = threading.Lock()
+
+    def poll(self, symbols, all_stock_data, now=None):
+        """Pull bars newer than the book holds, at most once per poll interval; returns bars applied"""
+        now = now or time.time()
+        if not self._poll_lock.acquire(blocking=False):
+            return 0  # Another session is polling right now
+        try:
+            if self.last_poll is not None and now - self.last_poll < self.poll_seconds:
+                return 0
+            self.last_poll = now
+            with timed("intraday_poll"):
+                if self.offline:
+                    return self._poll_stream(symbols, all_stock_data, now)
+                return self._poll_live(symbols)
+        finally:
+            self._poll_lock.release()
+
+    def _poll_stream(self, symbols, all_stock_data, now):
+        if self._stream is None:
+            start_prices = {
+                symbol: _number((all_stock_data.get(symbol) or {}).get("current_price")) for symbol in symbols
+            }
+            start_prices = {symbol: price for symbol, price in start_prices.items() if not np.isnan(price)}
+            avg_volumes = {symbol: _number((all_stock_data.get(symbol) or {}).get("avg_volume")) for symbol in start_prices}
+            self._stream = SimulatedMinuteStream(start_prices, avg_volumes)
+
+        times, bars = self._stream.poll(now)
+        sessions = [self._stream.session] * len(times)
+        return sum(
+            self.book.ingest(symbol, times, bars[:, column], sessions)
+            for column, symbol in enumerate(self._stream.symbols)
+        )
+
+    def _poll_live(self, symbols):
+        import yfinance as yf
+        from .http_session import get_session
+        from .request_budget import allow_request, PRIORITY_LOW
+
+        applied = 0
+        for symbol in symbols:
+            if not allow_request(PRIORITY_LOW):
+                break  # The remaining symbols catch up on the next poll
+            since = self.book.last_time(symbol)
+            ticker = yf.Ticker(symbol, session=get_session())
+            try:
+                if since is None:
+                    frame = ticker.history(period="1d", interval="1m")
+                else:
+                    # Incremental: from the newest buffered minute, which may still have been in progress
+                    frame = ticker.history(start=pd.Timestamp(since, unit="s", tz="UTC"), interval="1m")
+            except Exception:
+                continue
+            applied += self.book.ingest_frame(symbol, frame)
+        return applied
@@ -0,0 +1,33 @@
+"""
+Refresh orchestration for SparkVibe Finance application
+Runs the independent data sources of one refresh (equities, CPI) on their own
+worker threads, so a refresh takes as long as the slowest source instead of the sum
+"""
+
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+from .timing import timed
+
+
+def _run_source(name, fetch, ctx):
+    # Worker threads share the script run context so st.* calls and caches keep working, and
+    # run in a copy of the caller's context so timing spans and request counts land in its rerun
+    if ctx is not None:
+        add_script_run_ctx(threading.current_thread(), ctx)
+    with timed(f"refresh_{name}"):
+        return fetch()
+
+
+def run_refresh(sources):
+    """
+    Fetch every source concurrently and return {name: result}.
+    sources maps a name to a zero-argument callable; an exception in any source is re-raised.
+    """
+    ctx = get_script_run_ctx()
+    with timed("refresh"), ThreadPoolExecutor(max_workers=len(sources), thread_name_prefix="refresh") as pool:
+        futures = {name: pool.submit(contextvars.copy_context().run, _run_source, name, fetch, ctx) for name, fetch in sources.items()}
+        return {name: future.result() for name, future in futures.items()}
@@ -0,0 +1,49 @@
+"""
+Data release calendar helpers for SparkVibe Finance application
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+from .constants import CPI_RELEASE_DAY, CPI_RELEASE_TIME, CPI_RELEASE_TIMEZONE
+
+
+def _utcnow():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _release_in_month(year, month):
+    """Scheduled CPI release time (naive UTC) in the given calendar month"""
+    release = pd.Timestamp(
+        year=year, month=month, day=CPI_RELEASE_DAY,
+        hour=CPI_RELEASE_TIME[0], minute=CPI_RELEASE_TIME[1], tz=CPI_RELEASE_TIMEZONE,
+    )
+    return release.tz_convert("UTC").tz_localize(None).to_pydatetime()
+
+
+def last_cpi_release(now=None):
+    """Most recent scheduled CPI release at or before now (naive UTC)"""
+    now = now or _utcnow()
+    release = _release_in_month(now.year, now.month)
+    if release > now:
+        previous = now.replace(day=1) - timedelta(days=1)
+        release = _release_in_month(previous.year, previous.month)
+    return release
+
+
+def next_cpi_release(now=None):
+    """Next scheduled CPI release after now (naive UTC)"""
+    now = now or _utcnow()
+    release = _release_in_month(now.year, now.month)
+    if release <= now:
+        following = now.replace(day=28) + timedelta(days=4)
+        release = _release_in_month(following.year, following.month)
+    return release
+
+
+def latest_published_cpi_month(now=None):
+    """First day of the newest month whose CPI should be published by now (each release covers the prior month)"""
+    release = last_cpi_release(now)
+    covered = release.replace(day=1) - timedelta(days=1)
+    return datetime(covered.year, covered.month, 1)
@@ -0,0 +1,124 @@
+"""
+Render-model memo for SparkVibe Finance application
+Tabs memoize the tables and chart specs they derive from a snapshot, keyed on the
+snapshot's content version, in one process-wide LRU with a memory cap. Sessions showing
+the same data share the models, and each caller gets its own copy of the frames and figures
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from .constants import RENDER_CACHE_MAX_BYTES
+
+
+def estimate_size(value):
+    """Rough size in bytes of a render model (DataFrames, arrays, figures and containers)"""
+    if isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum()) if hasattr(usage, "sum") else int(usage)
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if hasattr(value, "to_plotly_json"):
+        return estimate_size(value.to_plotly_json())
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    if hasattr(value, "__dict__"):
+        return sys.getsizeof(value) + estimate_size(vars(value))
+    return sys.getsizeof(value)
+
+
+def private_copy(value):
+    """
+    Copy of a cached model its caller may modify: DataFrames, arrays and figures are copied,
+    containers element-wise. Query objects (SnapshotTable, ScreenIndex, CPICube) are shared:
+    they are only read after they are built.
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series, np.ndarray)):
+        return value.copy()
+    if hasattr(value, "to_plotly_json"):
+        return type(value)(value)
+    if isinstance(value, tuple):
+        return tuple(private_copy(item) for item in value)
+    if isinstance(value, list):
+        return [private_copy(item) for item in value]
+    if isinstance(value, dict):
+        return {key: private_copy(item) for key, item in value.items()}
+    return value
+
+
+class RenderCache:
+    """LRU of render models keyed by (tab, name, version, params), evicted by total size"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def memoize(self, tab, name, version, build, params=(), keep=None):
+        """
+        Return the cached model for this tab/name/version/params, building it on a miss.
+        Cached models are shared across reruns and sessions, so callers get a private_copy.
+        keep: optional check of a built model; models it rejects (e.g. missing symbols the
+        request budget deferred) are returned without caching, so the next call builds again.
+        """
+        key = (tab, name, version, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+        if entry is not None:
+            return private_copy(entry[0])
+
+        value = build()
+        if keep is not None and not keep(value):
+            return value
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return value  # Never worth caching
+
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            # Evict least recently used models until back under the cap
+            while self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+        return private_copy(value)
+
+    def stats(self):
+        """Return entry count, bytes held, hits and misses"""
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes, "hits": self.hits, "misses": self.misses}
+
+    def clear(self):
+        """Drop every cached model"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+_render_cache = RenderCache(RENDER_CACHE_MAX_BYTES)
+
+
+def memoize_render(tab, name, version, build, params=(), keep=None):
+    """Memoize a tab's render model in the process-wide render cache"""
+    return _render_cache.memoize(tab, name, version, build, params, keep)
+
+
+def get_render_cache():
+    """Return the process-wide render cache"""
+    return _render_cache
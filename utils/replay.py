@@ -0,0 +1,270 @@
+"""
+Market replay for SparkVibe Finance application
+Records daily bars and fundamentals to disk, then streams them back bar by bar at an
+adjustable speed so the whole dashboard updates as it would live, with the latency
+of each refresh measured against when its newest bar was due
+"""
+
+import json
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from .constants import REPLAY_DIR, REPLAY_WARMUP_BARS
+from .bars import stock_data_from_bars, FUNDAMENTAL_FIELDS
+
+BAR_FIELDS = ["Open", "High", "Low", "Close", "Volume"]
+
+_BARS_FILE = "bars.parquet"
+_META_FILE = "meta.json"
+
+_PERIOD_BARS = {"d": 1, "mo": 21, "y": 252}
+
+
+def _period_bars(period):
+    """Number of daily bars in a yfinance-style period such as 2y"""
+    unit = period.lstrip("0123456789")
+    return int(period[:-len(unit)]) * _PERIOD_BARS[unit]
+
+
+def _recording_dir(name):
+    return os.path.join(REPLAY_DIR, name)
+
+
+def _jsonable(value):
+    """Fundamental value as stored in the recording metadata"""
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (pd.Timestamp, datetime)):
+        return pd.Timestamp(value).isoformat()
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if np.isnan(value) else value
+
+
+def list_recordings():
+    """Names of the stored recordings, newest first"""
+    try:
+        names = [name for name in os.listdir(REPLAY_DIR) if os.path.exists(os.path.join(_recording_dir(name), _META_FILE))]
+    except OSError:
+        return []
+    return sorted(names, key=lambda name: os.path.getmtime(os.path.join(_recording_dir(name), _META_FILE)), reverse=True)
+
+
+def record_replay(name, histories, all_stock_data, source):
+    """
+    Store daily bars (symbol -> history frame) and each symbol's fundamentals from a snapshot
+    as a recording; returns the number of symbols recorded
+    """
+    frames = []
+    for symbol, hist in histories.items():
+        if hist is None or hist.empty:
+            continue
+        bars = hist[BAR_FIELDS].copy()
+        # Dates as naive session days so recordings from any source line up
+        index = pd.DatetimeIndex(hist.index)
+        bars["Date"] = (index.tz_localize(None) if index.tz is not None else index).normalize()
+        bars["Symbol"] = symbol
+        frames.append(bars)
+    if not frames:
+        return 0
+
+    bars = pd.concat(frames, ignore_index=True)
+    symbols = list(pd.unique(bars["Symbol"]))
+    fundamentals = {
+        symbol: {field: _jsonable((all_stock_data.get(symbol) or {}).get(field)) for field in FUNDAMENTAL_FIELDS}
+        for symbol in symbols
+    }
+
+    path = _recording_dir(name)
+    os.makedirs(path, exist_ok=True)
+    bars.to_parquet(os.path.join(path, _BARS_FILE), index=False)
+    with open(os.path.join(path, _META_FILE), "w") as f:
+        json.dump({
+            "source": source,
+            "recorded_at": datetime.now().isoformat(),
+            "symbols": symbols,
+            "fundamentals": fundamentals,
+        }, f, indent=2)
+    return len(symbols)
+
+
+class Recording:
+    """
+    A stored recording as bar arrays. Each symbol keeps its own sessions (a symbol trading
+    every day, like BTC-USD, adds no bars to the others): arrays[field] holds each symbol's
+    bars from the top of its column in date order, NaN below, and counts[p, column] is how
+    many of them fall on or before the p-th date of the replay clock (all recorded dates).
+    """
+
+    def __init__(self, name):
+        path = _recording_dir(name)
+        with open(os.path.join(path, _META_FILE)) as f:
+            meta = json.load(f)
+        bars = pd.read_parquet(os.path.join(path, _BARS_FILE))
+
+        self.name = name
+        self.source = meta["source"]
+        self.symbols = meta["symbols"]
+        self.columns = {symbol: i for i, symbol in enumerate(self.symbols)}
+
+        bars = bars.drop_duplicates(["Symbol", "Date"], keep="last").sort_values(["Symbol", "Date"])
+        self.dates = pd.DatetimeIndex(pd.unique(bars["Date"])).sort_values()
+        groups = dict(tuple(bars.groupby("Symbol", sort=False)))
+        self.symbol_dates = [
+            pd.DatetimeIndex(groups[symbol]["Date"]) if symbol in groups else pd.DatetimeIndex([])
+            for symbol in self.symbols
+        ]
+        rows = max((len(dates) for dates in self.symbol_dates), default=0)
+        self.arrays = {field: np.full((rows, len(self.symbols)), np.nan) for field in BAR_FIELDS}
+        self.counts = np.zeros((len(self.dates) + 1, len(self.symbols)), dtype=np.int64)
+        for column, symbol in enumerate(self.symbols):
+            if symbol not in groups:
+                continue
+            for field in BAR_FIELDS:
+                self.arrays[field][:len(groups[symbol]), column] = groups[symbol][field].to_numpy(dtype=float)
+            self.counts[1:, column] = self.symbol_dates[column].searchsorted(self.dates, side="right")
+
+        fundamentals = meta["fundamentals"]
+        self.fundamentals = {
+            field: [fundamentals[symbol][field] for symbol in self.symbols] for field in FUNDAMENTAL_FIELDS
+        }
+        self.fundamentals["earnings_date"] = [
+            None if value is None else pd.Timestamp(value) for value in self.fundamentals["earnings_date"]
+        ]
+
+    def bar_matrices(self, position, columns, sessions=None, fields=BAR_FIELDS):
+        """
+        Field -> (sessions x columns) array of each column's own last `sessions` bars (all if
+        None) as of the position-th date, aligned at the last row and padded with NaN at the top
+        """
+        columns = np.asarray(columns, dtype=np.int64)
+        counts = self.counts[position, columns]
+        rows = int(counts.max(initial=0))
+        if sessions is not None:
+            rows = min(rows, sessions)
+        source = counts[None, :] - rows + np.arange(rows)[:, None]
+        valid = source >= 0
+        source = np.where(valid, source, 0)
+        return {field: np.where(valid, self.arrays[field][source, columns], np.nan) for field in fields}
+
+    def __len__(self):
+        return len(self.dates)
+
+
+class ReplaySession:
+    """
+    Cursor over a recording. With a speed, bars become visible as market time advances
+    `speed` times faster than wall time (weekends and holidays included, as live);
+    without one, each advance() reveals the next bar.
+    """
+
+    def __init__(self, recording, speed=None, start_bar=None):
+        self.recording = recording
+        self.position = min(len(recording), max(2, REPLAY_WARMUP_BARS if start_bar is None else start_bar))
+        self.started_at = time.time()
+        self.bars_replayed = 0
+        self.last_latency = None
+        self._due_at = self.started_at
+        self.set_speed(speed)
+
+    def set_speed(self, speed, now=None):
+        """Change the replay speed from the current bar on"""
+        self.speed = speed
+        self._anchor = (now or time.time(), self.position)
+
+    @property
+    def finished(self):
+        return self.position >= len(self.recording)
+
+    @property
+    def current_date(self):
+        return self.recording.dates[self.position - 1]
+
+    def advance(self, now=None):
+        """Reveal the bars that are due by now; returns how many were added"""
+        now = now or time.time()
+        if self.finished:
+            return 0
+
+        if self.speed is None:
+            target = self.position + 1
+            due_at = now
+        else:
+            anchor_time, anchor_bar = self._anchor
+            dates = self.recording.dates
+            market_now = dates[anchor_bar - 1] + pd.Timedelta(seconds=(now - anchor_time) * self.speed)
+            target = min(len(self.recording), max(self.position, int(dates.searchsorted(market_now, side="right"))))
+            due_at = anchor_time + (dates[target - 1] - dates[anchor_bar - 1]).total_seconds() / self.speed
+
+        added = target - self.position
+        if added:
+            self.position = target
+            self.bars_replayed += added
+            self._due_at = due_at
+        return added
+
+    def record_refresh(self, finished_at=None):
+        """Latency from when the newest visible bar was due to the end of the refresh showing it"""
+        self.last_latency = (finished_at or time.time()) - self._due_at
+        return self.last_latency
+
+    def stats(self):
+        """Replay progress, throughput and the latest refresh latency"""
+        elapsed = max(time.time() - self.started_at, 1e-9)
+        return {
+            "position": self.position,
+            "total": len(self.recording),
+            "date": self.current_date,
+            "bars_per_second": self.bars_replayed / elapsed,
+            "latency": self.last_latency,
+        }
+
+    def stock_data(self):
+        """Symbol -> stock data as of the current bar (None for a symbol with no bars yet)"""
+        recording = self.recording
+        present = np.flatnonzero(recording.counts[self.position] > 0)
+        visible = recording.bar_matrices(self.position, present)
+        data = stock_data_from_bars(
+            [recording.symbols[column] for column in present],
+            visible["Open"], visible["High"], visible["Low"], visible["Close"], visible["Volume"],
+            {field: [values[column] for column in present] for field, values in recording.fundamentals.items()},
+        )
+        return {symbol: data.get(symbol) for symbol in recording.symbols}
+
+    def bar_matrices(self, symbols, period="2y", fields=BAR_FIELDS):
+        """
+        Bars of the recorded symbols up to the current bar over a yfinance-style period, as
+        (symbols loaded, field -> sessions x symbols array); see Recording.bar_matrices
+        """
+        loaded = [symbol for symbol in symbols if symbol in self.recording.columns]
+        columns = [self.recording.columns[symbol] for symbol in loaded]
+        return loaded, self.recording.bar_matrices(self.position, columns, _period_bars(period), fields)
+
+    def history(self, symbol, period="2y"):
+        """Daily bars of one symbol (its own sessions) up to the current bar over a yfinance-style period, like Ticker.history"""
+        if symbol not in self.recording.columns:
+            return pd.DataFrame(columns=BAR_FIELDS)
+        column = self.recording.columns[symbol]
+        end = int(self.recording.counts[self.position, column])
+        start = max(0, end - _period_bars(period))
+        frame = pd.DataFrame(
+            {field: self.recording.arrays[field][start:end, column] for field in BAR_FIELDS},
+            index=pd.DatetimeIndex(self.recording.symbol_dates[column][start:end], name="Date"),
+        )
+        frame["Volume"] = frame["Volume"].round().astype(np.int64)
+        return frame
+
+    def earnings_dates(self, symbol):
+        """The recorded earnings date of a symbol, if any"""
+        if symbol not in self.recording.columns:
+            return pd.DataFrame()
+        date = self.recording.fundamentals["earnings_date"][self.recording.columns[symbol]]
+        if date is None:
+            return pd.DataFrame()
+        return pd.DataFrame({"Reported EPS": np.nan}, index=pd.DatetimeIndex([date], name="Earnings Date"))
@@ -0,0 +1,232 @@
+"""
+Upstream call accounting and request budgets for SparkVibe Finance application
+Counts HTTP requests by endpoint, symbol and caller module, and enforces a
+per-rerun (per session) and per-minute (per process) budget on lower-priority calls
+"""
+
+import contextvars
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from urllib.parse import urlsplit, parse_qs
+
+import pandas as pd
+import streamlit as st
+
+from .constants import REQUEST_BUDGET_PER_RERUN, REQUEST_BUDGET_PER_MINUTE, LOW_PRIORITY_BUDGET_SHARE
+
+# Call priorities: core snapshot data is never blocked, chart data is blocked once the
+# budget is used up, and optional lookups already stop at LOW_PRIORITY_BUDGET_SHARE
+PRIORITY_HIGH = "high"
+PRIORITY_NORMAL = "normal"
+PRIORITY_LOW = "low"
+
+_PRIORITY_SHARE = {
+    PRIORITY_HIGH: None,
+    PRIORITY_NORMAL: 1.0,
+    PRIORITY_LOW: LOW_PRIORITY_BUDGET_SHARE,
+}
+
+# Known upstream endpoints, matched against "host/path"
+_ENDPOINTS = [
+    ("/finance/chart/", "yahoo:chart"),
+    ("/finance/quoteSummary/", "yahoo:quoteSummary"),
+    ("/finance/quote", "yahoo:quote"),
+    ("/getcrumb", "yahoo:crumb"),
+    ("/calendar/earnings", "yahoo:earnings"),
+    ("/finance/visualization", "yahoo:earnings"),
+    ("fundamentals-timeseries", "yahoo:timeseries"),
+    ("api.bls.gov", "bls:timeseries"),
+]
+
+# Modules whose frames are skipped when attributing a request to its caller
+_INTERNAL_MODULES = ("utils.request_budget", "utils.http_session")
+
+_lock = threading.Lock()
+
+# Counters of the current rerun of this session: requests keyed by (endpoint, symbol, caller),
+# calls refused by the budget keyed by caller, and requests answered by the on-disk response
+# cache keyed by endpoint. Every session's script thread sets its own; worker threads see it
+# when run in a copy of the caller's context
+_rerun_accounting = contextvars.ContextVar("sparkvibe_request_accounting", default=None)
+
+# Request timestamps of the last 60 seconds across all sessions, for the per-minute budget
+_recent_requests = deque()
+
+# Cumulative requests since process start, keyed by endpoint
+_total_counts = Counter()
+
+
+def _new_accounting():
+    return {"counts": Counter(), "deferred": Counter(), "cache_hits": Counter()}
+
+
+def _current_accounting():
+    """This session's per-rerun counters (fresh, uncounted ones outside a rerun)"""
+    return _rerun_accounting.get() or _new_accounting()
+
+
+def classify_endpoint(url):
+    """Map a request URL to a short endpoint name"""
+    parts = urlsplit(url)
+    location = f"{parts.netloc}{parts.path}"
+    for pattern, endpoint in _ENDPOINTS:
+        if pattern in location:
+            return endpoint
+    return parts.netloc or "unknown"
+
+
+def symbol_from_url(url):
+    """Best-effort extraction of the ticker symbol a Yahoo request is about"""
+    parts = urlsplit(url)
+    segments = [segment for segment in parts.path.split("/") if segment]
+    for marker in ("chart", "quoteSummary"):
+        if marker in segments:
+            index = segments.index(marker)
+            if index + 1 < len(segments):
+                return segments[index + 1]
+
+    params = parse_qs(parts.query)
+    for key in ("symbol", "symbols"):
+        if key in params:
+            return params[key][0].split(",")[0]
+    return None
+
+
+def calling_module():
+    """Name of the first application module on the call stack (e.g. 'tabs.volume_analysis')"""
+    frame = sys._getframe(1)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module == "__main__":
+            return "main_app"
+        if module.startswith(("tabs.", "utils.")) and module not in _INTERNAL_MODULES:
+            return module
+        frame = frame.f_back
+    return "unknown"
+
+
+def start_rerun_accounting():
+    """Start fresh per-rerun counters for this session; call once at the top of every script run"""
+    _rerun_accounting.set(_new_accounting())
+
+
+@contextmanager
+def rerun_accounting_scope():
+    """
+    Fresh per-rerun counters for the enclosed block, e.g. one poll of an auto-rerunning fragment
+    that never starts a full rerun; the caller's counters are restored afterwards
+    """
+    token = _rerun_accounting.set(_new_accounting())
+    try:
+        yield
+    finally:
+        _rerun_accounting.reset(token)
+
+
+def _prune_recent(now):
+    while _recent_requests and now - _recent_requests[0] > 60:
+        _recent_requests.popleft()
+
+
+def record_request(url, symbol=None, caller=None):
+    """Count one outgoing HTTP request"""
+    endpoint = classify_endpoint(url)
+    symbol = symbol or symbol_from_url(url) or ""
+    caller = caller or calling_module()
+    now = time.monotonic()
+    accounting = _current_accounting()
+
+    with _lock:
+        accounting["counts"][(endpoint, symbol, caller)] += 1
+        _total_counts[endpoint] += 1
+        _recent_requests.append(now)
+        _prune_recent(now)
+
+
+def record_cache_hit(url):
+    """Count one request served from the response cache (not charged to the budget)"""
+    accounting = _current_accounting()
+    with _lock:
+        accounting["cache_hits"][classify_endpoint(url)] += 1
+
+
+def budget_usage():
+    """Return (share of this session's per-rerun budget used, share of the process per-minute budget used)"""
+    now = time.monotonic()
+    accounting = _current_accounting()
+    with _lock:
+        _prune_recent(now)
+        rerun_used = sum(accounting["counts"].values())
+        minute_used = len(_recent_requests)
+    return rerun_used / REQUEST_BUDGET_PER_RERUN, minute_used / REQUEST_BUDGET_PER_MINUTE
+
+
+def allow_request(priority=PRIORITY_NORMAL, caller=None):
+    """
+    Check whether a call of the given priority may go upstream right now.
+    Refused calls are counted as deferred so the caller can fall back to cached data.
+    """
+    share = _PRIORITY_SHARE[priority]
+    if share is None:
+        return True
+
+    rerun_share, minute_share = budget_usage()
+    if rerun_share < share and minute_share < share:
+        return True
+
+    accounting = _current_accounting()
+    with _lock:
+        accounting["deferred"][caller or calling_module()] += 1
+    return False
+
+
+def get_rerun_accounting():
+    """Return the requests of this session's current rerun as a DataFrame"""
+    accounting = _current_accounting()
+    with _lock:
+        rows = [
+            {"Endpoint": endpoint, "Symbol": symbol, "Caller": caller, "Requests": count}
+            for (endpoint, symbol, caller), count in accounting["counts"].items()
+        ]
+    return pd.DataFrame(rows, columns=["Endpoint", "Symbol", "Caller", "Requests"])
+
+
+def render_request_accounting():
+    """Display upstream call counts and budget usage (call inside the sidebar)"""
+    st.markdown("**Upstream requests**")
+
+    calls_df = get_rerun_accounting()
+    rerun_share, minute_share = budget_usage()
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("This run", f"{int(calls_df['Requests'].sum())}/{REQUEST_BUDGET_PER_RERUN}")
+    with col2:
+        st.metric("Last minute", f"{minute_share * REQUEST_BUDGET_PER_MINUTE:.0f}/{REQUEST_BUDGET_PER_MINUTE}")
+
+    if calls_df.empty:
+        st.caption("No upstream requests in this run.")
+    else:
+        for column in ["Endpoint", "Caller"]:
+            st.dataframe(
+                calls_df.groupby(column)["Requests"].sum().sort_values(ascending=False).reset_index(),
+                use_container_width=True,
+                hide_index=True,
+            )
+        st.dataframe(
+            calls_df.groupby("Symbol")["Requests"].sum().sort_values(ascending=False).head(10).reset_index(),
+            use_container_width=True,
+            hide_index=True,
+        )
+
+    accounting = _current_accounting()
+    with _lock:
+        deferred = dict(accounting["deferred"])
+        cache_hits = sum(accounting["cache_hits"].values())
+    if cache_hits:
+        st.caption(f"{cache_hits} requests served from the response cache")
+    if deferred:
+        st.warning("Deferred by request budget: " + ", ".join(f"{caller} ({count})" for caller, count in deferred.items()))
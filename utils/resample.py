@@ -0,0 +1,196 @@
+"""
+Multi-timeframe bars for SparkVibe Finance application
+Derives weekly, monthly and quarterly OHLCV bars from the cached daily history, so tabs
+can switch timeframe without another upstream request. Results are kept per symbol and
+timeframe; when the daily history gains or updates a bar, only the last (partial) bucket
+is recomputed
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from .constants import TIMEFRAMES, TIMEFRAME_SESSIONS, TIMEFRAME_UNITS, RESAMPLE_CACHE_ENTRIES
+
+BAR_FIELDS = ["Open", "High", "Low", "Close", "Volume"]
+
+
+_NS_PER_DAY = 86_400 * 10**9
+
+
+def _bucket_keys(index, freq):
+    """Bucket number of each session in a daily index (sessions counted in exchange-local days)"""
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    days = index.as_unit("ns").asi8 // _NS_PER_DAY
+    if freq == "W-FRI":
+        # Weeks run Saturday to Friday; 1970-01-03 (day 2) was a Saturday
+        return (days - 2) // 7
+    months = days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+    if freq == "M":
+        return months
+    if freq == "Q":
+        return months // 3
+    raise ValueError(f"Unsupported resample frequency {freq!r}")
+
+
+def _columns(daily):
+    """Session timestamps (ns) and OHLCV arrays of a daily history"""
+    volume = daily["Volume"].to_numpy()
+    return daily.index.as_unit("ns").asi8, {
+        "Open": daily["Open"].to_numpy(dtype=float),
+        "High": daily["High"].to_numpy(dtype=float),
+        "Low": daily["Low"].to_numpy(dtype=float),
+        "Close": daily["Close"].to_numpy(dtype=float),
+        "Volume": np.nan_to_num(volume) if volume.dtype.kind == "f" else volume,
+    }
+
+
+def _aggregate(index, dates, columns, freq):
+    """
+    Resampled bars of daily sessions as arrays, plus the first session of each bucket.
+    One pass: first open, highest high, lowest low, last close and summed volume per
+    bucket, labelled by the bucket's last session so the partial bucket ends at the latest bar.
+    """
+    if not len(dates):
+        return {"Date": dates, "First": dates, **{field: values[:0] for field, values in columns.items()}}
+
+    keys = _bucket_keys(index, freq)
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    ends = np.r_[starts[1:], len(keys)] - 1
+    return {
+        "Date": dates[ends],
+        "First": dates[starts],
+        "Open": columns["Open"][starts],
+        "High": np.fmax.reduceat(columns["High"], starts),
+        "Low": np.fmin.reduceat(columns["Low"], starts),
+        "Close": columns["Close"][ends],
+        "Volume": np.add.reduceat(columns["Volume"], starts),
+    }
+
+
+def _to_frame(arrays, daily):
+    """Bars frame from aggregated arrays, indexed like the daily history"""
+    index = pd.DatetimeIndex(arrays["Date"].astype("datetime64[ns]"), name=daily.index.name)
+    if daily.index.tz is not None:
+        index = index.tz_localize("UTC").tz_convert(daily.index.tz)
+    return pd.DataFrame({field: arrays[field] for field in BAR_FIELDS}, index=index)
+
+
+def resample_bars(daily, timeframe):
+    """OHLCV bars of a daily history in a timeframe of TIMEFRAMES (Daily returns the history as is)"""
+    freq = TIMEFRAMES[timeframe]
+    if freq is None:
+        return daily
+    dates, columns = _columns(daily)
+    return _to_frame(_aggregate(daily.index, dates, columns, freq), daily)
+
+
+def bars_for_sessions(sessions, timeframe):
+    """Number of bars in a timeframe spanning about this many daily sessions (at least one)"""
+    return max(1, round(sessions / TIMEFRAME_SESSIONS[timeframe]))
+
+
+def moving_average_label(sessions, timeframe):
+    """Chart label of a moving average over about this many sessions, e.g. '10-Week MA'"""
+    return f"{bars_for_sessions(sessions, timeframe)}-{TIMEFRAME_UNITS[timeframe]} MA"
+
+
+class ResampleCache:
+    """
+    Resampled bars per key (e.g. source, symbol, period) and timeframe, in an LRU.
+    A cached result is reused while its completed buckets still match the daily history:
+    the last completed bucket's session and close are spot-checked (a dividend or split
+    adjustment rewrites past closes and forces a full recompute).
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.incremental = 0
+        self.full = 0
+
+    def _incremental(self, arrays, daily, dates, columns, freq):
+        """Recompute the partial buckets at both ends of the daily history, or None if the cached bars do not fit it"""
+        if len(arrays["Date"]) < 2:
+            return None
+        anchor = arrays["Date"][-2]
+
+        # The last completed bucket must end on the same session with the same close
+        position = dates.searchsorted(anchor)
+        if (position >= len(dates) - 1 or dates[position] != anchor
+                or columns["Close"][position] != arrays["Close"][-2]):
+            return None
+
+        # Completed buckets still fully inside the history (it may have rolled forward)
+        keep_from = arrays["First"][:-1].searchsorted(dates[0])
+        if keep_from >= len(arrays["Date"]) - 1:
+            return None
+        head_end = dates.searchsorted(arrays["First"][keep_from])
+
+        def aggregate(rows):
+            return _aggregate(daily.index[rows], dates[rows],
+                              {field: values[rows] for field, values in columns.items()}, freq)
+
+        parts = [{field: values[keep_from:-1] for field, values in arrays.items()}]
+        if head_end:
+            parts.insert(0, aggregate(slice(0, head_end)))
+        parts.append(aggregate(slice(position + 1, None)))
+        return {field: np.concatenate([part[field] for part in parts]) for field in arrays}
+
+    def get(self, key, daily, timeframe):
+        """Bars of a daily history in a timeframe, reusing the cached result for this key where it still fits"""
+        freq = TIMEFRAMES[timeframe]
+        if freq is None or daily.empty:
+            return daily
+
+        key = (key, timeframe)
+        fingerprint = (len(daily), daily.index[0], daily.index[-1], tuple(daily[BAR_FIELDS].iloc[-1].tolist()))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if entry[0] == fingerprint:
+                    self.hits += 1
+                    return entry[1]
+
+        dates, columns = _columns(daily)
+        arrays = None if entry is None else self._incremental(entry[2], daily, dates, columns, freq)
+        with self._lock:
+            if arrays is None:
+                self.full += 1
+            else:
+                self.incremental += 1
+        if arrays is None:
+            arrays = _aggregate(daily.index, dates, columns, freq)
+
+        bars = _to_frame(arrays, daily)
+        with self._lock:
+            self._entries[key] = (fingerprint, bars, arrays)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return bars
+
+    def stats(self):
+        """Cache hits, incremental updates and full recomputes so far"""
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits,
+                    "incremental": self.incremental, "full": self.full}
+
+
+_cache = ResampleCache(RESAMPLE_CACHE_ENTRIES)
+
+
+def resampled_history(key, daily, timeframe):
+    """Bars of a daily history in a timeframe from the process-wide resample cache"""
+    return _cache.get(key, daily, timeframe)
+
+
+def resample_stats():
+    return _cache.stats()
@@ -0,0 +1,177 @@
+"""
+On-disk HTTP response cache for SparkVibe Finance application
+SQLite-backed, zlib-compressed bodies, with per-endpoint freshness rules
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import datetime, timezone
+from urllib.parse import urlsplit, parse_qsl
+
+from .constants import HTTP_CACHE_PATH, QUOTE_CACHE_TTL, HISTORY_CACHE_TTL, EARNINGS_CACHE_TTL, BLS_RETRY_TTL
+from .release_calendar import next_cpi_release, latest_published_cpi_month
+from .request_budget import classify_endpoint
+
+# Query parameters that change between sessions without changing the response
+_VOLATILE_PARAMS = {"crumb"}
+
+# Yahoo chart ranges short enough that the live bar dominates the response
+_SHORT_RANGES = {"1d", "2d", "5d"}
+
+
+def cache_key(method, url, params=None, data=None, json_body=None):
+    """Stable key for a request: method, URL, sorted parameters and body"""
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query)
+    if isinstance(params, dict):
+        query += list(params.items())
+    elif params:
+        query += list(params)
+    query = sorted((str(k), str(v)) for k, v in query if k not in _VOLATILE_PARAMS)
+
+    if isinstance(data, str):
+        data = data.encode()
+    body = data or b""
+    if json_body is not None:
+        body += json.dumps(json_body, sort_keys=True).encode()
+
+    digest = hashlib.sha256()
+    digest.update(f"{method.upper()} {parts.scheme}://{parts.netloc}{parts.path}?{query}".encode())
+    digest.update(body)
+    return digest.hexdigest()
+
+
+def _request_params(url, params):
+    merged = dict(parse_qsl(urlsplit(url).query))
+    if isinstance(params, dict):
+        merged.update({str(k): v for k, v in params.items()})
+    elif params:
+        merged.update({str(k): v for k, v in params})
+    return merged
+
+
+def _chart_expiry(params, now):
+    """Fixed historical ranges never change; ranges ending today do"""
+    if "period1" in params and "period2" in params:
+        start_of_today = datetime(now.year, now.month, now.day).timestamp()
+        if float(params["period2"]) <= start_of_today:
+            return None  # Immutable
+        return time.time() + HISTORY_CACHE_TTL
+
+    interval = str(params.get("interval", "1d"))
+    if interval[-1] in ("m", "h") or params.get("range") in _SHORT_RANGES:
+        return time.time() + QUOTE_CACHE_TTL
+    return time.time() + HISTORY_CACHE_TTL
+
+
+def _bls_expiry(body):
+    """Keep BLS responses until the next CPI release once they contain the latest published month"""
+    try:
+        payload = json.loads(body)
+        latest = max(
+            (int(point["year"]), int(point["period"][1:]))
+            for series in payload["Results"]["series"]
+            for point in series["data"]
+            if point["period"].startswith("M") and point["period"] != "M13"
+        )
+    except (ValueError, KeyError, TypeError):
+        return time.time() + BLS_RETRY_TTL
+
+    expected = latest_published_cpi_month()
+    if latest >= (expected.year, expected.month):
+        return next_cpi_release().replace(tzinfo=timezone.utc).timestamp()
+
+    # Release is late (or our schedule estimate is early): check again later today
+    return time.time() + BLS_RETRY_TTL
+
+
+def cache_policy(method, url):
+    """Return the endpoint name if responses from this request may be cached, else None"""
+    endpoint = classify_endpoint(url)
+    if endpoint == "bls:timeseries" and method.upper() == "POST":
+        return endpoint
+    if endpoint in ("yahoo:chart", "yahoo:quoteSummary", "yahoo:quote", "yahoo:earnings", "yahoo:timeseries"):
+        return endpoint
+    return None
+
+
+def expires_at(endpoint, url, params, body):
+    """Expiry timestamp (epoch seconds) for a fresh response, or None if it never expires"""
+    if endpoint == "yahoo:chart":
+        return _chart_expiry(_request_params(url, params), datetime.now())
+    if endpoint == "bls:timeseries":
+        return _bls_expiry(body)
+    if endpoint in ("yahoo:earnings", "yahoo:timeseries"):
+        return time.time() + EARNINGS_CACHE_TTL
+    return time.time() + QUOTE_CACHE_TTL
+
+
+class ResponseCache:
+    """SQLite store of compressed HTTP response bodies"""
+
+    def __init__(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY, url TEXT, status INTEGER, headers TEXT,"
+                " body BLOB, stored_at REAL, expires_at REAL)"
+            )
+            # Drop expired entries so the file does not grow without bound
+            self._conn.execute(
+                "DELETE FROM responses WHERE expires_at IS NOT NULL AND expires_at < ?", (time.time(),)
+            )
+
+    def get(self, key):
+        """Return (status, headers, body) for a fresh entry, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, headers, body, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        status, headers, body, expiry = row
+        if expiry is not None and expiry < time.time():
+            return None
+        return status, json.loads(headers), zlib.decompress(body)
+
+    def set(self, key, url, status, headers, body, expiry):
+        """Store a response body compressed, expiring at the given epoch time (None = never)"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, url, status, json.dumps(headers), zlib.compress(body, 6), time.time(), expiry),
+            )
+
+    def clear(self):
+        """Remove every cached response"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+
+
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    """Return the process-wide response cache, or None when disabled or unavailable"""
+    global _response_cache
+    if _response_cache is None and HTTP_CACHE_PATH:
+        with _response_cache_lock:
+            if _response_cache is None:
+                try:
+                    _response_cache = ResponseCache(HTTP_CACHE_PATH)
+                except (OSError, sqlite3.Error):
+                    return None
+    return _response_cache
@@ -0,0 +1,172 @@
+"""
+Stock screener for SparkVibe Finance application
+Evaluates declarative conditions on snapshot fields, e.g. [("P/E", "<=", 20), ("Cross state",
+"in", ["Golden cross"])], as vectorized masks. Every numeric field keeps a sorted index, so a
+range condition is two binary searches plus the matching rows, even on large universes.
+Saved screens are kept as JSON next to the other cached data.
+"""
+
+import json
+import os
+
+import numpy as np
+
+from .constants import SCREENS_PATH
+from .indicators import INDICATOR_COLUMNS
+from .snapshot import CROSS_STATES
+
+# Screenable numeric fields: display name -> snapshot column (None: derived in ScreenIndex)
+SCREEN_FIELDS = {
+    "Price": "Price",
+    "Change %": "Change %",
+    "Volume (M)": "Volume (M)",
+    "Volume / Avg": None,
+    "Market Cap (B)": "Market Cap (B)",
+    "P/E": "P/E",
+    "EPS": "EPS",
+    "PEG": "PEG",
+    "P/B": "P/B",
+    "% Float": "% Float",
+    "Golden Cross Days Ago": "golden_cross_days_ago",
+    "Death Cross Days Ago": "death_cross_days_ago",
+    **{column: column for column in INDICATOR_COLUMNS},
+}
+
+CROSS_FIELD = "Cross state"
+
+# Range operators on numeric fields; CROSS_FIELD takes "in" with a list of CROSS_STATES
+RANGE_OPERATORS = [">=", "<=", "between"]
+
+
+def validate_conditions(conditions):
+    """Return (valid conditions as tuples, rejected items) for a list of [field, op, value] items"""
+    valid, rejected = [], []
+    for item in conditions or []:
+        try:
+            field, op, value = item
+            if field == CROSS_FIELD:
+                ok = op == "in" and all(state in CROSS_STATES for state in value)
+                value = list(value)
+            elif op == "between":
+                low, high = (None if bound is None else float(bound) for bound in value)
+                ok = field in SCREEN_FIELDS and (low is None or high is None or low <= high)
+                value = (low, high)
+            else:
+                ok = field in SCREEN_FIELDS and op in RANGE_OPERATORS
+                value = float(value)
+        except (TypeError, ValueError):
+            ok = False
+        if ok:
+            valid.append((field, op, value))
+        else:
+            rejected.append(item)
+    return valid, rejected
+
+
+def describe_condition(condition):
+    """Short text for a condition, e.g. 'P/E <= 20' or 'RSI 30 to 70'"""
+    field, op, value = condition
+    if field == CROSS_FIELD:
+        return f"{field}: {', '.join(value) or 'none'}"
+    if op == "between":
+        low, high = value
+        if low is None:
+            return f"{field} <= {high:g}"
+        if high is None:
+            return f"{field} >= {low:g}"
+        return f"{field} {low:g} to {high:g}"
+    return f"{field} {op} {value:g}"
+
+
+class ScreenIndex:
+    """Snapshot frame with a sorted index per screen field, for vectorized screen queries"""
+
+    def __init__(self, frame):
+        self.frame = frame
+        self.symbols = frame["Symbol"].to_numpy()
+        self._sorted = {}
+        for field, column in SCREEN_FIELDS.items():
+            if column is None:
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    values = frame["Volume (M)"].to_numpy(dtype=float) / frame["Avg Volume (M)"].to_numpy(dtype=float)
+            else:
+                values = frame[column].to_numpy(dtype=float)
+            # Missing (and infinite) values sort last and never match a range
+            order = np.argsort(values, kind="stable")
+            valid = int(np.isfinite(values).sum())
+            self._sorted[field] = (order[:valid], values[order[:valid]])
+
+        golden = frame["golden_cross"].to_numpy(dtype=bool)
+        death = frame["death_cross"].to_numpy(dtype=bool)
+        self._cross = {"Golden cross": golden, "Death cross": death, "No cross": ~golden & ~death}
+
+    def __len__(self):
+        return len(self.frame)
+
+    def range_mask(self, field, low=None, high=None):
+        """Rows whose field lies in [low, high] (None: open end), from two binary searches"""
+        order, values = self._sorted[field]
+        start = 0 if low is None else np.searchsorted(values, low, side="left")
+        stop = len(values) if high is None else np.searchsorted(values, high, side="right")
+        keep = np.zeros(len(self.frame), dtype=bool)
+        keep[order[start:stop]] = True
+        return keep
+
+    def mask(self, conditions):
+        """Boolean row mask of the rows meeting every condition (all rows for no conditions)"""
+        keep = np.ones(len(self.frame), dtype=bool)
+        for field, op, value in conditions:
+            if field == CROSS_FIELD:
+                state_mask = np.zeros(len(self.frame), dtype=bool)
+                for state in value:
+                    state_mask |= self._cross[state]
+                keep &= state_mask
+            elif op == ">=":
+                keep &= self.range_mask(field, low=value)
+            elif op == "<=":
+                keep &= self.range_mask(field, high=value)
+            elif op == "between":
+                keep &= self.range_mask(field, *value)
+            else:
+                raise ValueError(f"Unknown screen operator: {op}")
+        return keep
+
+    def select(self, conditions):
+        """Symbols meeting every condition, in snapshot order"""
+        return self.symbols[self.mask(conditions)].tolist()
+
+
+def load_saved_screens():
+    """Saved screens as name -> valid conditions (empty when none saved or the file is unreadable)"""
+    try:
+        with open(SCREENS_PATH) as f:
+            screens = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(screens, dict):
+        return {}
+    return {name: validate_conditions(conditions)[0] for name, conditions in screens.items()
+            if isinstance(conditions, list)}
+
+
+def _write_screens(screens):
+    os.makedirs(os.path.dirname(SCREENS_PATH), exist_ok=True)
+    tmp_path = f"{SCREENS_PATH}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({name: [list(condition) for condition in conditions] for name, conditions in screens.items()},
+                  f, indent=2, sort_keys=True)
+    os.replace(tmp_path, SCREENS_PATH)
+
+
+def save_screen(name, conditions):
+    """Save (or overwrite) a named screen"""
+    screens = load_saved_screens()
+    screens[name] = list(conditions)
+    _write_screens(screens)
+
+
+def delete_screen(name):
+    """Delete a named screen, if it exists"""
+    screens = load_saved_screens()
+    if screens.pop(name, None) is not None:
+        _write_screens(screens)
@@ -0,0 +1,228 @@
+"""
+Columnar market snapshot for SparkVibe Finance application
+One row per symbol with numeric columns as float arrays, plus precomputed sort
+orders so the summary table can be sorted, filtered and paginated server-side
+"""
+
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from .constants import STOCKS
+from .indicators import INDICATOR_COLUMNS
+
+# Columns the summary table can be sorted on
+SORTABLE_COLUMNS = [
+    "Symbol", "Company", "Price", "Change %", "Volume (M)", "Avg Volume (M)",
+    "Market Cap (B)", "P/E", "EPS", "PEG", "P/B", "50-Day MA", "200-Day MA", "% Float",
+] + INDICATOR_COLUMNS
+
+# Cross states the summary table can be filtered on
+CROSS_STATES = ["Golden cross", "Death cross", "No cross"]
+
+# Per-fetch bookkeeping that changes on every refresh without changing the data
+_UNVERSIONED_FIELDS = {"timestamp"}
+
+
+def _symbol_fingerprint(symbol, data):
+    fields = None if data is None else sorted(
+        (key, repr(value)) for key, value in data.items() if key not in _UNVERSIONED_FIELDS
+    )
+    return hashlib.sha1(repr((symbol, fields)).encode()).hexdigest()[:16]
+
+
+def symbol_fingerprints(all_stock_data):
+    """Symbol -> content hash of that symbol's data (a StockSnapshot computes them once per refresh)"""
+    if isinstance(all_stock_data, StockSnapshot):
+        return all_stock_data.fingerprints
+    return {symbol: _symbol_fingerprint(symbol, data) for symbol, data in all_stock_data.items()}
+
+
+def changed_symbols(previous, current):
+    """Symbols whose fingerprint differs between two fingerprint maps (including added and removed ones)"""
+    return [symbol for symbol in current if previous.get(symbol) != current[symbol]] + [
+        symbol for symbol in previous if symbol not in current
+    ]
+
+
+def _content_hash(fingerprints):
+    digest = hashlib.sha1()
+    for symbol in sorted(fingerprints):
+        digest.update(f"{symbol}:{fingerprints[symbol]};".encode())
+    return digest.hexdigest()[:16]
+
+
+class StockSnapshot(dict):
+    """
+    Symbol -> stock data mapping for one refresh, carrying a content version.
+    The CPI data fetched in the same refresh rides along as .cpi (with its status .cpi_notices).
+    """
+
+    def __init__(self, *args, cpi=None, cpi_notices=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self._fingerprints = None
+        self._version = None
+        self.cpi = cpi
+        self.cpi_notices = list(cpi_notices)
+
+    def __setitem__(self, symbol, data):
+        super().__setitem__(symbol, data)
+        self._fingerprints = None
+        self._version = None
+
+    @property
+    def fingerprints(self):
+        """Symbol -> content hash of its data, computed once per refresh"""
+        if self._fingerprints is None:
+            self._fingerprints = {symbol: _symbol_fingerprint(symbol, data) for symbol, data in self.items()}
+        return self._fingerprints
+
+    @property
+    def version(self):
+        """Content hash of the snapshot, computed once per refresh"""
+        if self._version is None:
+            self._version = _content_hash(self.fingerprints)
+        return self._version
+
+
+def snapshot_version(all_stock_data):
+    """Content version of a stock snapshot (a StockSnapshot or a plain dict)"""
+    if isinstance(all_stock_data, StockSnapshot):
+        return all_stock_data.version
+    return _content_hash(symbol_fingerprints(all_stock_data))
+
+
+def frame_version(df):
+    """Content version of a DataFrame (e.g. the CPI data)"""
+    digest = hashlib.sha1(repr((list(df.columns), len(df))).encode())
+    if not df.empty:
+        digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return digest.hexdigest()[:16]
+
+
+def _to_float(value, scale=1.0):
+    """Convert a fetched value to float (NaN when missing or not numeric)"""
+    if value is None or isinstance(value, str):
+        return np.nan
+    try:
+        return float(value) * scale
+    except (ValueError, TypeError):
+        return np.nan
+
+
+def _naive_timestamp(value):
+    """Earnings dates come back both tz-aware and naive; keep them all naive"""
+    if value is None:
+        return pd.NaT
+    value = pd.Timestamp(value)
+    return value.tz_localize(None) if value.tz is not None else value
+
+
+def build_snapshot(all_stock_data, symbols, indicators=None):
+    """
+    Build the snapshot frame for the given symbols (in order), skipping failed fetches.
+    indicators: optional indicator frame (Symbol plus INDICATOR_COLUMNS); missing ones are NaN.
+    """
+    rows = [all_stock_data[symbol] for symbol in symbols if all_stock_data.get(symbol) is not None]
+
+    def column(key, scale=1.0):
+        return np.array([_to_float(data[key], scale) for data in rows], dtype=float)
+
+    def days_ago(key):
+        return np.array([_to_float(data.get(key)) for data in rows], dtype=float)
+
+    frame = pd.DataFrame({
+        "Symbol": [data["symbol"] for data in rows],
+        "Company": [STOCKS.get(data["symbol"], data["symbol"]) for data in rows],
+        "Price": column("current_price"),
+        "Change %": column("percentage_change"),
+        "Volume (M)": column("volume", 1e-6),
+        "Avg Volume (M)": column("avg_volume", 1e-6),
+        "Market Cap (B)": column("market_cap", 1e-9),
+        "P/E": column("pe_ratio"),
+        "EPS": column("eps"),
+        "PEG": column("peg_ratio"),
+        "P/B": column("pb_ratio"),
+        "50-Day MA": column("ma_50d"),
+        "200-Day MA": column("ma_200d"),
+        "% Float": column("short_percent_float", 100.0),
+        "Earnings Date": pd.DatetimeIndex([_naive_timestamp(data.get("earnings_date")) for data in rows]),
+        "golden_cross": np.array([bool(data.get("golden_cross", False)) for data in rows], dtype=bool),
+        "golden_cross_days_ago": days_ago("golden_cross_days_ago"),
+        "death_cross": np.array([bool(data.get("death_cross", False)) for data in rows], dtype=bool),
+        "death_cross_days_ago": days_ago("death_cross_days_ago"),
+    })
+
+    # Technical indicators are computed universe-wide from bar arrays, then matched by symbol
+    if indicators is not None:
+        matched = indicators.drop_duplicates("Symbol").set_index("Symbol").reindex(frame["Symbol"])
+    for column in INDICATOR_COLUMNS:
+        frame[column] = np.nan if indicators is None else matched[column].to_numpy(dtype=float)
+    return frame
+
+
+class SnapshotTable:
+    """Snapshot frame with precomputed sort orders for server-side table queries"""
+
+    def __init__(self, frame):
+        self.frame = frame
+        self._orders = {}
+        for column in SORTABLE_COLUMNS:
+            values = frame[column].to_numpy()
+            ascending = np.argsort(values, kind="stable")
+            # Missing values stay at the end in both directions
+            if values.dtype.kind == "f":
+                valid = int((~np.isnan(values)).sum())
+            else:
+                valid = len(values)
+            descending = np.concatenate([ascending[:valid][::-1], ascending[valid:]])
+            self._orders[column] = (ascending, descending)
+
+    def __len__(self):
+        return len(self.frame)
+
+    def bounds(self, column):
+        """Return (min, max) of a numeric column, ignoring missing values"""
+        values = self.frame[column].to_numpy()
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return 0.0, 0.0
+        return float(values.min()), float(values.max())
+
+    def mask(self, pe_range=None, change_range=None, cross_states=None):
+        """Boolean row mask for the table filters; None means no filter"""
+        keep = np.ones(len(self.frame), dtype=bool)
+        if pe_range is not None:
+            pe = self.frame["P/E"].to_numpy()
+            keep &= (pe >= pe_range[0]) & (pe <= pe_range[1])
+        if change_range is not None:
+            change = self.frame["Change %"].to_numpy()
+            keep &= (change >= change_range[0]) & (change <= change_range[1])
+        if cross_states is not None:
+            golden = self.frame["golden_cross"].to_numpy()
+            death = self.frame["death_cross"].to_numpy()
+            state_mask = np.zeros(len(self.frame), dtype=bool)
+            if "Golden cross" in cross_states:
+                state_mask |= golden
+            if "Death cross" in cross_states:
+                state_mask |= death
+            if "No cross" in cross_states:
+                state_mask |= ~golden & ~death
+            keep &= state_mask
+        return keep
+
+    def query(self, sort_by=None, ascending=True, mask=None, page=1, page_size=50):
+        """
+        Return (page rows, number of matching rows) for a sort, filter mask and page.
+        Only the rows of the requested page are copied out of the snapshot.
+        """
+        if sort_by is None:
+            order = np.arange(len(self.frame))
+        else:
+            order = self._orders[sort_by][0 if ascending else 1]
+        if mask is not None:
+            order = order[mask[order]]
+
+        start = (page - 1) * page_size
+        return self.frame.iloc[order[start:start + page_size]], len(order)
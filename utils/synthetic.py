@@ -0,0 +1,218 @@
+"""
+Synthetic market data for SparkVibe Finance application
+Seeded, vectorized simulation of correlated daily OHLCV histories (geometric Brownian
+motion with regime shifts, so moving-average crossovers really happen) and of CPI
+rates, for development mode and load tests at production scale
+"""
+
+import numpy as np
+import pandas as pd
+
+from .constants import (
+    SYNTHETIC_SEED, SYNTHETIC_YEARS, SYNTHETIC_TRADING_DAYS, SYNTHETIC_REGIME_SWITCH_PROB,
+    SYNTHETIC_BASE_PRICES,
+)
+from .cpi_cube import CPICube
+from .bars import stock_data_from_bars
+
+# Regimes as (annual drift, volatility multiplier): bull, bear, sideways
+REGIMES = np.array([
+    [0.25, 0.9],
+    [-0.35, 1.6],
+    [0.02, 0.7],
+])
+
+# Symbols without earnings reports
+NO_EARNINGS_SYMBOLS = ["^VIX", "SPY", "QQQ", "GLD", "SLV", "BTC-USD"]
+
+# Days between simulated earnings reports
+EARNINGS_INTERVAL_DAYS = 91
+
+_PERIOD_DAYS = {"d": 1, "mo": 21, "y": SYNTHETIC_TRADING_DAYS}
+
+
+def _period_days(period):
+    """Number of trading days in a yfinance-style period such as 2y"""
+    unit = period.lstrip("0123456789")
+    return int(period[:-len(unit)]) * _PERIOD_DAYS[unit]
+
+
+def _regime_paths(rng, n_days, n_series, switch_prob):
+    """Markov regime index per day and series: a new random regime at each switch, held until the next"""
+    switches = rng.random((n_days, n_series)) < switch_prob
+    switches[0] = True
+    draws = rng.integers(0, len(REGIMES), size=(n_days, n_series), dtype=np.int8)
+    # Row of the latest switch at or before each day
+    last_switch = np.where(switches, np.arange(n_days, dtype=np.int32)[:, None], 0)
+    np.maximum.accumulate(last_switch, axis=0, out=last_switch)
+    return np.take_along_axis(draws, last_switch, axis=0)
+
+
+class SyntheticMarket:
+    """Simulated daily OHLCV histories for a universe of symbols (arrays are days x symbols)"""
+
+    def __init__(self, symbols, dates, open_, high, low, close, volume, earnings_offset, seed):
+        self.symbols = list(symbols)
+        self.dates = dates
+        self.open = open_
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+        self.earnings_offset = earnings_offset  # Days from the first session to the first report
+        self.seed = seed
+        self._columns = {symbol: i for i, symbol in enumerate(self.symbols)}
+
+    @classmethod
+    def generate(cls, symbols, years=SYNTHETIC_YEARS, seed=SYNTHETIC_SEED, end=None):
+        """
+        Simulate `years` of trading days ending at `end` (default today) for every symbol in one pass.
+        Each symbol loads on one market factor (with its own regime path) plus its own noise, and its
+        drift and volatility follow both the market's and its own bull/bear/sideways regime.
+        Histories end at the symbol's base price (SYNTHETIC_BASE_PRICES, or a random one).
+        """
+        rng = np.random.default_rng(seed)
+        n_symbols = len(symbols)
+        n_days = int(years * SYNTHETIC_TRADING_DAYS)
+        dt = 1.0 / SYNTHETIC_TRADING_DAYS
+
+        end = pd.Timestamp(end or pd.Timestamp.now()).normalize()
+        dates = pd.bdate_range(end=end, periods=n_days).tz_localize("America/New_York")
+
+        # Per-symbol parameters
+        known = np.array([SYNTHETIC_BASE_PRICES.get(symbol, np.nan) for symbol in symbols])
+        base_price = np.where(np.isnan(known), np.exp(rng.normal(4.5, 1.0, n_symbols)), known)
+        sigma = np.exp(rng.normal(np.log(0.3), 0.35, n_symbols))
+        beta = rng.uniform(0.3, 0.85, n_symbols)
+        base_volume = np.exp(rng.normal(np.log(30e6), 0.8, n_symbols))
+
+        # Regimes: the market's path is shared, each symbol also has its own
+        market_regime = _regime_paths(rng, n_days, 1, SYNTHETIC_REGIME_SWITCH_PROB)
+        symbol_regime = _regime_paths(rng, n_days, n_symbols, SYNTHETIC_REGIME_SWITCH_PROB)
+        drift = beta * REGIMES[market_regime, 0] + (1 - beta) * REGIMES[symbol_regime, 0]
+        vol = sigma * REGIMES[market_regime, 1]
+
+        # Correlated shocks: one market factor plus idiosyncratic noise
+        shocks = beta * rng.standard_normal((n_days, 1)) + np.sqrt(1 - beta ** 2) * rng.standard_normal((n_days, n_symbols))
+        log_returns = (drift - 0.5 * vol ** 2) * dt + vol * np.sqrt(dt) * shocks
+        log_path = np.cumsum(log_returns, axis=0)
+        close = base_price * np.exp(log_path - log_path[-1])
+
+        # Open gaps from the previous close; high/low extend past the open/close range
+        daily_vol = vol * np.sqrt(dt)
+        previous_close = np.vstack([close[:1], close[:-1]])
+        open_ = previous_close * np.exp(0.25 * daily_vol * rng.standard_normal((n_days, n_symbols)))
+        high = np.maximum(open_, close) * np.exp(0.5 * daily_vol * np.abs(rng.standard_normal((n_days, n_symbols))))
+        low = np.minimum(open_, close) * np.exp(-0.5 * daily_vol * np.abs(rng.standard_normal((n_days, n_symbols))))
+
+        # Volume rises with the size of the move
+        volume = base_volume * np.exp(0.3 * rng.standard_normal((n_days, n_symbols))) * (1 + 0.8 * np.abs(shocks))
+
+        earnings_offset = rng.integers(0, EARNINGS_INTERVAL_DAYS, n_symbols)
+        return cls(symbols, dates, open_, high, low, close, np.round(volume).astype(np.int64), earnings_offset, seed)
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def history(self, symbol, period="2y"):
+        """Daily history of one symbol over a yfinance-style period ("250d", "6mo", "2y"), like Ticker.history"""
+        column = self._columns[symbol]
+        start = max(0, len(self.dates) - _period_days(period))
+        return pd.DataFrame({
+            "Open": self.open[start:, column],
+            "High": self.high[start:, column],
+            "Low": self.low[start:, column],
+            "Close": self.close[start:, column],
+            "Volume": self.volume[start:, column],
+            "Dividends": 0.0,
+            "Stock Splits": 0.0,
+        }, index=pd.DatetimeIndex(self.dates[start:], name="Date"))
+
+    def bar_matrices(self, symbols, period="2y", fields=("Open", "High", "Low", "Close", "Volume")):
+        """
+        Bars of the simulated symbols over a yfinance-style period, as (symbols loaded,
+        field -> days x symbols float array)
+        """
+        loaded = [symbol for symbol in symbols if symbol in self._columns]
+        columns = [self._columns[symbol] for symbol in loaded]
+        start = max(0, len(self.dates) - _period_days(period))
+        arrays = {"Open": self.open, "High": self.high, "Low": self.low, "Close": self.close, "Volume": self.volume}
+        return loaded, {field: arrays[field][start:, columns].astype(float) for field in fields}
+
+    def earnings_dates(self, symbol):
+        """Simulated quarterly report dates of one symbol (past and the next upcoming), newest first"""
+        if symbol in NO_EARNINGS_SYMBOLS:
+            return pd.DataFrame()
+        first = self.dates[0].tz_localize(None) + pd.Timedelta(days=int(self.earnings_offset[self._columns[symbol]]))
+        count = (self.dates[-1].tz_localize(None) - first).days // EARNINGS_INTERVAL_DAYS + 2
+        dates = first + pd.to_timedelta(np.arange(count) * EARNINGS_INTERVAL_DAYS, unit="D")
+        return pd.DataFrame({"Reported EPS": np.nan}, index=pd.DatetimeIndex(dates[::-1], name="Earnings Date"))
+
+    def stock_data(self):
+        """
+        Symbol -> stock data dict (the keys fetch_stock_data returns) for the latest session,
+        computed for the whole universe at once
+        """
+        rng = np.random.default_rng([self.seed, len(self.dates)])
+        n = len(self.symbols)
+
+        # Fundamentals, with the gaps real quotes have
+        def sometimes(low, high, share_missing, missing=None):
+            values = rng.uniform(low, high, n)
+            return [missing if gap else value for value, gap in zip(values.tolist(), (rng.random(n) < share_missing).tolist())]
+
+        fundamentals = {
+            "pe_ratio": sometimes(10.0, 35.0, 0.1),
+            "eps": sometimes(1.0, 15.0, 0.1),
+            "peg_ratio": sometimes(0.5, 3.0, 0.15),
+            "pb_ratio": sometimes(1.0, 8.0, 0.1),
+            "short_percent_float": sometimes(0.01, 0.15, 0.2, "N/A"),
+            "market_cap": rng.integers(50_000_000_000, 3_000_000_000_000, n).tolist(),
+            "earnings_date": self.next_earnings_dates(),
+        }
+        return stock_data_from_bars(self.symbols, self.open, self.high, self.low, self.close, self.volume, fundamentals)
+
+    def next_earnings_dates(self, now=None):
+        """Next simulated report after now for every symbol (None for symbols without earnings)"""
+        now = now or pd.Timestamp.now()
+        first = self.dates[0].tz_localize(None) + pd.to_timedelta(self.earnings_offset, unit="D")
+        reports_so_far = np.floor((now - first) / pd.Timedelta(days=EARNINGS_INTERVAL_DAYS)).astype(int) + 1
+        upcoming = first + pd.to_timedelta(np.maximum(reports_so_far, 0) * EARNINGS_INTERVAL_DAYS, unit="D")
+        no_earnings = set(NO_EARNINGS_SYMBOLS)
+        return [None if symbol in no_earnings else date for symbol, date in zip(self.symbols, upcoming)]
+
+
+def synthetic_cpi_cube(current, volatility, trend=0.0, jitter=0.0, bounds=None, months=24, end=None, seed=None):
+    """
+    Simulated 12-month CPI rates for every category at once, as a CPICube.
+    current: category -> latest rate (the last month is exactly this)
+    volatility/jitter: per-category amplitudes of two uniform noise terms
+    trend: per-category rate change per month going back (positive means the rate was higher before)
+    bounds: per-category (low, high) clip range
+    """
+    categories = list(current)
+    rng = np.random.default_rng(seed)
+
+    def per_category(values):
+        if isinstance(values, dict):
+            return np.array([values[category] for category in categories], dtype=float)
+        return np.full(len(categories), values, dtype=float)
+
+    latest = per_category(current)
+    months_back = np.arange(months - 1, -1, -1, dtype=float)[:, None]
+    shape = (months, len(categories))
+    rates = (
+        latest
+        + months_back * per_category(trend)
+        + rng.uniform(-1.0, 1.0, shape) * per_category(jitter)
+        + rng.uniform(-1.0, 1.0, shape) * per_category(volatility)
+    )
+    if bounds is not None:
+        low = np.array([bounds[category][0] for category in categories])
+        high = np.array([bounds[category][1] for category in categories])
+        rates = np.clip(rates, low, high)
+    rates[-1] = latest
+
+    end = pd.Timestamp(end or pd.Timestamp.now()).normalize().replace(day=1)
+    index = pd.date_range(end=end, periods=months, freq="MS")
+    return CPICube(pd.DataFrame(rates, index=index, columns=categories))
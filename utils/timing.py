@@ -0,0 +1,248 @@
+"""
+Timing instrumentation for SparkVibe Finance application
+Lightweight spans around the fetch and render pipeline, aggregated per rerun
+and per symbol, with Prometheus text and JSON log export
+"""
+
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from .constants import METRICS_TEXTFILE_PATH
+
+# Structured JSON log lines go to their own logger so they can be routed separately
+logger = logging.getLogger("sparkvibe.timing")
+if not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+_lock = threading.Lock()
+
+# Spans recorded during the current rerun of main() in this session. Every session's script
+# thread sets its own; worker threads see it when run in a copy of the caller's context
+_current_rerun = contextvars.ContextVar("sparkvibe_rerun", default=None)
+
+# Session state key of this session's previous rerun wall time
+_PREVIOUS_RERUN_KEY = "timing_previous_rerun_seconds"
+
+# Reruns started by this process, and the wall time of the most recent complete one (any session)
+_reruns = {"count": 0}
+_last_rerun_seconds = {"value": 0.0}
+
+# Cumulative (stage, symbol) -> [count, total seconds] since process start, for Prometheus
+_cumulative = {}
+
+
+def start_rerun():
+    """Start a fresh span buffer for this session's rerun; call once at the top of every script run"""
+    with _lock:
+        _reruns["count"] += 1
+        rerun_id = _reruns["count"]
+    _current_rerun.set({"id": rerun_id, "started_at": datetime.now(), "started": time.perf_counter(), "spans": []})
+    return rerun_id
+
+
+def record_span(stage, seconds, symbol=None):
+    """Record one completed span for the current rerun (outside a rerun only in the process totals)"""
+    rerun = _current_rerun.get()
+    span = {
+        "rerun": rerun["id"] if rerun else None,
+        "stage": stage,
+        "symbol": symbol,
+        "seconds": seconds,
+    }
+    with _lock:
+        if rerun is not None:
+            rerun["spans"].append(span)
+        totals = _cumulative.setdefault((stage, symbol or ""), [0, 0.0])
+        totals[0] += 1
+        totals[1] += seconds
+
+    logger.debug(json.dumps({"event": "span", **span}))
+
+
+@contextmanager
+def timed(stage, symbol=None):
+    """Time the enclosed block as a span of the given stage (optionally per symbol)"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_span(stage, time.perf_counter() - start, symbol)
+
+
+def get_rerun_spans():
+    """Return the spans of this session's current rerun as a DataFrame"""
+    rerun = _current_rerun.get()
+    with _lock:
+        spans = list(rerun["spans"]) if rerun else []
+    return pd.DataFrame(spans, columns=["rerun", "stage", "symbol", "seconds"])
+
+
+def summarize_by_stage(spans_df):
+    """Aggregate spans per stage: call count, total, mean and max seconds"""
+    if spans_df.empty:
+        return pd.DataFrame(columns=["Stage", "Calls", "Total (s)", "Mean (s)", "Max (s)"])
+
+    summary = spans_df.groupby("stage")["seconds"].agg(["count", "sum", "mean", "max"]).reset_index()
+    summary.columns = ["Stage", "Calls", "Total (s)", "Mean (s)", "Max (s)"]
+    return summary.sort_values("Total (s)", ascending=False)
+
+
+def summarize_by_symbol(spans_df):
+    """Aggregate spans per symbol to surface per-symbol outliers"""
+    symbol_spans = spans_df.dropna(subset=["symbol"])
+    if symbol_spans.empty:
+        return pd.DataFrame(columns=["Symbol", "Calls", "Total (s)", "Slowest Stage"])
+
+    totals = symbol_spans.groupby("symbol")["seconds"].agg(["count", "sum"])
+    slowest = symbol_spans.loc[symbol_spans.groupby("symbol")["seconds"].idxmax(), ["symbol", "stage"]]
+    summary = totals.join(slowest.set_index("symbol")).reset_index()
+    summary.columns = ["Symbol", "Calls", "Total (s)", "Slowest Stage"]
+    return summary.sort_values("Total (s)", ascending=False)
+
+
+def export_prometheus():
+    """Render cumulative stage timings in the Prometheus text exposition format"""
+    lines = [
+        "# HELP sparkvibe_stage_duration_seconds Time spent in each fetch/render stage.",
+        "# TYPE sparkvibe_stage_duration_seconds summary",
+    ]
+
+    with _lock:
+        cumulative = sorted(_cumulative.items())
+        rerun_id = _reruns["count"]
+        rerun_total = _last_rerun_seconds["value"]
+
+    for (stage, symbol), (count, total) in cumulative:
+        labels = f'stage="{stage}"'
+        if symbol:
+            labels += f',symbol="{symbol}"'
+        lines.append(f"sparkvibe_stage_duration_seconds_sum{{{labels}}} {total:.6f}")
+        lines.append(f"sparkvibe_stage_duration_seconds_count{{{labels}}} {count}")
+
+    lines.append("# HELP sparkvibe_reruns_total Script reruns observed by this process.")
+    lines.append("# TYPE sparkvibe_reruns_total counter")
+    lines.append(f"sparkvibe_reruns_total {rerun_id}")
+    lines.append("# HELP sparkvibe_last_rerun_seconds Wall time of the most recent complete rerun.")
+    lines.append("# TYPE sparkvibe_last_rerun_seconds gauge")
+    lines.append(f"sparkvibe_last_rerun_seconds {rerun_total:.6f}")
+
+    return "\n".join(lines) + "\n"
+
+
+def rerun_elapsed():
+    """Seconds elapsed since this session's current rerun started"""
+    rerun = _current_rerun.get()
+    if rerun is None:
+        return 0.0
+    return time.perf_counter() - rerun["started"]
+
+
+def _log_run(event, run, elapsed, **fields):
+    """Log a run's span summary as one JSON line and refresh the Prometheus textfile if configured"""
+    spans_df = get_rerun_spans()
+    stage_totals = spans_df.groupby("stage")["seconds"].sum().round(4).to_dict() if not spans_df.empty else {}
+
+    logger.info(json.dumps({
+        "event": event,
+        **fields,
+        "rerun": run["id"],
+        "started_at": run["started_at"].isoformat() if run["started_at"] else None,
+        "seconds": round(elapsed, 4),
+        "spans": len(spans_df),
+        "stages": stage_totals,
+    }))
+
+    if METRICS_TEXTFILE_PATH:
+        try:
+            # Write then rename so a scraper never sees a half-written file
+            tmp_path = f"{METRICS_TEXTFILE_PATH}.tmp"
+            with open(tmp_path, "w") as metrics_file:
+                metrics_file.write(export_prometheus())
+            os.replace(tmp_path, METRICS_TEXTFILE_PATH)
+        except OSError as e:
+            logger.warning(json.dumps({"event": "metrics_export_failed", "error": str(e)}))
+
+
+def finish_rerun():
+    """Log the rerun summary as one JSON line and refresh the Prometheus textfile if configured"""
+    elapsed = rerun_elapsed()
+    rerun = _current_rerun.get() or {"id": None, "started_at": None}
+    _last_rerun_seconds["value"] = elapsed
+    st.session_state[_PREVIOUS_RERUN_KEY] = elapsed
+    _log_run("rerun", rerun, elapsed)
+
+
+@contextmanager
+def fragment_run(fragment):
+    """
+    Fresh span buffer for one run of an auto-rerunning fragment, which never starts or finishes
+    a full rerun; the run is logged as a "fragment" line when the block ends and the caller's
+    buffer is restored
+    """
+    run = {"id": None, "started_at": datetime.now(), "started": time.perf_counter(), "spans": []}
+    token = _current_rerun.set(run)
+    try:
+        yield
+    finally:
+        try:
+            _log_run("fragment", run, time.perf_counter() - run["started"], fragment=fragment)
+        finally:
+            _current_rerun.reset(token)
+
+
+def render_diagnostics_panel():
+    """Display the timing diagnostics panel (call inside the sidebar)"""
+    st.subheader("Diagnostics")
+
+    spans_df = get_rerun_spans()
+    if spans_df.empty:
+        st.caption("No timing spans recorded for this run yet.")
+        return
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("This run", f"{rerun_elapsed():.2f}s")
+    with col2:
+        st.metric("Previous run", f"{st.session_state.get(_PREVIOUS_RERUN_KEY, 0.0):.2f}s")
+
+    st.markdown("**Time by stage**")
+    st.dataframe(
+        summarize_by_stage(spans_df),
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "Total (s)": st.column_config.NumberColumn(format="%.3f"),
+            "Mean (s)": st.column_config.NumberColumn(format="%.3f"),
+            "Max (s)": st.column_config.NumberColumn(format="%.3f"),
+        },
+    )
+
+    st.markdown("**Slowest symbols**")
+    st.dataframe(
+        summarize_by_symbol(spans_df).head(10),
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "Total (s)": st.column_config.NumberColumn(format="%.3f"),
+        },
+    )
+
+    st.download_button(
+        "⬇️ Prometheus metrics",
+        data=export_prometheus(),
+        file_name="sparkvibe_metrics.prom",
+        mime="text/plain",
+    )
@@ -0,0 +1,146 @@
+"""
+Unusual volume scanner for SparkVibe Finance application
+Scores the volume of the recent sessions of a whole universe against the sessions before
+each (mean/standard deviation or the outlier-robust median/MAD) in one vectorized pass over
+the volume matrix (sessions x symbols), and keeps the scores so a refresh only rescores the
+sessions that are new or were revised
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .constants import VOLUME_ANOMALY_WINDOW, VOLUME_ANOMALY_LOOKBACK, VOLUME_ANOMALY_MIN_Z
+
+# MAD of normally distributed values times this is their standard deviation
+MAD_SCALE = 1.4826
+
+
+def _window_stats(windows, method):
+    """Center and spread of each window (last axis)"""
+    if method == "Median/MAD":
+        center = np.median(windows, axis=-1)
+        spread = MAD_SCALE * np.median(np.abs(windows - center[..., None]), axis=-1)
+    else:
+        center = windows.mean(axis=-1)
+        spread = windows.std(axis=-1, ddof=1)
+    return center, spread
+
+
+def volume_zscores(volume, rows, window=VOLUME_ANOMALY_WINDOW, method="Median/MAD"):
+    """
+    Z-scores of the volume of the last `rows` sessions, each against the `window` sessions
+    before it, as a (rows x symbols) array; NaN where a window is incomplete or flat.
+    """
+    volume = np.asarray(volume, dtype=float)
+    n = volume.shape[1]
+    rows = min(rows, max(len(volume) - window, 0))
+    if rows == 0:
+        return np.full((0, n), np.nan)
+
+    tail = volume[-(rows + window):]
+    windows = sliding_window_view(tail[:-1], window, axis=0)  # rows x symbols x window
+    current = tail[window:]
+    center, spread = _window_stats(windows, method)
+    complete = np.isfinite(windows).all(axis=-1) & np.isfinite(current) & (spread > 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(complete, (current - center) / spread, np.nan)
+
+
+class VolumeAnomalyScanner:
+    """
+    Volume z-scores of the recent sessions per key (e.g. data source and method), kept between
+    refreshes. When the volume matrix only gained sessions at the end (or had its last session
+    revised, as an intraday volume does) since the last update, only those sessions are
+    rescored; anything else (other symbols, revised history) rescores every recent session.
+    """
+
+    def __init__(self, rows=VOLUME_ANOMALY_LOOKBACK, window=VOLUME_ANOMALY_WINDOW):
+        self.rows = rows
+        self.window = window
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.incremental = 0
+        self.full = 0
+
+    def _new_sessions(self, entry, symbols, volume):
+        """Sessions added since the entry was scored (0: only the last one revised), or None if it does not fit"""
+        if entry is None or entry["symbols"] != symbols:
+            return None
+        settled = entry["tail"][:-1]
+        for added in range(self.rows):
+            end = len(volume) - 1 - added
+            if end < len(settled):
+                break
+            if np.array_equal(volume[end - len(settled):end], settled, equal_nan=True):
+                return added
+        return None
+
+    def scores(self, key, symbols, volume, method="Median/MAD"):
+        """Z-scores of the last `rows` sessions (rows x symbols) of a volume matrix, updated incrementally"""
+        symbols = tuple(symbols)
+        volume = np.asarray(volume, dtype=float)
+        tail = volume[-(self.rows + self.window):].copy()
+        with self._lock:
+            entry = self._entries.get((key, method))
+            if entry is not None and entry["symbols"] == symbols and np.array_equal(entry["tail"], tail, equal_nan=True):
+                self.hits += 1
+                return entry["z"]
+
+            added = self._new_sessions(entry, symbols, volume)
+            if added is None or len(entry["z"]) < self.rows:
+                z = volume_zscores(volume, self.rows, self.window, method)
+                self.full += 1
+            else:
+                # Keep the scores of the settled sessions, rescore the revised and new ones
+                rescored = volume_zscores(volume, added + 1, self.window, method)
+                z = np.vstack([entry["z"][:-1], rescored])[-self.rows:]
+                self.incremental += 1
+            self._entries[(key, method)] = {"symbols": symbols, "tail": tail, "z": z}
+            return z
+
+    def stats(self):
+        """Hit, incremental and full counts"""
+        return {"hits": self.hits, "incremental": self.incremental, "full": self.full}
+
+
+def rank_anomalies(symbols, volume, z, method="Median/MAD", min_z=VOLUME_ANOMALY_MIN_Z, window=VOLUME_ANOMALY_WINDOW):
+    """
+    Unusual volume table, highest peak first: symbols whose peak z-score over the scored
+    sessions reaches min_z, with the latest score, when the peak was, and the latest volume
+    against its typical level (window mean or median)
+    """
+    volume = np.asarray(volume, dtype=float)
+    columns = ["Symbol", "Peak Z", "Days Ago", "Z-Score", "Volume (M)", "Typical Volume (M)", "Vol/Typical"]
+    if len(z) == 0:
+        return pd.DataFrame(columns=columns)
+
+    scored = np.where(np.isnan(z), -np.inf, z)
+    peak_row = scored.argmax(axis=0)
+    peak = scored.max(axis=0)
+    typical, _ = _window_stats(volume[-(window + 1):-1].T, method)
+
+    keep = np.flatnonzero(peak >= min_z)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = volume[-1] / typical
+    table = pd.DataFrame({
+        "Symbol": np.asarray(symbols, dtype=object)[keep],
+        "Peak Z": peak[keep],
+        "Days Ago": len(z) - 1 - peak_row[keep],
+        "Z-Score": z[-1, keep],
+        "Volume (M)": volume[-1, keep] / 1e6,
+        "Typical Volume (M)": typical[keep] / 1e6,
+        "Vol/Typical": ratio[keep],
+    })
+    return table.sort_values("Peak Z", ascending=False, kind="stable", ignore_index=True)
+
+
+_scanner = VolumeAnomalyScanner()
+
+
+def get_volume_scanner():
+    """Return the process-wide volume anomaly scanner"""
+    return _scanner